@@ -3,16 +3,20 @@ Main Application file
 -   entry point for the application
 -   configure the database
 -   run the main application
+-   batch export sessions from the command line
+-   log without any window (`--headless`)
 """
 
+import argparse
+import multiprocessing
 import sys
+from datetime import datetime
 from logging import INFO, FileHandler, Formatter, getLogger
 from pathlib import Path
 
-import customtkinter
-
 import src.database_functionality
-import src.screens
+import src.devices
+import src.protocols
 
 # constants
 CURRENT_PATH = Path(__file__).parent
@@ -34,6 +38,8 @@ logger_file_handler = FileHandler(
 def show_error_dialog(title, message):
     """Show error dialog to user"""
 
+    import customtkinter
+
     error_window = customtkinter.CTkToplevel()
     error_window.title(title)
     error_window.geometry("400x200")
@@ -46,7 +52,150 @@ def show_error_dialog(title, message):
     
     error_window.grab_set()  # Make the error window modal
 
+def parse_address(address: str) -> tuple[str, int]:
+    """HOST:PORT command line argument"""
+
+    host, separator, port = address.rpartition(":")
+    if not separator or not host or not port.isdigit():
+        raise argparse.ArgumentTypeError(f"expected HOST:PORT, got {address}")
+    return host, int(port)
+
+def parse_arguments():
+    """Parse the command line arguments"""
+
+    parser = argparse.ArgumentParser(description="CAN-DAQ data monitor")
+    parser.add_argument(
+        "--export",
+        nargs="+",
+        metavar="SESSION",
+        help="export sessions to CSV without opening the UI. Accepts paths, or names/glob patterns in the sessions folder",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path.cwd(),
+        help="folder for the exported CSV files (default: current folder)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of export processes (default: number of CPU cores)",
+    )
+    parser.add_argument(
+        "--last-seconds",
+        type=float,
+        default=None,
+        help="only export the most recent part of each session. Works on sessions that are still being recorded",
+    )
+
+    headless = parser.add_argument_group("headless logging", "acquire, decode and store only, without any window")
+    headless.add_argument("--headless", action="store_true", help="log without the UI, until Ctrl+C or SIGTERM")
+    headless.add_argument(
+        "--device",
+        choices=list(src.devices.device_details),
+        default=next(iter(src.devices.device_details)),
+        help="device type (default: %(default)s)",
+    )
+    headless.add_argument(
+        "--protocol",
+        choices=list(src.protocols.protocol_details),
+        default=next(iter(src.protocols.protocol_details)),
+        help="protocol (default: %(default)s)",
+    )
+    headless.add_argument("--port", help="serial port of the device, e.g. COM3 or /dev/ttyACM0")
+    headless.add_argument("--serial-baud-rate", type=int, default=1000000, help="default: %(default)s")
+    headless.add_argument("--can-baud-rate", type=int, default=1000000, help="default: %(default)s")
+    headless.add_argument("--dbc", type=Path, help="protocol specification file (DBC)")
+    headless.add_argument("--session", default="headless", help="session name, the start time is appended (default: %(default)s)")
+    headless.add_argument(
+        "--durability",
+        choices=list(src.database_functionality.DURABILITY_MODES),
+        default=src.database_functionality.DEFAULT_DURABILITY_MODE,
+        help="default: %(default)s",
+    )
+    headless.add_argument(
+        "--durability-interval",
+        type=int,
+        default=src.database_functionality.DEFAULT_DURABILITY_INTERVAL,
+        help="fsync interval in ms for the 'Fsync every N ms' durability mode (default: %(default)s)",
+    )
+    headless.add_argument("--batch-size", type=int, default=1000, help="frames per database transaction (default: %(default)s)")
+    headless.add_argument("--report-interval", type=float, default=1.0, help="seconds between throughput reports (default: %(default)s)")
+    headless.add_argument(
+        "--forward",
+        type=parse_address,
+        metavar="HOST:PORT",
+        help="also send the decoded signals as JSON datagrams over UDP",
+    )
+
+    arguments = parser.parse_args()
+
+    if arguments.headless and (arguments.port is None or arguments.dbc is None):
+        parser.error("--headless requires --port and --dbc")
+
+    return arguments
+
+def run_batch_export(arguments):
+    """Export the requested sessions in parallel and print progress to stdout"""
+
+    sessions_folder = FOLDER_PATH / "sessions"
+    db_paths = []
+
+    for session in arguments.export:
+        if Path(session).is_file():
+            db_paths.append(Path(session))
+        else:
+            matches = sorted(sessions_folder.glob(session))
+
+            if not matches:
+                print(f"No session found for {session}")
+            db_paths.extend(matches)
+
+    if not db_paths:
+        return
+
+    def print_progress(completed, total, result):
+        if "error" in result:
+            print(f"[{completed}/{total}] {result['session']}: FAILED ({result['error']})")
+        else:
+            print(f"[{completed}/{total}] {result['session']}: {result['rows']} rows in {result['seconds']:.2f} s")
+
+    summary = src.database_functionality.export_sessions(
+        db_paths,
+        arguments.output,
+        max_workers=arguments.workers,
+        progress_callback=print_progress,
+        last_seconds=arguments.last_seconds,
+    )
+    print(src.database_functionality.format_export_summary(summary))
+
+def run_headless(arguments):
+    """Log a session without the UI, printing the throughput to stdout until interrupted"""
+
+    import src.headless
+
+    # the headless path must not need a display, a Tk import here means a module imports the GUI eagerly
+    assert "tkinter" not in sys.modules, "headless logging imported tkinter"
+
+    sessions_folder = FOLDER_PATH / "sessions"
+    sessions_folder.mkdir(exist_ok=True)
+    db_path = sessions_folder / f"{arguments.session}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.db"
+
+    headless_logger = src.headless.create_logger(arguments, db_path, CURRENT_PATH / "src/schema.sql")
+    headless_logger.install_signal_handlers()
+
+    print(f"Logging {arguments.device} on {arguments.port} to {db_path}, press Ctrl+C to stop", flush=True)
+    headless_logger.run()
+
 def main():
+    # the GUI modules import matplotlib and the Tk widgets, headless and export runs never load them
+    import customtkinter
+
+    import src.pipeline
+    import src.plotting
+    import src.screens
+
     try:
         # configure loggers
         logger_file_handler.setFormatter(logger_formatter)
@@ -66,6 +215,9 @@ def main():
         src.screens.monitoring_screen.logger.addHandler(logger_file_handler)
         src.screens.monitoring_screen.logger.setLevel(LOGGER_LEVEL)
 
+        src.pipeline.logger.addHandler(logger_file_handler)
+        src.pipeline.logger.setLevel(LOGGER_LEVEL)
+
         src.database_functionality.logger.addHandler(logger_file_handler)
         src.database_functionality.logger.setLevel(LOGGER_LEVEL)
 
@@ -99,10 +251,14 @@ def main():
             protocol_frame = session_config_screen.protocol_frame_instance
             device = session_config_screen.device_instance
             timing_config = getattr(session_config_screen, 'timing_config', {
-                'plot_max_points': 1000,
+                'plot_time_window': 10,
                 'plot_update_interval': 100,
+                'plot_max_cpu_share': 50,
+                'plot_backend': src.plotting.backends.DEFAULT_PLOT_BACKEND,
                 'database_batch_size': 1000,
-                'statistics_batch_size': 250
+                'statistics_window': 10,
+                'durability_mode': src.database_functionality.DEFAULT_DURABILITY_MODE,
+                'durability_interval': src.database_functionality.DEFAULT_DURABILITY_INTERVAL,
             })
 
             try:
@@ -110,6 +266,8 @@ def main():
                 logging_database = src.database_functionality.LoggingDatabase(
                     db_path=initial_screen.session_filename,
                     schema_path=CURRENT_PATH / "src/schema.sql",
+                    durability_mode=timing_config.get('durability_mode', src.database_functionality.DEFAULT_DURABILITY_MODE),
+                    durability_interval=timing_config.get('durability_interval', src.database_functionality.DEFAULT_DURABILITY_INTERVAL),
                 )
             except Exception as e:
                 logger.error(f"Failed to initialize database: {str(e)}")
@@ -141,6 +299,29 @@ def main():
         raise
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()    # required for the export process pool in the frozen executable
+    arguments = parse_arguments()
+
+    if arguments.export:
+        logger_file_handler.setFormatter(logger_formatter)
+        src.database_functionality.logger.addHandler(logger_file_handler)
+        src.database_functionality.logger.setLevel(LOGGER_LEVEL)
+        run_batch_export(arguments)
+        sys.exit(0)
+
+    if arguments.headless:
+        logger_file_handler.setFormatter(logger_formatter)
+        for module_logger in (src.database_functionality.logger, getLogger("src.headless"), getLogger("src.pipeline")):
+            module_logger.addHandler(logger_file_handler)
+            module_logger.setLevel(LOGGER_LEVEL)
+
+        try:
+            run_headless(arguments)
+        except Exception as e:
+            print(f"Fatal error: {str(e)}")
+            sys.exit(1)
+        sys.exit(0)
+
     try:
         main()
     except Exception as e:
@@ -0,0 +1,5 @@
+"""
+Analysis of decoded signals, fed with the columnar chunks of the acquisition
+"""
+
+from . import bus_monitor, derived_signals, histograms, spectrum, statistics, triggers
@@ -0,0 +1,164 @@
+"""
+Bus monitor
+-   frame rate, cycle time and cycle-time jitter per message ID, and the estimated bus utilization
+-   updated once per received frame in the acquisition path, in constant time and without allocating
+-   rates and utilization are differences of running counters between two snapshots, on the hardware time base
+"""
+
+import math
+import threading
+
+JITTER_SMOOTHING = 1 / 32   # weight of the newest interval in the exponentially weighted cycle-time mean/variance
+LATE_FACTOR = 1.5           # an interval longer than this many DBC cycle times counts as a missed schedule
+MAX_STANDARD_ID = 0x7FF
+
+
+def frame_bits(message_id: int, length: int) -> int:
+    """
+    -   bits on the wire of a classical CAN data frame, without stuffing bits, including the interframe space
+    -   47 + 8 * DLC for 11-bit identifiers, 67 + 8 * DLC for 29-bit identifiers (the IDE flag is not reported
+        by the device, identifiers above 0x7FF are taken as extended)
+    """
+    overhead = 67 if message_id > MAX_STANDARD_ID else 47
+    return overhead + 8 * length
+
+
+class MessageStatistics:
+    """Running statistics of one message ID"""
+
+    __slots__ = ("count", "length", "last_timestamp", "interval_mean", "interval_variance", "late", "counted_at_snapshot")
+
+    def __init__(self, length: int):
+        self.count = 0
+        self.length = length
+        self.last_timestamp: int = None
+        self.interval_mean: float = None   # µs
+        self.interval_variance = 0.0
+        self.late = 0
+        self.counted_at_snapshot = 0
+
+
+class BusMonitor:
+    """
+    Bus Monitor class
+    -   `update()` is called from the acquisition thread for every frame, also for frames not in the DBC
+    -   `snapshot()` can be called from any thread, it returns the per-ID table and the bus utilization since the
+        previous snapshot
+    -   `cycle_times` are the DBC cycle times in ms per message ID, for counting missed schedules
+    """
+
+    def __init__(self, can_baud_rate: int | None, cycle_times: dict[int, float] = None):
+        self.can_baud_rate = can_baud_rate
+        self.cycle_times = cycle_times or {}
+
+        self.messages: dict[int, MessageStatistics] = {}
+        self.total_bits = 0
+        self.latest_timestamp: int = None
+        self.lock = threading.Lock()
+
+        self.snapshot_timestamp: int = None
+        self.snapshot_bits = 0
+
+    def update(self, message_id: int, length: int, timestamp: int) -> None:
+        with self.lock:
+            statistics = self.messages.get(message_id)
+
+            if statistics is None:
+                statistics = self.messages[message_id] = MessageStatistics(length)
+
+            elif statistics.last_timestamp is not None and timestamp > statistics.last_timestamp:
+                interval = timestamp - statistics.last_timestamp
+
+                if statistics.interval_mean is None:
+                    statistics.interval_mean = float(interval)
+                else:
+                    deviation = interval - statistics.interval_mean
+                    statistics.interval_mean += JITTER_SMOOTHING * deviation
+                    statistics.interval_variance = (1 - JITTER_SMOOTHING) * (
+                        statistics.interval_variance + JITTER_SMOOTHING * deviation * deviation
+                    )
+
+                cycle_time = self.cycle_times.get(message_id)
+                if cycle_time and interval > LATE_FACTOR * cycle_time * 1000:
+                    statistics.late += 1
+
+            statistics.count += 1
+            statistics.length = length
+            statistics.last_timestamp = timestamp
+            self.total_bits += frame_bits(message_id, length)
+
+            if self.latest_timestamp is None or timestamp > self.latest_timestamp:
+                self.latest_timestamp = timestamp
+
+            if self.snapshot_timestamp is None:
+                self.snapshot_timestamp = timestamp     # the first frame starts the first snapshot period
+
+    def snapshot(self) -> dict:
+        """
+        return `{"utilization": % or None, "frame_rate": Hz, "messages": [row per ID, busiest first]}`, with the
+        rates averaged since the previous snapshot
+        """
+
+        with self.lock:
+            now = self.latest_timestamp
+            elapsed = (now - self.snapshot_timestamp) / 1e6 if now is not None and self.snapshot_timestamp is not None else 0.0
+
+            rows = []
+            total_frames = 0
+
+            for message_id, statistics in self.messages.items():
+                new_frames = statistics.count - statistics.counted_at_snapshot
+                total_frames += new_frames
+
+                if elapsed > 0:
+                    statistics.counted_at_snapshot = statistics.count
+
+                rows.append({
+                    "id": message_id,
+                    "count": statistics.count,
+                    "rate": new_frames / elapsed if elapsed > 0 else 0.0,
+                    "cycle_ms": statistics.interval_mean / 1000 if statistics.interval_mean is not None else None,
+                    "jitter_ms": math.sqrt(statistics.interval_variance) / 1000,
+                    "late": statistics.late,
+                    "length": statistics.length,
+                })
+
+            utilization = None
+            frame_rate = 0.0
+
+            if elapsed > 0:
+                frame_rate = total_frames / elapsed
+                if self.can_baud_rate:
+                    utilization = 100 * (self.total_bits - self.snapshot_bits) / (elapsed * self.can_baud_rate)
+
+                self.snapshot_timestamp = now
+                self.snapshot_bits = self.total_bits
+
+        rows.sort(key=lambda row: row["rate"], reverse=True)
+        return {"utilization": utilization, "frame_rate": frame_rate, "messages": rows}
+
+    def reset(self) -> None:
+        with self.lock:
+            self.messages.clear()
+            self.total_bits = 0
+            self.latest_timestamp = None
+            self.snapshot_timestamp = None
+            self.snapshot_bits = 0
+
+
+def format_table(snapshot: dict, max_rows: int) -> str:
+    """The per-ID rows of a snapshot as fixed-width text, busiest first"""
+    lines = [f"{'ID':>10} {'DLC':>3} {'Rate/Hz':>8} {'Cycle/ms':>9} {'Jitter/ms':>9} {'Late':>6} {'Frames':>9}"]
+
+    for row in snapshot["messages"][:max_rows]:
+        cycle = f"{row['cycle_ms']:.2f}" if row["cycle_ms"] is not None else "-"
+        lines.append(
+            f"{row['id']:>#10x} {row['length']:>3} {row['rate']:>8.1f} {cycle:>9} {row['jitter_ms']:>9.3f} "
+            f"{row['late']:>6} {row['count']:>9}"
+        )
+
+    hidden = len(snapshot["messages"]) - max_rows
+    if hidden > 0:
+        lines.append(f"... and {hidden} more IDs")
+
+    return "\n".join(lines)
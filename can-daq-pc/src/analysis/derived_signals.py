@@ -0,0 +1,297 @@
+"""
+Derived signals
+-   computed channels defined by an expression over existing signal names, e.g. `voltage * current`
+-   expressions are parsed once, checked against a whitelist of operations, and compiled to a NumPy expression
+    evaluated over whole batches of samples
+-   inputs from different messages are aligned by holding each input's latest value (zero-order hold)
+"""
+
+import ast
+import math
+from logging import getLogger
+
+import numpy
+
+logger = getLogger(__name__)
+
+FUNCTIONS = {
+    "abs": numpy.abs,
+    "sqrt": numpy.sqrt,
+    "exp": numpy.exp,
+    "log": numpy.log,
+    "log10": numpy.log10,
+    "sin": numpy.sin,
+    "cos": numpy.cos,
+    "tan": numpy.tan,
+    "arctan2": numpy.arctan2,
+    "hypot": numpy.hypot,
+    "floor": numpy.floor,
+    "ceil": numpy.ceil,
+    "round": numpy.round,
+    "minimum": numpy.minimum,
+    "maximum": numpy.maximum,
+    "clip": numpy.clip,
+    "where": numpy.where,
+}   # stateless functions, applied element-wise
+
+CONSTANTS = {
+    "pi": math.pi,
+    "e": math.e,
+}
+
+ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.USub, ast.UAdd, ast.Invert, ast.BitAnd, ast.BitOr, ast.BitXor,
+    ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq,
+)
+
+
+class DerivedSignalError(ValueError):
+    """Raised for invalid derived signal definitions"""
+
+
+class MovingAverage:
+    """
+    `moving_average(x, n)`: mean of the last n samples, continued across batches
+    """
+
+    def __init__(self):
+        self.history = numpy.empty(0)
+
+    def __call__(self, values: numpy.ndarray, ticks: numpy.ndarray, window) -> numpy.ndarray:
+        window = int(window)
+        if window < 1:
+            raise DerivedSignalError("moving_average window must be at least 1 sample")
+
+        values = numpy.broadcast_to(values, ticks.shape).astype(numpy.float64)
+        extended = numpy.concatenate((self.history, values))
+        cumulative = numpy.concatenate(([0.0], numpy.cumsum(extended)))
+
+        ends = numpy.arange(len(self.history) + 1, len(extended) + 1)
+        starts = numpy.maximum(ends - window, 0)
+        self.history = extended[-(window - 1):] if window > 1 else numpy.empty(0)
+
+        return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+class Derivative:
+    """
+    `derivative(x)`: rate of change per second, continued across batches
+    """
+
+    def __init__(self):
+        self.last_tick = None
+        self.last_value = None
+
+    def __call__(self, values: numpy.ndarray, ticks: numpy.ndarray) -> numpy.ndarray:
+        values = numpy.broadcast_to(values, ticks.shape).astype(numpy.float64)
+
+        previous_ticks = numpy.concatenate(([self.last_tick if self.last_tick is not None else ticks[0]], ticks[:-1]))
+        previous_values = numpy.concatenate(([self.last_value if self.last_value is not None else values[0]], values[:-1]))
+        self.last_tick, self.last_value = ticks[-1], values[-1]
+
+        elapsed = (ticks - previous_ticks) / 1e6
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            return numpy.where(elapsed > 0, (values - previous_values) / elapsed, 0.0)
+
+
+STATEFUL_FUNCTIONS = {
+    "moving_average": MovingAverage,
+    "derivative": Derivative,
+}   # functions with state carried from batch to batch, they also receive the sample times
+
+
+class StatefulCallRewriter(ast.NodeTransformer):
+    """Give every stateful call its own state object, and pass it the sample times (`_t`)"""
+
+    def __init__(self):
+        self.instances = {}
+
+    def visit_Call(self, node: ast.Call):
+        self.generic_visit(node)
+
+        if node.func.id in STATEFUL_FUNCTIONS:
+            instance_name = f"_state_{len(self.instances)}"
+            self.instances[instance_name] = STATEFUL_FUNCTIONS[node.func.id]()
+            node.func = ast.Name(id=instance_name, ctx=ast.Load())
+            node.args.insert(1, ast.Name(id="_t", ctx=ast.Load()))
+
+        return node
+
+
+class DerivedSignal:
+    """
+    Derived Signal class
+    -   `inputs` are the signal names used by the expression
+    -   `log_to_session` writes the results to the session database alongside the decoded signals
+    """
+
+    def __init__(
+        self,
+        name: str,
+        expression: str,
+        unit: str = "",
+        minimum: float = 0.0,
+        maximum: float = 1.0,
+        log_to_session: bool = False,
+    ):
+        self.name = name
+        self.expression = expression
+        self.unit = unit
+        self.min = minimum
+        self.max = maximum
+        self.log_to_session = log_to_session
+
+        try:
+            tree = ast.parse(expression, mode="eval")
+        except SyntaxError as e:
+            raise DerivedSignalError(f"Invalid expression: {e.msg}") from e
+
+        self.inputs = self.validate(tree)
+
+        rewriter = StatefulCallRewriter()
+        tree = ast.fix_missing_locations(rewriter.visit(tree))
+        self.state = rewriter.instances
+        self.code = compile(tree, f"<derived signal {name}>", "eval")
+
+    def validate(self, tree: ast.Expression) -> list[str]:
+        """
+        -   reject everything but arithmetic, comparisons, and calls of the whitelisted functions
+        -   return the names of the input signals, in order of appearance
+        """
+
+        inputs = []
+
+        for node in ast.walk(tree):
+            if not isinstance(node, ALLOWED_NODES):
+                raise DerivedSignalError(f"Not allowed in expressions: {type(node).__name__}")
+
+            if isinstance(node, ast.Compare) and len(node.ops) > 1:
+                raise DerivedSignalError("Chained comparisons are not supported, combine them with & or |")
+
+            if isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name) or node.keywords:
+                    raise DerivedSignalError("Only plain calls of the supported functions are allowed")
+                if node.func.id not in FUNCTIONS and node.func.id not in STATEFUL_FUNCTIONS:
+                    raise DerivedSignalError(f"Unknown function: {node.func.id}")
+
+            if isinstance(node, ast.Name) and node.id not in FUNCTIONS and node.id not in STATEFUL_FUNCTIONS:
+                if node.id not in CONSTANTS and node.id not in inputs:
+                    inputs.append(node.id)
+
+        if not inputs:
+            raise DerivedSignalError("The expression does not use any signal")
+
+        return inputs
+
+    def evaluate(self, ticks: numpy.ndarray, inputs: dict[str, numpy.ndarray]) -> numpy.ndarray:
+        namespace = {"__builtins__": {}, **FUNCTIONS, **CONSTANTS, **self.state, **inputs, "_t": ticks}
+        values = eval(self.code, namespace)
+        return numpy.broadcast_to(numpy.asarray(values, dtype=numpy.float64), ticks.shape).copy()
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "expression": self.expression,
+            "unit": self.unit,
+            "min": self.min,
+            "max": self.max,
+            "log_to_session": self.log_to_session,
+        }
+
+
+class DerivedSignalEngine:
+    """
+    Derived Signal Engine class
+    -   evaluates all definitions on each columnar chunk `{signal_name: (timestamps, values)}`
+    -   a derived signal gets a sample whenever any of its inputs does; the other inputs hold their latest value
+    -   definitions are evaluated in order, so later ones can use earlier ones
+    """
+
+    def __init__(self, signal_names: list[str]):
+        self.signal_names = set(signal_names)
+        self.definitions: dict[str, DerivedSignal] = {}
+        self.last_values: dict[str, tuple[int, float]] = {}  # latest sample of every input, across chunks
+
+    def add(self, derived_signal: DerivedSignal) -> None:
+        if derived_signal.name in self.signal_names or derived_signal.name in self.definitions:
+            raise DerivedSignalError(f"A signal named {derived_signal.name} already exists")
+
+        unknown = [name for name in derived_signal.inputs if name not in self.signal_names and name not in self.definitions]
+        if unknown:
+            raise DerivedSignalError(f"Unknown signals: {', '.join(unknown)}")
+
+        self.definitions[derived_signal.name] = derived_signal
+
+    def evaluate(self, columnar_chunk: dict[str, tuple[numpy.ndarray, numpy.ndarray]]) -> dict[str, tuple[numpy.ndarray, numpy.ndarray]]:
+        """
+        return the samples of every derived signal with new input samples in the chunk
+        """
+
+        # snapshot, `add()` may run on the Tk thread while the pipeline evaluates
+        definitions = list(self.definitions.values())
+
+        if not definitions:
+            return {}
+
+        available = dict(columnar_chunk)
+        results = {}
+
+        for derived_signal in definitions:
+            new_inputs = [name for name in derived_signal.inputs if name in available]
+            if not new_inputs:
+                continue
+
+            ticks = numpy.unique(numpy.concatenate([available[name][0] for name in new_inputs]))
+            aligned = {}
+            valid = numpy.ones(len(ticks), dtype=bool)
+
+            for name in derived_signal.inputs:
+                aligned[name], known = self.hold(name, available.get(name), ticks)
+                valid &= known
+
+            ticks = ticks[valid]
+            if not len(ticks):
+                continue
+
+            try:
+                values = derived_signal.evaluate(ticks, {name: values[valid] for name, values in aligned.items()})
+            except Exception as e:
+                logger.error(f"Failed to evaluate derived signal {derived_signal.name}: {e}")
+                continue
+
+            results[derived_signal.name] = (ticks, values)
+            available[derived_signal.name] = (ticks, values)
+
+        for name in {name for derived_signal in definitions for name in derived_signal.inputs}:
+            if name in available and len(available[name][0]):
+                self.last_values[name] = (int(available[name][0][-1]), float(available[name][1][-1]))
+
+        return results
+
+    def hold(
+        self, name: str, samples: tuple[numpy.ndarray, numpy.ndarray] | None, ticks: numpy.ndarray
+    ) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        -   return the value of input `name` at every tick (its latest sample at or before the tick)
+        -   and a mask of the ticks for which the input has a value at all
+        """
+
+        last = self.last_values.get(name)
+
+        if samples is None or not len(samples[0]):
+            if last is None:
+                return numpy.full(len(ticks), numpy.nan), numpy.zeros(len(ticks), dtype=bool)
+            return numpy.full(len(ticks), last[1]), numpy.ones(len(ticks), dtype=bool)
+
+        input_ticks, input_values = samples
+        index = numpy.searchsorted(input_ticks, ticks, side="right") - 1
+        values = input_values[numpy.maximum(index, 0)]
+        known = index >= 0
+
+        if last is not None:
+            values = numpy.where(known, values, last[1])
+            known = numpy.ones(len(ticks), dtype=bool)
+
+        return values, known
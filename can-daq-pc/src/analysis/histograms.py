@@ -0,0 +1,194 @@
+"""
+Streaming value histograms
+-   value distribution of a signal over the whole session and over a sliding time window
+-   fixed bins, from the DBC range and resolution of the signal, so every batch is binned once with
+    `numpy.bincount` and added to running counts, no sample is kept or revisited
+-   the sliding window keeps one count array per time block, like the sliding window statistics
+"""
+
+import collections
+import math
+import threading
+
+import numpy
+
+import src.messages
+from src.analysis.statistics import DEFAULT_WINDOW, DEFAULT_WINDOW_BLOCKS
+
+DEFAULT_BINS = 64       # used when the signal has no usable resolution
+MAX_BINS = 256          # bins are widened to a multiple of the signal resolution to stay below this
+
+
+def default_bins(signal: src.messages.Signal) -> tuple[float, float, int] | None:
+    """
+    -   return `(lower edge, bin width, bin count)` from the DBC range and scaling of the signal, or `None` if the
+        DBC range is unusable (then the range is taken from the first samples)
+    -   the bin width is a multiple of the scaling, and bins are centred on the representable values, so
+        quantization shows as evenly filled bins instead of aliasing
+    """
+
+    if signal.min is None or signal.max is None or not signal.max > signal.min:
+        return None
+
+    span = float(signal.max - signal.min)
+    resolution = abs(float(signal.scaling)) if signal.scaling else 0.0
+
+    if not resolution or span / resolution > 1e9:
+        width = span / DEFAULT_BINS
+    else:
+        width = resolution * math.ceil(span / resolution / MAX_BINS)
+
+    count = int(math.floor(span / width + 1e-9)) + 1
+    return float(signal.min) - width / 2, width, count
+
+
+def bins_from_values(values: numpy.ndarray, bins: int = DEFAULT_BINS) -> tuple[float, float, int] | None:
+    """bins over the range of the given samples, widened by 10 %, for signals without a DBC range"""
+    values = values[numpy.isfinite(values)]
+    if not len(values):
+        return None
+
+    low, high = float(numpy.min(values)), float(numpy.max(values))
+    margin = 0.1 * (high - low) or max(abs(low) * 0.1, 1.0)
+    return low - margin / 2, (high - low + margin) / bins, bins
+
+
+class Histogram:
+    """
+    Histogram class
+    -   `counts` of the bins, plus the samples below and above the bins
+    """
+
+    def __init__(self, lower: float, width: float, bins: int):
+        self.lower = lower
+        self.width = width
+        self.counts = numpy.zeros(bins, dtype=numpy.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    @property
+    def edges(self) -> numpy.ndarray:
+        return self.lower + self.width * numpy.arange(len(self.counts) + 1)
+
+    def bin_values(self, values: numpy.ndarray) -> tuple[numpy.ndarray, int, int]:
+        """return the bin counts of a batch, and its number of samples below and above the bins (NaN is ignored)"""
+        index = numpy.floor((values - self.lower) / self.width)
+        below = int(numpy.count_nonzero(index < 0))
+        above = int(numpy.count_nonzero(index >= len(self.counts)))
+        inside = index[(index >= 0) & (index < len(self.counts))].astype(numpy.int64)
+        return numpy.bincount(inside, minlength=len(self.counts)), below, above
+
+    def add(self, counts: numpy.ndarray, below: int, above: int) -> None:
+        self.counts += counts
+        self.underflow += below
+        self.overflow += above
+
+    def subtract(self, other: "Histogram") -> None:
+        self.counts -= other.counts
+        self.underflow -= other.underflow
+        self.overflow -= other.overflow
+
+    def copy(self) -> "Histogram":
+        histogram = Histogram(self.lower, self.width, len(self.counts))
+        histogram.add(self.counts, self.underflow, self.overflow)
+        return histogram
+
+
+class SlidingWindowHistogram:
+    """
+    Sliding Window Histogram class
+    -   the window is split into time blocks with one `Histogram` each
+    -   the window counts are kept as a running sum: blocks are added when filled and subtracted when dropped
+    """
+
+    def __init__(self, lower: float, width: float, bins: int, window_us: int, blocks: int = DEFAULT_WINDOW_BLOCKS):
+        self.block_width = max(window_us // blocks, 1)
+        self.blocks = blocks
+        self.block_histograms: collections.deque[tuple[int, Histogram]] = collections.deque()
+        self.total = Histogram(lower, width, bins)
+
+    def update(self, timestamps: numpy.ndarray, values: numpy.ndarray) -> None:
+        if not len(timestamps):
+            return
+
+        block_index = timestamps // self.block_width
+        starts = numpy.flatnonzero(numpy.diff(block_index, prepend=block_index[0] - 1))
+        stops = numpy.append(starts[1:], len(values))
+
+        for start, stop in zip(starts, stops):
+            index = int(block_index[start])
+
+            if not self.block_histograms or self.block_histograms[-1][0] < index:
+                self.block_histograms.append((index, Histogram(self.total.lower, self.total.width, len(self.total.counts))))
+
+            # late samples (older than the newest block) are counted in the newest block, so blocks stay in order
+            binned = self.total.bin_values(values[start:stop])
+            self.block_histograms[-1][1].add(*binned)
+            self.total.add(*binned)
+
+        newest = self.block_histograms[-1][0]
+        while self.block_histograms[0][0] <= newest - self.blocks:
+            self.total.subtract(self.block_histograms.popleft()[1])
+
+
+class HistogramEngine:
+    """
+    Histogram Engine class
+    -   fed with columnar chunks `{signal_name: (timestamps, values)}`, like the statistics engine
+    -   only the signals given to `set_signals()` are binned, their session histogram starts when they are added
+    -   `get()` can be called from any thread at any time
+    """
+
+    def __init__(self, window: float = DEFAULT_WINDOW, blocks: int = DEFAULT_WINDOW_BLOCKS):
+        self.window = window
+        self.blocks = blocks
+        self.signals: dict[str, src.messages.Signal] = {}
+        self.session: dict[str, Histogram] = {}
+        self.windowed: dict[str, SlidingWindowHistogram] = {}
+        self.version = 0    # bumped on every update, to redraw only when something changed
+        self.lock = threading.Lock()
+
+    def set_signals(self, signals: list[src.messages.Signal]) -> None:
+        """Start binning new signals and drop the histograms of the signals not given"""
+        with self.lock:
+            self.signals = {signal.name: signal for signal in signals}
+            self.session = {name: histogram for name, histogram in self.session.items() if name in self.signals}
+            self.windowed = {name: histogram for name, histogram in self.windowed.items() if name in self.signals}
+            self.version += 1
+
+    def update(self, columnar_chunk: dict[str, tuple[numpy.ndarray, numpy.ndarray]]) -> None:
+        with self.lock:
+            for signal_name, signal in self.signals.items():
+                if signal_name not in columnar_chunk:
+                    continue
+
+                timestamps, values = columnar_chunk[signal_name]
+
+                if signal_name not in self.session:
+                    bins = default_bins(signal) or bins_from_values(values)
+                    if bins is None:
+                        continue
+                    self.session[signal_name] = Histogram(*bins)
+                    self.windowed[signal_name] = SlidingWindowHistogram(*bins, int(self.window * 1e6), self.blocks)
+
+                self.session[signal_name].add(*self.session[signal_name].bin_values(values))
+                self.windowed[signal_name].update(timestamps, values)
+                self.version += 1
+
+    def get(self, signal_name: str, windowed: bool = True) -> Histogram | None:
+        """
+        return a copy of the sliding window (or whole session) histogram of one signal, or `None` if it has none
+        """
+
+        with self.lock:
+            if signal_name not in self.session:
+                return None
+
+            histogram = self.windowed[signal_name].total if windowed else self.session[signal_name]
+            return histogram.copy()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.session.clear()
+            self.windowed.clear()
+            self.version += 1
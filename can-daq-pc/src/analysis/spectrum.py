@@ -0,0 +1,109 @@
+"""
+Streaming power spectral density
+-   Welch's method: Hann-windowed segments with 50 % overlap, the periodograms of the newest segments are averaged
+-   CAN timestamps are irregular, samples are linearly interpolated onto a uniform grid first
+-   incremental: every segment is transformed once, when it is complete, and never again
+"""
+
+import collections
+
+import numpy
+
+DEFAULT_SEGMENT_LENGTH = 1024   # samples per FFT segment
+DEFAULT_AVERAGES = 8            # segments averaged into the displayed PSD
+MIN_RATE_ESTIMATE_SAMPLES = 16
+
+
+def estimate_sample_rate(ticks: numpy.ndarray) -> float | None:
+    """
+    return the sample rate in Hz from timestamps in microseconds (median interval), or `None` if there are too few
+    """
+
+    if len(ticks) < MIN_RATE_ESTIMATE_SAMPLES:
+        return None
+
+    interval = float(numpy.median(numpy.diff(ticks)))
+    return 1e6 / interval if interval > 0 else None
+
+
+class WelchSpectrum:
+    """
+    Welch Spectrum class
+    -   fed with raw `(ticks, values)` arrays (int64 microseconds, float64), only the samples newer than the previous
+        update are used, so the same ring buffer view can be passed again
+    -   `get()` returns the one-sided PSD in units²/Hz over the frequency bins
+    """
+
+    def __init__(self, sample_rate: float, segment_length: int = DEFAULT_SEGMENT_LENGTH, averages: int = DEFAULT_AVERAGES):
+        self.sample_rate = sample_rate
+        self.segment_length = segment_length
+        self.step = segment_length // 2
+        self.interval = 1e6 / sample_rate   # µs between grid points
+
+        self.window = numpy.hanning(segment_length)
+        self.scale = 1.0 / (sample_rate * numpy.sum(self.window ** 2))
+        self.frequencies = numpy.fft.rfftfreq(segment_length, d=1.0 / sample_rate)
+
+        self.last_tick: int = None      # newest raw sample seen, kept for interpolating across updates
+        self.last_value: float = None
+        self.next_grid_tick: float = None
+        self.pending = numpy.empty(0)   # resampled values not yet consumed by a segment
+        self.periodograms: collections.deque[numpy.ndarray] = collections.deque(maxlen=averages)
+        self.segment_count = 0
+
+    def update(self, ticks: numpy.ndarray, values: numpy.ndarray) -> int:
+        """
+        -   resample the new samples onto the uniform grid and transform every segment that became complete
+        -   return the number of new segments
+        """
+
+        if self.last_tick is not None:
+            start = numpy.searchsorted(ticks, self.last_tick, side="right")
+            ticks, values = ticks[start:], values[start:]
+
+        if not len(ticks):
+            return 0
+
+        if self.last_tick is not None and ticks[0] - self.last_tick > self.segment_length * self.interval:
+            # a gap longer than a segment (e.g. monitoring was stopped): start a fresh grid instead of bridging it
+            self.last_tick = None
+            self.pending = numpy.empty(0)
+
+        if self.last_tick is not None:
+            ticks = numpy.concatenate(([self.last_tick], ticks))
+            values = numpy.concatenate(([self.last_value], values))
+        else:
+            self.next_grid_tick = float(ticks[0])
+
+        self.last_tick, self.last_value = int(ticks[-1]), float(values[-1])
+
+        grid = numpy.arange(self.next_grid_tick, ticks[-1] + 1, self.interval)
+        if len(grid):
+            self.pending = numpy.concatenate((self.pending, numpy.interp(grid, ticks, values)))
+            self.next_grid_tick = grid[-1] + self.interval
+
+        new_segments = 0
+
+        while len(self.pending) >= self.segment_length:
+            segment = self.pending[:self.segment_length]
+            spectrum = numpy.fft.rfft((segment - segment.mean()) * self.window)
+
+            periodogram = numpy.abs(spectrum) ** 2 * self.scale
+            periodogram[1:-1] *= 2  # one-sided: fold the negative frequencies in
+
+            self.periodograms.append(periodogram)
+            self.pending = self.pending[self.step:]
+            new_segments += 1
+
+        self.segment_count += new_segments
+        return new_segments
+
+    def get(self) -> tuple[numpy.ndarray, numpy.ndarray] | None:
+        """
+        return `(frequencies, psd)`, or `None` until the first segment is complete
+        """
+
+        if not self.periodograms:
+            return None
+
+        return self.frequencies, numpy.mean(self.periodograms, axis=0)
@@ -0,0 +1,164 @@
+"""
+Streaming signal statistics
+-   incremental mean, RMS, standard deviation, min, max and peak-to-peak per signal
+-   whole-session aggregates, and aggregates over a sliding time window
+-   updated with whole arrays of samples: the batch is reduced with NumPy, then merged in O(1)
+    (Welford/Chan parallel update), so no sample is ever kept or revisited
+"""
+
+import collections
+import math
+import threading
+
+import numpy
+
+DEFAULT_WINDOW = 10.0       # s
+DEFAULT_WINDOW_BLOCKS = 20  # the sliding window advances in steps of window / blocks
+
+
+class RunningStatistics:
+    """
+    Running Statistics class
+    -   count, mean and the sum of squared deviations (`m2`), plus min and max
+    -   two instances can be merged exactly, whatever samples they have seen
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: numpy.ndarray) -> None:
+        """Add a batch of samples"""
+        if not len(values):
+            return
+
+        batch = RunningStatistics()
+        batch.count = len(values)
+        batch.mean = float(numpy.mean(values))
+        batch.m2 = float(numpy.sum(numpy.square(values - batch.mean)))
+        batch.min = float(numpy.min(values))
+        batch.max = float(numpy.max(values))
+        self.merge(batch)
+
+    def merge(self, other: "RunningStatistics") -> None:
+        """Combine with the statistics of other samples (Chan et al.)"""
+        if not other.count:
+            return
+
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> dict[str, float]:
+        if not self.count:
+            return {"count": 0, "mean": 0.0, "rms": 0.0, "std": 0.0, "min": 0.0, "max": 0.0, "ptp": 0.0}
+
+        variance = self.m2 / self.count
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "rms": math.sqrt(max(variance + self.mean * self.mean, 0.0)),
+            "std": math.sqrt(max(variance, 0.0)),
+            "min": self.min,
+            "max": self.max,
+            "ptp": self.max - self.min,
+        }
+
+
+class SlidingWindowStatistics:
+    """
+    Sliding Window Statistics class
+    -   the window is split into time blocks with one `RunningStatistics` each
+    -   blocks leaving the window are dropped, the window aggregate merges the remaining blocks
+    -   the covered span is between `window - block` and `window`
+    """
+
+    def __init__(self, window_us: int, blocks: int = DEFAULT_WINDOW_BLOCKS):
+        self.block_width = max(window_us // blocks, 1)
+        self.blocks = blocks
+        self.block_statistics: collections.deque[tuple[int, RunningStatistics]] = collections.deque()
+
+    def update(self, timestamps: numpy.ndarray, values: numpy.ndarray) -> None:
+        if not len(timestamps):
+            return
+
+        block_index = timestamps // self.block_width
+        starts = numpy.flatnonzero(numpy.diff(block_index, prepend=block_index[0] - 1))
+        stops = numpy.append(starts[1:], len(values))
+
+        for start, stop in zip(starts, stops):
+            index = int(block_index[start])
+
+            if not self.block_statistics or self.block_statistics[-1][0] < index:
+                self.block_statistics.append((index, RunningStatistics()))
+
+            # late samples (older than the newest block) are counted in the newest block, so blocks stay in order
+            self.block_statistics[-1][1].update(values[start:stop])
+
+        newest = self.block_statistics[-1][0]
+        while self.block_statistics[0][0] <= newest - self.blocks:
+            self.block_statistics.popleft()
+
+    def aggregate(self) -> RunningStatistics:
+        total = RunningStatistics()
+        for _, block in self.block_statistics:
+            total.merge(block)
+        return total
+
+
+class StatisticsEngine:
+    """
+    Statistics Engine class
+    -   fed with columnar chunks `{signal_name: (timestamps, values)}` (int64 microseconds, float64)
+    -   keeps the statistics of every signal it sees, selected for display or not
+    -   `get()` can be called from any thread at any time
+    """
+
+    def __init__(self, window: float = DEFAULT_WINDOW, blocks: int = DEFAULT_WINDOW_BLOCKS):
+        self.window = window
+        self.blocks = blocks
+        self.session: dict[str, RunningStatistics] = {}
+        self.windowed: dict[str, SlidingWindowStatistics] = {}
+        self.lock = threading.Lock()
+
+    def update(self, columnar_chunk: dict[str, tuple[numpy.ndarray, numpy.ndarray]]) -> None:
+        with self.lock:
+            for signal_name, (timestamps, values) in columnar_chunk.items():
+                if signal_name not in self.session:
+                    self.session[signal_name] = RunningStatistics()
+                    self.windowed[signal_name] = SlidingWindowStatistics(int(self.window * 1e6), self.blocks)
+
+                self.session[signal_name].update(values)
+                self.windowed[signal_name].update(timestamps, values)
+
+    def get(self, signal_name: str) -> dict[str, dict[str, float]] | None:
+        """
+        return `{"window": {...}, "session": {...}}` for one signal, or `None` if it has no samples yet
+        """
+
+        with self.lock:
+            if signal_name not in self.session:
+                return None
+
+            return {
+                "window": self.windowed[signal_name].aggregate().to_dict(),
+                "session": self.session[signal_name].to_dict(),
+            }
+
+    def reset(self) -> None:
+        with self.lock:
+            self.session.clear()
+            self.windowed.clear()
@@ -0,0 +1,274 @@
+"""
+Triggers
+-   conditions on a signal, evaluated vectorized on every columnar chunk of the acquisition
+-   on a match, the samples around the trigger time (pre- and post-trigger window) are frozen from the ring
+    buffers into an event record, once the post-trigger window has been received
+-   a trigger can also start or stop the logging of all frames, for event-based capture
+"""
+
+import io
+from logging import getLogger
+
+import numpy
+
+import src.ring_buffer
+
+logger = getLogger(__name__)
+
+MAX_PENDING_CAPTURES = 16   # triggers firing faster than their windows complete are dropped beyond this
+
+
+def rises_above(trigger, previous: numpy.ndarray, values: numpy.ndarray, ticks: numpy.ndarray) -> numpy.ndarray:
+    return (previous <= trigger.threshold) & (values > trigger.threshold)
+
+
+def falls_below(trigger, previous: numpy.ndarray, values: numpy.ndarray, ticks: numpy.ndarray) -> numpy.ndarray:
+    return (previous >= trigger.threshold) & (values < trigger.threshold)
+
+
+def crosses(trigger, previous: numpy.ndarray, values: numpy.ndarray, ticks: numpy.ndarray) -> numpy.ndarray:
+    return rises_above(trigger, previous, values, ticks) | falls_below(trigger, previous, values, ticks)
+
+
+def edge(trigger, previous: numpy.ndarray, values: numpy.ndarray, ticks: numpy.ndarray) -> numpy.ndarray:
+    """the value changes by more than the threshold from one sample to the next (0: any change)"""
+    return numpy.abs(values - previous) > trigger.threshold
+
+
+def out_of_range(trigger, previous: numpy.ndarray, values: numpy.ndarray, ticks: numpy.ndarray) -> numpy.ndarray:
+    """the value leaves the DBC range of the signal"""
+    outside = (values < trigger.minimum) | (values > trigger.maximum)
+    was_outside = (previous < trigger.minimum) | (previous > trigger.maximum)
+    return outside & ~was_outside
+
+
+condition_details = {
+    "Rises above": {"function": rises_above, "threshold": "Threshold"},
+    "Falls below": {"function": falls_below, "threshold": "Threshold"},
+    "Crosses": {"function": crosses, "threshold": "Threshold"},
+    "Edge": {"function": edge, "threshold": "Min. step"},
+    "Out of DBC range": {"function": out_of_range, "threshold": None},
+    "Message timeout": {"function": None, "threshold": "Timeout /ms"},
+}   # conditions on consecutive samples of a signal; the timeout is checked on the gaps between samples
+
+TRIGGER_ACTIONS = ["Capture only", "Capture and start logging", "Capture and stop logging"]
+
+
+class Trigger:
+    """
+    Trigger class
+    -   `minimum`/`maximum` are the DBC range of the signal, used by "Out of DBC range"
+    -   `capture_signals` are frozen into the event record, in addition to the trigger signal
+    -   after firing, the trigger is re-armed once its post-trigger window has passed
+    """
+
+    def __init__(
+        self,
+        name: str,
+        signal_name: str,
+        condition: str,
+        threshold: float = 0.0,
+        minimum: float = None,
+        maximum: float = None,
+        pre_trigger: float = 1.0,
+        post_trigger: float = 1.0,
+        action: str = TRIGGER_ACTIONS[0],
+        capture_signals: list[str] = None,
+    ):
+        if condition not in condition_details:
+            raise ValueError(f"Unknown trigger condition: {condition}")
+        if action not in TRIGGER_ACTIONS:
+            raise ValueError(f"Unknown trigger action: {action}")
+        if condition == "Out of DBC range" and (minimum is None or maximum is None):
+            raise ValueError(f"{signal_name} has no DBC range")
+        if pre_trigger < 0 or post_trigger < 0:
+            raise ValueError("Trigger windows cannot be negative")
+
+        self.name = name
+        self.signal_name = signal_name
+        self.condition = condition
+        self.threshold = threshold
+        self.minimum = minimum
+        self.maximum = maximum
+        self.pre_trigger_us = int(pre_trigger * 1e6)
+        self.post_trigger_us = int(post_trigger * 1e6)
+        self.action = action
+        self.capture_signals = list(dict.fromkeys([signal_name] + (capture_signals or [])))
+
+        self.armed_from: int = None     # no match is accepted before this tick (hold-off after firing)
+        self.event_count = 0
+
+    def accept(self, match_ticks: numpy.ndarray) -> list[int]:
+        """
+        return the match ticks that fire the trigger, skipping those within the hold-off of a previous one
+        """
+
+        fired = []
+        index = 0 if self.armed_from is None else int(numpy.searchsorted(match_ticks, self.armed_from))
+
+        while index < len(match_ticks):
+            tick = int(match_ticks[index])
+            fired.append(tick)
+            self.armed_from = tick + max(self.post_trigger_us, 1)
+            index = int(numpy.searchsorted(match_ticks, self.armed_from))
+
+        return fired
+
+
+class TriggerEngine:
+    """
+    Trigger Engine class
+    -   `evaluate(columnar_chunk)` returns the triggers that fired, with their trigger times
+    -   `collect(ring_buffers)` returns the event records whose post-trigger window is complete
+    -   the latest sample of every trigger signal is kept, so conditions and timeouts span chunk boundaries
+    """
+
+    def __init__(self):
+        self.triggers: list[Trigger] = []
+        self.last_samples: dict[str, tuple[int, float]] = {}
+        self.timed_out: dict[str, int] = {}     # trigger name: tick of the last sample before the reported timeout
+        self.latest_tick = 0                    # newest timestamp seen on any signal, the bus time
+        self.pending: list[tuple[Trigger, int]] = []
+
+    def add(self, trigger: Trigger) -> None:
+        if any(existing.name == trigger.name for existing in self.triggers):
+            raise ValueError(f"A trigger named {trigger.name} already exists")
+        self.triggers.append(trigger)
+
+    def remove(self, name: str) -> None:
+        self.triggers = [trigger for trigger in self.triggers if trigger.name != name]
+        self.pending = [(trigger, tick) for trigger, tick in self.pending if trigger.name != name]
+
+    def evaluate(self, columnar_chunk: dict[str, tuple[numpy.ndarray, numpy.ndarray]]) -> list[tuple[Trigger, int]]:
+        fired = []
+
+        for ticks, _ in columnar_chunk.values():
+            if len(ticks):
+                self.latest_tick = max(self.latest_tick, int(ticks[-1]))
+
+        for trigger in self.triggers:
+            ticks, values = columnar_chunk.get(trigger.signal_name, (None, None))
+
+            if trigger.condition == "Message timeout":
+                match_ticks = self.find_timeouts(trigger, ticks)
+            elif ticks is None or not len(ticks):
+                continue
+            else:
+                match_ticks = self.find_matches(trigger, ticks, values)
+
+            for tick in trigger.accept(match_ticks):
+                fired.append((trigger, tick))
+
+        for signal_name in {trigger.signal_name for trigger in self.triggers}:
+            ticks, values = columnar_chunk.get(signal_name, (None, None))
+            if ticks is not None and len(ticks):
+                self.last_samples[signal_name] = (int(ticks[-1]), float(values[-1]))
+
+        for trigger, tick in fired:
+            trigger.event_count += 1
+            if len(self.pending) < MAX_PENDING_CAPTURES:
+                self.pending.append((trigger, tick))
+            else:
+                logger.warning(f"Trigger {trigger.name} fired with {MAX_PENDING_CAPTURES} captures pending, not captured")
+
+        return fired
+
+    def find_matches(self, trigger: Trigger, ticks: numpy.ndarray, values: numpy.ndarray) -> numpy.ndarray:
+        """compare every sample with its predecessor, the first one with the last sample of the previous chunk"""
+        last = self.last_samples.get(trigger.signal_name)
+
+        if last is None:
+            previous = values[:-1]
+            ticks, values = ticks[1:], values[1:]
+        else:
+            previous = numpy.concatenate(([last[1]], values[:-1]))
+
+        condition = condition_details[trigger.condition]["function"]
+        return ticks[condition(trigger, previous, values, ticks)]
+
+    def find_timeouts(self, trigger: Trigger, ticks: numpy.ndarray | None) -> numpy.ndarray:
+        """
+        -   a timeout fires at `timeout` after a sample that is not followed by another one in time: either a gap
+            between samples, or a signal silent up to the newest bus time
+        -   each silence is reported once
+        """
+        timeout_us = int(trigger.threshold * 1000)
+        last = self.last_samples.get(trigger.signal_name)
+
+        if ticks is None or not len(ticks):
+            ticks = numpy.empty(0, dtype=numpy.int64)
+
+        sample_ticks = numpy.concatenate(([last[0]], ticks)) if last is not None else ticks
+        if not len(sample_ticks):
+            return numpy.empty(0, dtype=numpy.int64)
+
+        gap_ends = numpy.append(sample_ticks[1:], self.latest_tick)
+        silent = gap_ends - sample_ticks > timeout_us
+        starts = sample_ticks[silent]
+
+        # the silence that was already reported (it ran past the end of the previous chunk)
+        starts = starts[starts != self.timed_out.get(trigger.name)]
+        if len(starts):
+            self.timed_out[trigger.name] = int(starts[-1])
+
+        return starts + timeout_us
+
+    def collect(self, ring_buffers: dict[str, src.ring_buffer.RingBuffer]) -> list[dict]:
+        """
+        -   freeze the pre/post-trigger window of every pending capture whose window is complete
+        -   return the event records `{"trigger", "condition", "signal_name", "timestamp", "pre_us", "post_us",
+            "samples": {signal_name: (timestamps, values)}}`
+        """
+
+        events = []
+        still_pending = []
+
+        for trigger, tick in self.pending:
+            if self.latest_tick < tick + trigger.post_trigger_us:
+                still_pending.append((trigger, tick))
+                continue
+
+            samples = {}
+            for signal_name in trigger.capture_signals:
+                ring_buffer = ring_buffers.get(signal_name)
+                if ring_buffer is None:
+                    continue
+
+                ticks, values = ring_buffer.latest()
+                start = numpy.searchsorted(ticks, tick - trigger.pre_trigger_us, side="left")
+                end = numpy.searchsorted(ticks, tick + trigger.post_trigger_us, side="right")
+                samples[signal_name] = (ticks[start:end].copy(), values[start:end].copy())
+
+            events.append({
+                "trigger": trigger.name,
+                "condition": trigger.condition,
+                "signal_name": trigger.signal_name,
+                "timestamp": tick,
+                "pre_us": trigger.pre_trigger_us,
+                "post_us": trigger.post_trigger_us,
+                "samples": samples,
+            })
+
+        self.pending = still_pending
+        return events
+
+
+def pack_samples(samples: dict[str, tuple[numpy.ndarray, numpy.ndarray]]) -> bytes:
+    """compress the captured samples into one blob (NumPy .npz), two arrays per signal"""
+    arrays = {}
+    for index, (ticks, values) in enumerate(samples.values()):
+        arrays[f"ticks_{index}"] = ticks
+        arrays[f"values_{index}"] = values
+    arrays["names"] = numpy.array(list(samples), dtype=str)
+
+    buffer = io.BytesIO()
+    numpy.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def unpack_samples(blob: bytes) -> dict[str, tuple[numpy.ndarray, numpy.ndarray]]:
+    with numpy.load(io.BytesIO(blob)) as arrays:
+        return {
+            str(name): (arrays[f"ticks_{index}"], arrays[f"values_{index}"])
+            for index, name in enumerate(arrays["names"])
+        }
@@ -1,29 +1,74 @@
 """
 Database functionality for the data logging system
 -   initialize the database
--   insert frames into the database
+-   insert frames into the database, keeping per-bucket min/max rollups for zoomed-out views
+-   read signals back out of a session for analysis
+-   export many sessions in parallel
 """
 
+import concurrent.futures
 import csv
 import logging
+import os
 import sqlite3
 import threading
+import time
 from pathlib import Path
+from typing import Callable
 
+import numpy
+
+import src.analysis
 import src.protocols
 
-SCHEMA_PATH = Path("src/schema.sql")
+SCHEMA_PATH = Path(__file__).parent / "schema.sql"
 DB_PATH = Path("data_logging.db")
+READ_CHUNK_SIZE = 65536     # rows fetched per cursor round-trip when reading signals
+
+DURABILITY_MODES = {
+    "Max throughput": {
+        "synchronous": "OFF",   # never fsync, the OS decides when data reaches the disk
+        "checkpoint": False,
+        "bounded": False,
+    },
+    "Fsync every N ms": {
+        "synchronous": "NORMAL",    # WAL is fsynced at every checkpoint
+        "checkpoint": True,
+        "bounded": True,
+    },
+    "Fsync every batch": {
+        "synchronous": "FULL",  # WAL is fsynced at every commit
+        "checkpoint": False,
+        "bounded": True,
+    },
+}   # durability policies, all on top of the WAL journal mode
+DEFAULT_DURABILITY_MODE = "Max throughput"
+DEFAULT_DURABILITY_INTERVAL = 1000  # ms
+
+# rollup bucket widths as powers of two microseconds: ~66 ms, ~1 s, ~17 s
+ROLLUP_LEVELS = (16, 20, 24)
 
 logger = logging.getLogger(__name__)
 
 class LoggingDatabase:
 
-    def __init__(self, db_path: Path = DB_PATH, schema_path: Path = SCHEMA_PATH):
+    def __init__(
+        self,
+        db_path: Path = DB_PATH,
+        schema_path: Path = SCHEMA_PATH,
+        durability_mode: str = DEFAULT_DURABILITY_MODE,
+        durability_interval: int = DEFAULT_DURABILITY_INTERVAL,
+    ):
         self.logger = logger
         try:
             self.db_path = db_path
             self.schema_path = schema_path
+            self.durability_mode = durability_mode
+            self.durability = DURABILITY_MODES[durability_mode]
+            self.durability_interval = durability_interval / 1000
+            self.lock = threading.Lock()
+            self.last_checkpoint_time = time.monotonic()
+            self.unsynced_since: float = None   # monotonic time of the oldest commit not yet fsynced
 
             self.create_and_initialize_db()
         except Exception as e:
@@ -34,12 +79,15 @@ class LoggingDatabase:
         """
         -   create a database at the specified path
         -   initialize the database with the schema provided
+        -   switch the database to WAL mode (persistent), so readers in other connections or processes
+            get a consistent snapshot without blocking the writer
         """
 
         with open(self.schema_path, "r") as schema_file:
             schema = schema_file.read()
         
         with sqlite3.connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.executescript(schema)
             logger.info(f"Database created at {self.db_path}")
 
@@ -49,15 +97,17 @@ class LoggingDatabase:
         1. Insert messages and get their IDs
         2. Use message IDs to link signals
         3. Perform everything in a single transaction
+        4. Fsync according to the durability policy
         """
-        with threading.Lock():
+        with self.lock:
             with sqlite3.connect(self.db_path) as conn:
-                conn.execute("PRAGMA journal_mode=MEMORY")
-                conn.execute("PRAGMA synchronous=OFF")
+                conn.execute(f"PRAGMA synchronous={self.durability['synchronous']}")
                 cursor = conn.cursor()
                 
                 try:
                     cursor.execute("BEGIN TRANSACTION")
+
+                    rollup_samples: dict[str, tuple[list, list]] = {}
                     
                     for frame in frames:
                         # Insert message and get its ID
@@ -78,8 +128,20 @@ class LoggingDatabase:
                                 "INSERT INTO signals (timestamp, frame_id, signal_name, value) VALUES (?, ?, ?, ?)",
                                 signal_values
                             )
+
+                        for signal_name, value in frame.interpreted_data.items():
+                            timestamps, values = rollup_samples.setdefault(signal_name, ([], []))
+                            timestamps.append(frame.timestamp)
+                            values.append(value)
+
+                    self.update_rollups(cursor, rollup_samples)
                     
                     conn.commit()
+
+                    if self.durability["synchronous"] != "FULL" and self.unsynced_since is None:
+                        self.unsynced_since = time.monotonic()
+
+                    self.checkpoint_if_due(conn)
                 except sqlite3.Error as e:
                     conn.rollback()
                     logger.error(f"Database error occurred: {e}")
@@ -89,31 +151,689 @@ class LoggingDatabase:
                     conn.rollback()
                     raise
 
-    def export_to_csv(self, output_path: Path) -> None:
+    def insert_signal_samples(self, chunks: list[dict[str, tuple[numpy.ndarray, numpy.ndarray]]]):
         """
-        -   query the database for all messages and signals
-        -   using the relations between messages and signals, create a CSV file
-        -   write only the signals to the CSV file using csv library for proper handling
+        -   insert samples that do not come from a frame, e.g. derived signals, with no `frame_id`
+        -   `chunks` are columnar chunks `{signal_name: (timestamps, values)}`, all written in one transaction
+            together with their rollups
         """
 
-        with sqlite3.connect(self.db_path) as conn:
+        rollup_samples: dict[str, tuple[list, list]] = {}
+        for chunk in chunks:
+            for signal_name, (timestamps, values) in chunk.items():
+                all_timestamps, all_values = rollup_samples.setdefault(signal_name, ([], []))
+                all_timestamps.extend(timestamps.tolist())
+                all_values.extend(values.tolist())
+
+        if not rollup_samples:
+            return
+
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute(f"PRAGMA synchronous={self.durability['synchronous']}")
             cursor = conn.cursor()
 
-            cursor.execute(
+            try:
+                cursor.execute("BEGIN TRANSACTION")
+
+                for signal_name, (timestamps, values) in rollup_samples.items():
+                    cursor.executemany(
+                        "INSERT INTO signals (timestamp, frame_id, signal_name, value) VALUES (?, NULL, ?, ?)",
+                        zip(timestamps, [signal_name] * len(timestamps), values),
+                    )
+
+                self.update_rollups(cursor, rollup_samples)
+
+                conn.commit()
+
+                if self.durability["synchronous"] != "FULL" and self.unsynced_since is None:
+                    self.unsynced_since = time.monotonic()
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.error(f"Database error occurred: {e}")
+                raise
+
+    def insert_trigger_event(self, event: dict) -> None:
+        """
+        store one pre/post-trigger capture, as returned by `TriggerEngine.collect`
+        """
+
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute(
                 """
-                SELECT 
-                    messages.id,
-                    messages.timestamp, 
-                    messages.message_id,
-                    messages.length,
-                    signals.signal_name, 
-                    signals.value 
-                FROM signals 
-                JOIN messages ON signals.frame_id = messages.id
+                INSERT INTO trigger_events (timestamp, trigger_name, condition, signal_name, pre_trigger, post_trigger, samples)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    event["timestamp"],
+                    event["trigger"],
+                    event["condition"],
+                    event["signal_name"],
+                    event["pre_us"],
+                    event["post_us"],
+                    src.analysis.triggers.pack_samples(event["samples"]),
+                ),
+            )
+
+    def update_rollups(self, cursor: sqlite3.Cursor, rollup_samples: dict[str, tuple[list, list]]) -> None:
+        """
+        -   merge the samples of one batch into the min/max buckets of every rollup level
+        -   runs inside the insert transaction, so the rollups always match the committed signals
+        """
+
+        rows = []
+
+        for signal_name, (timestamps, values) in rollup_samples.items():
+            timestamps = numpy.asarray(timestamps, dtype=numpy.int64)
+            values = numpy.asarray(values, dtype=numpy.float64)
+
+            for level in ROLLUP_LEVELS:
+                buckets = timestamps >> level
+                order = numpy.argsort(buckets, kind="stable")
+                sorted_buckets = buckets[order]
+                sorted_values = values[order]
+
+                starts = numpy.flatnonzero(numpy.diff(sorted_buckets, prepend=sorted_buckets[0] - 1))
+                counts = numpy.diff(starts, append=len(sorted_buckets))
+
+                rows.extend(zip(
+                    [signal_name] * len(starts),
+                    [level] * len(starts),
+                    sorted_buckets[starts].tolist(),
+                    numpy.minimum.reduceat(sorted_values, starts).tolist(),
+                    numpy.maximum.reduceat(sorted_values, starts).tolist(),
+                    counts.tolist(),
+                ))
+
+        cursor.executemany(
+            """
+            INSERT INTO signal_rollups (signal_name, level, bucket, min_value, max_value, sample_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (signal_name, level, bucket) DO UPDATE SET
+                min_value = MIN(min_value, excluded.min_value),
+                max_value = MAX(max_value, excluded.max_value),
+                sample_count = sample_count + excluded.sample_count
+            """,
+            rows,
+        )
+
+    def checkpoint_if_due(self, conn: sqlite3.Connection = None) -> None:
+        """
+        -   for the interval policy, checkpoint the WAL once the interval has elapsed since the last checkpoint
+        -   with `synchronous=NORMAL` the checkpoint fsyncs the WAL, so every commit so far becomes durable
+        -   safe to call periodically even when no frames arrive, to keep the data-loss window bounded
+        """
+
+        if not self.durability["checkpoint"] or self.unsynced_since is None:
+            return
+
+        if time.monotonic() - self.last_checkpoint_time < self.durability_interval:
+            return
+
+        if conn is None:
+            with self.lock, sqlite3.connect(self.db_path) as conn:
+                conn.execute(f"PRAGMA synchronous={self.durability['synchronous']}")
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        else:
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+        self.last_checkpoint_time = time.monotonic()
+        self.unsynced_since = None
+
+    def get_unsynced_window(self) -> float | None:
+        """
+        -   return how many seconds of committed data could be lost on a power cut
+        -   return `None` if the window is unbounded (no fsync at all)
+        """
+
+        if not self.durability["bounded"]:
+            return None
+
+        if self.unsynced_since is None:
+            return 0.0
+
+        return time.monotonic() - self.unsynced_since
+
+    def set_session_epoch(self, epoch_us: int) -> None:
+        """
+        -   store the wall-clock time (UNIX microseconds) that corresponds to timestamp 0 of the session
+        -   only the first call has an effect, so restarting monitoring keeps the original epoch
+        """
+
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT OR IGNORE INTO session_info (name, value) VALUES ('epoch_us', ?)", (int(epoch_us),))
+
+    def set_session_info(self, name: str, value) -> None:
+        """store or replace a session property, e.g. the definitions of the derived signals"""
+
+        with self.lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT OR REPLACE INTO session_info (name, value) VALUES (?, ?)", (name, value))
+
+    def get_session_epoch(self) -> int | None:
+        """
+        return the session epoch in UNIX microseconds, or `None` if it has not been set (or for legacy sessions)
+        """
+
+        with sqlite3.connect(self.db_path) as conn:
+            return read_session_epoch(conn)
+
+    def export_to_csv(self, output_path: Path, last_seconds: float = None) -> int:
+        """
+        -   export the session to CSV with `write_session_csv`, also while it is being recorded (snapshots)
+        -   the export reads through its own read-only connection, it never opens a second writer
+        -   return the number of rows written
+        """
+
+        conn = connect_read_only(self.db_path)
+
+        try:
+            return write_session_csv(conn, output_path, last_seconds)
+        finally:
+            conn.close()
+
+
+def read_session_epoch(conn: sqlite3.Connection) -> int | None:
+    """
+    return the session epoch in UNIX microseconds, or `None` for sessions without one
+    """
+
+    try:
+        row = conn.execute("SELECT value FROM session_info WHERE name = 'epoch_us'").fetchone()
+    except sqlite3.OperationalError:
+        return None     # legacy session, created before the session_info table existed
+
+    return int(row[0]) if row else None
+
+
+def connect_read_only(db_path: Path) -> sqlite3.Connection:
+    """
+    -   open a session read-only: the file is never created, migrated or converted to another journal mode
+    -   raise `FileNotFoundError` if the session does not exist
+    """
+
+    db_path = Path(db_path)
+
+    if not db_path.exists():
+        raise FileNotFoundError(f"Session database not found: {db_path}")
+
+    connection = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    connection.execute("PRAGMA query_only=ON")
+    return connection
+
+
+def write_session_csv(conn: sqlite3.Connection, output_path: Path, last_seconds: float = None) -> int:
+    """
+    -   query the database for all messages and signals
+    -   using the relations between messages and signals, create a CSV file
+    -   write only the signals to the CSV file using csv library for proper handling
+    -   rows are streamed in chunks, so memory use does not grow with the session size
+    -   if `last_seconds` is given, only export the most recent part of the session
+    -   safe to use on a live session: the query runs as a single WAL read, so it sees a consistent
+        snapshot of the committed frames and does not block `insert_frames`
+    -   timestamps are stored as microseconds since the session epoch, they are converted to absolute
+        UNIX seconds only here
+    -   return the number of rows written
+    """
+
+    epoch_us = read_session_epoch(conn)
+
+    if epoch_us is None:
+        # legacy sessions stored absolute UNIX seconds
+        timestamp_column = "messages.timestamp"
+        window = last_seconds
+    else:
+        timestamp_column = f"(messages.timestamp + {int(epoch_us)}) / 1000000.0"
+        window = int(last_seconds * 1e6) if last_seconds is not None else None
+
+    query = f"""
+        SELECT 
+            messages.id,
+            {timestamp_column}, 
+            messages.message_id,
+            messages.length,
+            signals.signal_name, 
+            signals.value 
+        FROM signals 
+        JOIN messages ON signals.frame_id = messages.id
+    """
+    parameters = []
+
+    if last_seconds is not None:
+        query += " WHERE messages.timestamp >= (SELECT MAX(timestamp) FROM messages) - ?"
+        parameters.append(window)
+
+    # samples without a frame (derived signals) follow the frame signals
+    query += f"""
+        UNION ALL
+        SELECT NULL, {timestamp_column.replace("messages.", "signals.")}, NULL, NULL, signals.signal_name, signals.value
+        FROM signals
+        WHERE signals.frame_id IS NULL
+    """
+
+    if last_seconds is not None:
+        query += " AND signals.timestamp >= (SELECT MAX(timestamp) FROM messages) - ?"
+        parameters.append(window)
+
+    cursor = conn.cursor()
+    cursor.execute(query, parameters)
+
+    with open(output_path, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['message_index', 'timestamp', 'message_id', 'length', 'signal_name', 'value'])
+
+        rows_written = 0
+        while rows := cursor.fetchmany(READ_CHUNK_SIZE):
+            writer.writerows(rows)
+            rows_written += len(rows)
+
+    return rows_written
+
+
+def build_rollups(db_path: Path) -> None:
+    """
+    -   compute the rollups of a session recorded without them (before they existed), meant to run on a worker
+        thread and only when the user agreed
+    -   one pass over the signals for the finest level, every coarser level is computed from the one below
+    -   only the `signal_rollups` table is created and written, the recorded data, the rest of the schema and
+        the journal mode of the session are not modified
+    """
+
+    with sqlite3.connect(db_path) as conn:
+        epoch_us = read_session_epoch(conn)
+        ticks_column = "CAST(timestamp * 1000000 AS INTEGER)" if epoch_us is None else "timestamp"
+
+        # same definition as in schema.sql
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS signal_rollups (
+                signal_name TEXT,
+                level INTEGER,
+                bucket INTEGER,
+                min_value REAL,
+                max_value REAL,
+                sample_count INTEGER,
+                PRIMARY KEY (signal_name, level, bucket)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute("DELETE FROM signal_rollups")
+
+        finest_level = ROLLUP_LEVELS[0]
+        conn.execute(
+            f"""
+            INSERT INTO signal_rollups (signal_name, level, bucket, min_value, max_value, sample_count)
+            SELECT signal_name, {finest_level}, {ticks_column} >> {finest_level} AS bucket,
+                   MIN(value), MAX(value), COUNT(*)
+            FROM signals GROUP BY signal_name, bucket
+            """
+        )
+
+        for finer_level, level in zip(ROLLUP_LEVELS, ROLLUP_LEVELS[1:]):
+            conn.execute(
+                f"""
+                INSERT INTO signal_rollups (signal_name, level, bucket, min_value, max_value, sample_count)
+                SELECT signal_name, {level}, bucket >> {level - finer_level} AS coarse_bucket,
+                       MIN(min_value), MAX(max_value), SUM(sample_count)
+                FROM signal_rollups WHERE level = {finer_level} GROUP BY signal_name, coarse_bucket
                 """
             )
 
-            with open(output_path, 'w', newline='') as csv_file:
-                writer = csv.writer(csv_file)
-                writer.writerow(['message_index', 'timestamp', 'message_id', 'length', 'signal_name', 'value'])
-                writer.writerows(cursor.fetchall())
\ No newline at end of file
+        conn.commit()
+
+    logger.info(f"Rollups built for {db_path}")
+
+
+class SessionReader:
+    """
+    Read-only access to a logged session
+    -   opens the database in read-only mode, so it never modifies or locks the session for writing
+    -   returns signals as NumPy arrays, read in chunks straight from the database
+    -   times are UNIX seconds in `read_signal`, and integer microseconds since `epoch_us` in `read_signal_ticks`
+    -   optionally provides a pandas DataFrame view (pandas is not a hard dependency)
+    """
+
+    def __init__(self, db_path: Path, chunk_size: int = READ_CHUNK_SIZE):
+        self.logger = logger
+        self.db_path = Path(db_path)
+        self.chunk_size = chunk_size
+
+        self.connection = connect_read_only(self.db_path)
+        self.connection.execute("PRAGMA mmap_size=268435456")
+
+        epoch_us = read_session_epoch(self.connection)
+        self.legacy_timestamps = epoch_us is None    # legacy sessions stored absolute UNIX seconds as REAL
+        self.epoch_us = epoch_us or 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def list_signals(self) -> list[str]:
+        """
+        return the names of all signals recorded in the session
+        """
+
+        cursor = self.connection.execute("SELECT DISTINCT signal_name FROM signals ORDER BY signal_name")
+        return [row[0] for row in cursor.fetchall()]
+
+    def list_trigger_events(self) -> list[dict]:
+        """
+        return the trigger events of the session without their samples, oldest first (none for legacy sessions)
+        """
+
+        try:
+            cursor = self.connection.execute(
+                "SELECT id, timestamp, trigger_name, condition, signal_name FROM trigger_events ORDER BY timestamp"
+            )
+        except sqlite3.OperationalError:
+            return []
+
+        return [
+            {"id": row[0], "timestamp": row[1], "trigger": row[2], "condition": row[3], "signal_name": row[4]}
+            for row in cursor.fetchall()
+        ]
+
+    def read_trigger_event(self, event_id: int) -> dict[str, tuple[numpy.ndarray, numpy.ndarray]]:
+        """
+        return the captured samples of one trigger event, `{signal_name: (ticks, values)}`
+        """
+
+        row = self.connection.execute("SELECT samples FROM trigger_events WHERE id = ?", (event_id,)).fetchone()
+
+        if row is None:
+            raise KeyError(f"No trigger event with id {event_id}")
+
+        return src.analysis.triggers.unpack_samples(row[0])
+
+    def has_rollups(self) -> bool:
+        """
+        return True if the session has rollups, or has no signals at all (so nothing to summarize)
+        """
+
+        try:
+            if self.connection.execute("SELECT 1 FROM signal_rollups LIMIT 1").fetchone():
+                return True
+        except sqlite3.OperationalError:
+            pass    # legacy session, created before the signal_rollups table existed
+
+        return self.connection.execute("SELECT 1 FROM signals LIMIT 1").fetchone() is None
+
+    def get_signal_ranges(self) -> dict[str, tuple[float, float]]:
+        """
+        -   return the minimum and maximum value of every signal, keyed by signal name
+        -   read from the coarsest rollups, so it is fast for sessions of any size
+        """
+
+        try:
+            rows = self.connection.execute(
+                """
+                SELECT signal_name, MIN(min_value), MAX(max_value) FROM signal_rollups
+                WHERE level = ? GROUP BY signal_name ORDER BY signal_name
+                """,
+                (ROLLUP_LEVELS[-1],),
+            ).fetchall()
+        except sqlite3.OperationalError:
+            rows = []   # legacy session, created before the signal_rollups table existed
+
+        if not rows:
+            rows = self.connection.execute(
+                "SELECT signal_name, MIN(value), MAX(value) FROM signals GROUP BY signal_name ORDER BY signal_name"
+            ).fetchall()
+
+        return {name: (minimum, maximum) for name, minimum, maximum in rows}
+
+    def get_time_range(self) -> tuple[int, int] | None:
+        """
+        return the first and last timestamp of the session in microseconds since the session epoch
+        """
+
+        first, last = self.connection.execute("SELECT MIN(timestamp), MAX(timestamp) FROM messages").fetchone()
+
+        if first is None:
+            return None
+
+        if self.legacy_timestamps:
+            return round(first * 1e6), round(last * 1e6)
+
+        return int(first), int(last)
+
+    def to_ticks(self, timestamp: float) -> int:
+        """
+        convert an absolute UNIX timestamp in seconds to microseconds since the session epoch
+        """
+
+        return round(timestamp * 1e6) - self.epoch_us
+
+    def to_seconds(self, ticks: numpy.ndarray) -> numpy.ndarray:
+        """
+        convert microseconds since the session epoch to absolute UNIX timestamps in seconds
+        """
+
+        return (ticks + self.epoch_us) / 1e6
+
+    def read_signal_ticks(self, name: str, tick0: int = None, tick1: int = None) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        -   read one signal, optionally limited to the range [tick0, tick1] in microseconds since the session epoch
+        -   return a `(ticks, values)` tuple of int64 and float64 NumPy arrays, sorted by timestamp
+        """
+
+        query = "SELECT timestamp, value FROM signals WHERE signal_name = ?"
+        parameters = [name]
+
+        if tick0 is not None:
+            query += " AND timestamp >= ?"
+            parameters.append(tick0 / 1e6 if self.legacy_timestamps else tick0)
+
+        if tick1 is not None:
+            query += " AND timestamp <= ?"
+            parameters.append(tick1 / 1e6 if self.legacy_timestamps else tick1)
+
+        query += " ORDER BY timestamp"
+
+        cursor = self.connection.execute(query, parameters)
+        chunks = []
+
+        while rows := cursor.fetchmany(self.chunk_size):
+            chunks.append(numpy.array(rows, dtype=numpy.float64).reshape(-1, 2))
+
+        if not chunks:
+            return numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=numpy.float64)
+
+        data = numpy.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+
+        if self.legacy_timestamps:
+            ticks = numpy.rint(data[:, 0] * 1e6).astype(numpy.int64)
+        else:
+            ticks = data[:, 0].astype(numpy.int64)
+
+        return ticks, data[:, 1].copy()
+
+    def read_signal(self, name: str, t0: float = None, t1: float = None) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        -   read one signal, optionally limited to the time range [t0, t1] in UNIX seconds
+        -   return a `(timestamps, values)` tuple of float64 NumPy arrays, sorted by timestamp
+        """
+
+        ticks, values = self.read_signal_ticks(
+            name,
+            self.to_ticks(t0) if t0 is not None else None,
+            self.to_ticks(t1) if t1 is not None else None,
+        )
+        return self.to_seconds(ticks), values
+
+    def read_signal_buckets(self, name: str, level: int, tick0: int, tick1: int) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        -   read the min/max summary of one signal in buckets of 2^level microseconds over [tick0, tick1]
+        -   uses the `signal_rollups` table, and aggregates the raw signals in SQL for sessions without rollups
+        -   return `(ticks, values)` with a min and a max point at the centre of every bucket, so the result
+            can be plotted like raw data
+        """
+
+        rows = []
+
+        try:
+            rows = self.connection.execute(
+                """
+                SELECT bucket, min_value, max_value FROM signal_rollups
+                WHERE signal_name = ? AND level = ? AND bucket BETWEEN ? AND ?
+                ORDER BY bucket
+                """,
+                (name, level, tick0 >> level, tick1 >> level),
+            ).fetchall()
+        except sqlite3.OperationalError:
+            pass    # legacy session, created before the signal_rollups table existed
+
+        if not rows:
+            if self.legacy_timestamps:
+                ticks_column, bounds = "CAST(timestamp * 1000000 AS INTEGER)", (tick0 / 1e6, tick1 / 1e6)
+            else:
+                ticks_column, bounds = "timestamp", (tick0, tick1)
+
+            rows = self.connection.execute(
+                f"""
+                SELECT {ticks_column} >> {int(level)} AS bucket, MIN(value), MAX(value) FROM signals
+                WHERE signal_name = ? AND timestamp BETWEEN ? AND ?
+                GROUP BY bucket ORDER BY bucket
+                """,
+                (name, *bounds),
+            ).fetchall()
+
+        if not rows:
+            return numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=numpy.float64)
+
+        data = numpy.array(rows, dtype=numpy.float64)
+        centres = (data[:, 0].astype(numpy.int64) << level) + (1 << level) // 2
+
+        return numpy.repeat(centres, 2), data[:, 1:].reshape(-1)
+
+    def read_signals(self, names: list[str], t0: float = None, t1: float = None) -> dict[str, tuple[numpy.ndarray, numpy.ndarray]]:
+        """
+        read several signals, returning a dictionary of `(timestamps, values)` tuples keyed by signal name
+        """
+
+        return {name: self.read_signal(name, t0, t1) for name in names}
+
+    def to_dataframe(self, names: list[str] = None, t0: float = None, t1: float = None):
+        """
+        -   return the selected signals (all signals by default) as a long-format pandas DataFrame
+        -   columns: `timestamp`, `signal_name`, `value`
+        -   requires pandas, which is imported only when this view is used
+        """
+
+        try:
+            import pandas
+        except ImportError as e:
+            raise ImportError("pandas is required for the DataFrame view, install it with `pip install pandas`") from e
+
+        if names is None:
+            names = self.list_signals()
+
+        frames = []
+        for index, (timestamps, values) in enumerate(self.read_signals(names, t0, t1).values()):
+            frames.append(pandas.DataFrame({
+                "timestamp": timestamps,
+                "signal_name": pandas.Categorical.from_codes(numpy.full(len(timestamps), index), categories=names),
+                "value": values,
+            }))
+
+        if not frames:
+            return pandas.DataFrame(columns=["timestamp", "signal_name", "value"])
+
+        return pandas.concat(frames, ignore_index=True)
+
+
+def export_session_worker(db_path: Path, output_path: Path, last_seconds: float = None) -> dict:
+    """
+    -   export a single session to CSV, meant to run inside a worker process
+    -   each worker opens its own read-only connection, so the session is never created, migrated or converted
+    -   raise `FileNotFoundError` for a session that does not exist, which is reported as a failed export
+    -   return a summary of the export
+    """
+
+    start = time.perf_counter()
+    conn = connect_read_only(db_path)
+
+    try:
+        rows = write_session_csv(conn, output_path, last_seconds)
+    finally:
+        conn.close()
+
+    return {
+        "session": Path(db_path).name,
+        "output_path": Path(output_path),
+        "rows": rows,
+        "bytes": Path(output_path).stat().st_size,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def export_sessions(
+    db_paths: list[Path],
+    output_folder: Path,
+    max_workers: int = None,
+    progress_callback: Callable[[int, int, dict], None] = None,
+    last_seconds: float = None,
+) -> dict:
+    """
+    -   export many sessions to CSV files concurrently, using a process pool across the CPU cores
+    -   each session is written to `<output_folder>/<session name>.csv`
+    -   `last_seconds` limits each export to the most recent part of the session (e.g. a snapshot of a live session)
+    -   `progress_callback(completed, total, result)` is called as each session finishes;
+        `result` contains an `error` key instead of the export details if that session failed
+    -   return a throughput summary of the whole batch
+    """
+
+    output_folder = Path(output_folder)
+    output_folder.mkdir(parents=True, exist_ok=True)
+    db_paths = [Path(db_path) for db_path in db_paths]
+    max_workers = max_workers or min(len(db_paths), os.cpu_count() or 1) or 1
+
+    summary = {"sessions": len(db_paths), "succeeded": 0, "failed": 0, "rows": 0, "bytes": 0, "seconds": 0.0}
+    start = time.perf_counter()
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(export_session_worker, db_path, output_folder / f"{db_path.stem}.csv", last_seconds): db_path
+            for db_path in db_paths
+        }
+
+        for completed, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"session": futures[future].name, "error": str(e)}
+                summary["failed"] += 1
+                logger.error(f"Failed to export {futures[future].name}: {e}")
+            else:
+                summary["succeeded"] += 1
+                summary["rows"] += result["rows"]
+                summary["bytes"] += result["bytes"]
+                logger.info(f"Exported {result['session']} ({result['rows']} rows) in {result['seconds']:.2f} s")
+
+            if progress_callback:
+                progress_callback(completed, len(db_paths), result)
+
+    summary["seconds"] = time.perf_counter() - start
+    summary["sessions_per_second"] = summary["succeeded"] / summary["seconds"] if summary["seconds"] else 0.0
+    summary["rows_per_second"] = summary["rows"] / summary["seconds"] if summary["seconds"] else 0.0
+    summary["megabytes_per_second"] = summary["bytes"] / 1e6 / summary["seconds"] if summary["seconds"] else 0.0
+
+    return summary
+
+
+def format_export_summary(summary: dict) -> str:
+    """
+    return a human-readable throughput summary of a batch export
+    """
+
+    return (
+        f"Exported {summary['succeeded']}/{summary['sessions']} sessions "
+        f"({summary['failed']} failed) in {summary['seconds']:.1f} s: "
+        f"{summary['sessions_per_second']:.2f} sessions/s, "
+        f"{summary['rows_per_second']:.0f} rows/s, "
+        f"{summary['megabytes_per_second']:.1f} MB/s"
+    )
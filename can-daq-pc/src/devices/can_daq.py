@@ -1,10 +1,14 @@
-import customtkinter
+from typing import TYPE_CHECKING
+
 import serial
 
 import src.messages
 from src.devices import template_device
 from src.devices.helpers import EfficientSerial
 
+if TYPE_CHECKING:
+    import customtkinter
+
 SERIAL_BAUD_RATES = [
     "50",
     "75",
@@ -80,7 +84,9 @@ class Device(template_device.Device):
     data_reader: serial.Serial
     initial_hardware_timestamp: int = None
     
-    def configure_gui(self, frame: customtkinter.CTkFrame) -> None:
+    def configure_gui(self, frame: "customtkinter.CTkFrame") -> None:
+        import customtkinter    # only the configuration screen needs Tk
+
         # serial baud rate
         self.gui.serial_baud_rate_label = customtkinter.CTkLabel(
             master=frame, text="Set Serial Baud Rate", anchor="w"
@@ -154,7 +160,7 @@ class Device(template_device.Device):
             self.raw_data = None
         return self.raw_data
 
-    def parse_raw_data(self, initial_timestamp: float = None) -> src.messages.UniversalMessage:
+    def parse_raw_data(self) -> src.messages.UniversalMessage:
         # Decode and strip whitespace/newlines
         extracted_string = self.raw_data.strip().decode("utf-8")
         
@@ -190,21 +196,21 @@ class Device(template_device.Device):
         data_end = data_start + length
         decoded_data = [int(x, 16) for x in parts[data_start:data_end]]
         
-        # Parse hardware timestamp (the last field)
-        hardware_timestamp = int(parts[-1]) / 1e6
+        # Parse hardware timestamp (the last field), in microseconds
+        hardware_timestamp = int(parts[-1])
         
         # Get the initial hardware timestamp
-        if not self.initial_hardware_timestamp:
+        if self.initial_hardware_timestamp is None:
             self.initial_hardware_timestamp = hardware_timestamp
 
-        # Calculate the UNIX timestamp
-        unix_timestamp = (hardware_timestamp - self.initial_hardware_timestamp) + initial_timestamp
+        # Microseconds since the first frame, the session epoch maps this to wall-clock time
+        session_timestamp = hardware_timestamp - self.initial_hardware_timestamp
         
         return src.messages.UniversalMessage(
             id=message_id,
             length=length,
             data=decoded_data,
-            timestamp=unix_timestamp,  # Use hardware timestamp here
+            timestamp=session_timestamp,  # Use hardware timestamp here
         )
     
 
@@ -1,7 +1,10 @@
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import src.messages
-import customtkinter
+
+# customtkinter only for the type hints, so the headless and export paths never load Tk
+if TYPE_CHECKING:
+    import customtkinter
 
 class DeviceConfiguration:
     def get_main_speeds(self) -> dict[str, int]:
@@ -48,7 +51,7 @@ class Device:
         self.device_configuration = device_configuration
         self.gui = gui
 
-    def configure_gui(self, frame: customtkinter.CTkFrame) -> None:
+    def configure_gui(self, frame: "customtkinter.CTkFrame") -> None:
         """
         -   create the GUI elements for the protocol configuration
         -   add the elements to the GUI Tkinter frame
@@ -76,10 +79,11 @@ class Device:
         """
         ...
 
-    def parse_raw_data(self, initial_timestamp: float = None) -> src.messages.UniversalMessage:
+    def parse_raw_data(self) -> src.messages.UniversalMessage:
         """
-        -   parse the raw data into a format that can be interpreted
+        -   parse `self.raw_data` into a format that can be interpreted
         -   for example, extract the message ID, length, and data bytes
+        -   the timestamp must be an integer number of microseconds, counted from the first frame of the session
         -   do not attempt to derive meaning from the data here
         """
         ...
@@ -0,0 +1,160 @@
+"""
+Headless logging
+-   acquisition -> decoding -> storage only, without any window, plot or statistics
+-   for unattended rigs and SSH sessions, and to reach the highest ingest rate the machine allows
+-   prints the throughput periodically and shuts down cleanly on SIGINT/SIGTERM, flushing every decoded frame
+"""
+
+import signal
+import threading
+import time
+from logging import getLogger
+
+import src.analysis
+import src.database_functionality
+import src.devices
+import src.pipeline
+import src.protocols
+
+logger = getLogger(__name__)
+
+DEFAULT_REPORT_INTERVAL = 1.0   # s
+MAX_BATCH_AGE = 1.0             # s, partial batches are written after this long when the durability policy is unbounded
+
+
+class HeadlessLogger:
+    """
+    Headless Logger class
+    -   the acquisition pipeline with a database sink only (and a network sink, if forwarding), without the
+        columnar chunks the plot and statistics need
+    -   every queue blocks when full instead of dropping frames, except the one of the network sink
+    -   the calling thread prints the throughput until `stop()` is called or a signal arrives
+    """
+
+    def __init__(
+        self,
+        protocol_frame: src.protocols.template_protocol.TemplateFrame,
+        device: src.devices.template_device.Device,
+        logging_database: src.database_functionality.LoggingDatabase,
+        batch_size: int = 1000,
+        report_interval: float = DEFAULT_REPORT_INTERVAL,
+        forward: tuple[str, int] = None,
+    ):
+        self.logging_database = logging_database
+        self.report_interval = report_interval
+
+        self.stop_event = threading.Event()
+        self.bus_monitor = src.analysis.bus_monitor.BusMonitor(
+            can_baud_rate=getattr(device.device_configuration, "can_baud_rate", None),
+        )
+
+        self.database_sink = src.pipeline.DatabaseSink(logging_database, batch_size=batch_size, max_age=MAX_BATCH_AGE)
+        sinks: list[src.pipeline.Sink] = [self.database_sink]
+        if forward is not None:
+            sinks.append(src.pipeline.UdpSink(*forward))
+
+        self.pipeline = src.pipeline.Pipeline(
+            reader=src.pipeline.ReaderStage(device),
+            parser=src.pipeline.ParserStage(
+                device,
+                observers=[lambda message: self.bus_monitor.update(message.id, message.length, message.timestamp)],
+            ),
+            decoder=src.pipeline.DecoderStage(protocol_frame),
+            sinks=sinks,
+            columnar=forward is not None,
+        )
+
+    def stop(self, *args) -> None:
+        """Request a shutdown, also usable as a signal handler"""
+        if not self.stop_event.is_set():
+            print("Stopping, flushing the remaining frames...", flush=True)
+        self.stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+    def run(self) -> None:
+        self.logging_database.set_session_epoch(time.time_ns() // 1000)
+        self.pipeline.start()
+
+        started = time.monotonic()
+        last_report = started
+        last_written = 0
+
+        while not self.stop_event.wait(self.report_interval):
+            if not self.pipeline.is_alive():
+                print(f"Acquisition stopped: {self.pipeline.error}", flush=True)
+                break
+
+            now = time.monotonic()
+            written = self.database_sink.frames_written
+            self.report(now - started, (written - last_written) / (now - last_report))
+            last_report, last_written = now, written
+
+        self.pipeline.stop()
+
+        self.report(time.monotonic() - started, None)
+        print(f"Session saved to {self.logging_database.db_path}", flush=True)
+
+    def report(self, elapsed: float, write_rate: float | None) -> None:
+        metrics = self.pipeline.get_metrics()
+        stages = metrics["stages"]
+        not_decoded = stages["parser"]["errors"] + stages["decoder"]["errors"]
+        database = metrics["sinks"][self.database_sink.name]
+
+        if write_rate is None:
+            print(
+                f"[{elapsed:8.1f} s] total: {stages['reader']['count']} read, {stages['decoder']['count']} decoded, "
+                f"{not_decoded} not decoded, {database['frames_written']} written, "
+                f"{database['frames_failed']} failed",
+                flush=True,
+            )
+        else:
+            bus = self.bus_monitor.snapshot()
+            load = f"{bus['utilization']:.1f} %" if bus["utilization"] is not None else "unknown"
+            queue_metrics = database["queue"]
+            print(
+                f"[{elapsed:8.1f} s] {write_rate:8.0f} frames/s written | bus {bus['frame_rate']:.0f} frames/s, "
+                f"load {load} | queue {queue_metrics['depth']}/{queue_metrics['capacity']} | "
+                f"{database['frames_written']} written, {database['frames_failed']} failed, {not_decoded} not decoded",
+                flush=True,
+            )
+
+
+def create_logger(arguments, db_path, schema_path) -> HeadlessLogger:
+    """
+    -   configure the protocol, the device and the session database from the command line arguments
+    -   the devices supported headless are configured with a serial port and serial/CAN baud rates
+    """
+
+    protocol_module = src.protocols.protocol_details[arguments.protocol]["module"]
+    protocol = protocol_module.Protocol()
+    protocol.set_specification_path(arguments.dbc)
+
+    protocol_frame = protocol_module.Frame()
+    protocol_frame.protocol = protocol
+
+    device_module = src.devices.device_details[arguments.device]["module"]
+    device = device_module.Device()
+    device.device_configuration = device_module.DeviceConfiguration(
+        serial_port=arguments.port,
+        serial_baud_rate=arguments.serial_baud_rate,
+        can_baud_rate=arguments.can_baud_rate,
+    )
+
+    logging_database = src.database_functionality.LoggingDatabase(
+        db_path=db_path,
+        schema_path=schema_path,
+        durability_mode=arguments.durability,
+        durability_interval=arguments.durability_interval,
+    )
+
+    return HeadlessLogger(
+        protocol_frame,
+        device,
+        logging_database,
+        batch_size=arguments.batch_size,
+        report_interval=arguments.report_interval,
+        forward=arguments.forward,
+    )
@@ -63,6 +63,7 @@ class Message:
     length: int
     signals: list[Signal]
     byte_order: str
+    cycle_time: int     # ms, None if the message is not periodic or the period is unknown
 
     def __init__(
         self,
@@ -71,11 +72,13 @@ class Message:
         length: int,
         signals: list[Signal],
         byte_order: str = None,
+        cycle_time: int = None,
     ) -> None:
         self.id = id
         self.name = name
         self.length = length
         self.signals = signals
+        self.cycle_time = cycle_time
 
         if byte_order:
             self.byte_order = byte_order
@@ -95,14 +98,15 @@ class UniversalMessage:
     -   protocol-agnostic representation of a message
     -   contains the decoded message data
     -   this must be interpreted to extract the signal values
+    -   the timestamp is an integer number of microseconds since the session epoch
     """
 
     id: int
     length: int
     data: bytes
-    timestamp: float
+    timestamp: int
 
-    def __init__(self, data: bytes, timestamp: float, id: int = 0, length: int = 0):
+    def __init__(self, data: bytes, timestamp: int, id: int = 0, length: int = 0):
         self.id = id
         self.length = length
         self.data = data
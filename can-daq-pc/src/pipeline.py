@@ -0,0 +1,775 @@
+"""
+Acquisition pipeline
+-   explicit stages, independent of the GUI: reader -> parser -> decoder -> fan-out -> sinks
+-   reader, parser and decoder run frame by frame on the acquisition thread, decoded frames are handed on in
+    batches (bounded by size and by age), as frames and as columnar NumPy chunks
+-   the fan-out thread applies the transforms (e.g. derived signals) and passes every batch to every sink
+-   each sink (database, plot buffers, statistics, network, ...) runs on its own thread behind its own queue
+-   every hand-off is a bounded queue with a policy for when it is full: block (backpressure) or drop. A full
+    "Block" queue holds up the fan-out, and with it every sink and eventually acquisition; only a sink with a
+    drop policy (like the network sink) falls behind on its own
+-   every stage, queue and sink keeps counters, `Pipeline.get_metrics()` returns them
+"""
+
+import collections
+import copy
+import json
+import queue
+import socket
+import threading
+import time
+from logging import getLogger
+from typing import Callable
+
+import numpy
+
+import src.database_functionality
+import src.devices
+import src.messages
+import src.protocols
+import src.ring_buffer
+
+logger = getLogger(__name__)
+
+# hand decoded samples to the fan-out in batches, bounded by size and by age
+HANDOFF_MAX_SAMPLES = 5000
+HANDOFF_MAX_LATENCY = 0.05  # s
+
+DEFAULT_QUEUE_SIZE = 64     # batches
+SHUTDOWN_TIMEOUT = 2.0      # s, the reader is given this long to finish before its data reader is closed
+
+QUEUE_POLICIES = [
+    "Block",        # the producer waits for space: no data is lost, a slow consumer slows down the producer
+    "Drop newest",  # the batch that does not fit is discarded
+    "Drop oldest",  # the oldest queued batch is discarded to make space, the consumer sees the newest data
+]
+
+
+class BoundedQueue:
+    """
+    Bounded Queue class
+    -   `put()` applies the queue policy when the queue is full, and returns False if the item was dropped
+    -   `close()` wakes up blocked producers and consumers, `get()` then drains what is left
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE, policy: str = "Block"):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.items = collections.deque()
+        self.condition = threading.Condition()
+        self.closed = False
+
+        self.put_count = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def put(self, item) -> bool:
+        with self.condition:
+            if len(self.items) >= self.maxsize:
+                if self.policy == "Block":
+                    self.condition.wait_for(lambda: len(self.items) < self.maxsize or self.closed)
+                elif self.policy == "Drop newest":
+                    self.dropped += 1
+                    return False
+                else:
+                    self.items.popleft()
+                    self.dropped += 1
+
+            if self.closed:
+                self.dropped += 1
+                return False
+
+            self.items.append(item)
+            self.put_count += 1
+            self.high_water = max(self.high_water, len(self.items))
+            self.condition.notify_all()
+            return True
+
+    def get(self, timeout: float = None):
+        """return the oldest item, raise `queue.Empty` after `timeout`, or once closed and drained"""
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.items or self.closed, timeout):
+                raise queue.Empty
+
+            if not self.items:
+                raise queue.Empty
+
+            item = self.items.popleft()
+            self.condition.notify_all()
+            return item
+
+    def close(self) -> None:
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def get_metrics(self) -> dict:
+        return {
+            "depth": len(self.items),
+            "capacity": self.maxsize,
+            "policy": self.policy,
+            "high_water": self.high_water,
+            "total": self.put_count,
+            "dropped": self.dropped,
+        }
+
+
+class StageMetrics:
+    """Items processed, items failed and time spent in one stage"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.busy = 0.0     # s
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "busy_s": self.busy,
+            "mean_us": 1e6 * self.busy / self.count if self.count else 0.0,
+        }
+
+
+class Batch:
+    """
+    Batch class
+    -   the unit passed from the fan-out to the sinks, sinks must treat it as read-only
+    -   `frames` are copies of the decoded frames, `columnar` maps signal names to `(timestamps, values)` arrays
+    -   `derived_samples` are samples to be stored that do not come from a frame (e.g. logged derived signals)
+    """
+
+    __slots__ = ("started", "frames", "columnar", "samples", "derived_samples")
+
+    def __init__(self, started: float, frames: list, columnar: dict[str, tuple[numpy.ndarray, numpy.ndarray]], samples: int):
+        self.started = started  # monotonic time of the oldest frame
+        self.frames = frames
+        self.columnar = columnar
+        self.samples = samples
+        self.derived_samples: dict[str, tuple[numpy.ndarray, numpy.ndarray]] = {}
+
+
+class ReaderStage:
+    """Reads raw frames from the device, one per `read()`"""
+
+    def __init__(self, device: src.devices.template_device.Device):
+        self.device = device
+        self.metrics = StageMetrics()
+
+    def open(self) -> None:
+        self.device.initialize_data_reader()
+
+    def read(self) -> bytes | None:
+        raw_data = self.device.read_raw_data()
+        if raw_data:
+            self.metrics.count += 1
+        return raw_data
+
+    def close(self) -> None:
+        self.device.close_data_reader()
+
+
+class ParserStage:
+    """
+    Parses a raw frame into a `UniversalMessage`
+    -   the frame is handed to the device as its `raw_data`, so the bytes parsed are always those passed in, not
+        whatever the device read last
+    -   `observers` are called with every parsed message, also those the decoder cannot decode (e.g. the bus monitor)
+    """
+
+    def __init__(self, device: src.devices.template_device.Device, observers: list[Callable] = None):
+        self.device = device
+        self.observers = observers or []
+        self.metrics = StageMetrics()
+
+    def parse(self, raw_data: bytes) -> src.messages.UniversalMessage:
+        self.device.raw_data = raw_data
+        message = self.device.parse_raw_data()
+        for observer in self.observers:
+            observer(message)
+        return message
+
+
+class DecoderStage:
+    """Interprets a parsed message with the protocol specification, returns a copy of the frame with its raw data"""
+
+    def __init__(self, protocol_frame: src.protocols.template_protocol.TemplateFrame):
+        self.protocol_frame = protocol_frame
+        self.metrics = StageMetrics()
+
+    def decode(self, raw_data: bytes, message: src.messages.UniversalMessage) -> src.protocols.template_protocol.TemplateFrame:
+        self.protocol_frame.raw_data = raw_data
+        self.protocol_frame.decoded_message = message
+        self.protocol_frame.interpret_frame()
+        return copy.copy(self.protocol_frame)
+
+
+class Sink:
+    """
+    Sink class
+    -   to be inherited from: `consume()` every batch, `poll()` regularly (also when no data arrives), `close()`
+        once after the last batch
+    -   `queue_size` and `policy` configure the queue in front of the sink: "Block" never loses a batch but a slow
+        sink then back-pressures the whole pipeline, a drop policy lets the sink fall behind on its own
+    -   `get_metrics()` may return counters of the sink, they are added to those of its runner
+    """
+
+    name = "sink"
+    queue_size = DEFAULT_QUEUE_SIZE
+    policy = "Block"
+    poll_interval = 0.1     # s
+
+    def consume(self, batch: Batch) -> None:
+        ...
+
+    def poll(self) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+    def get_metrics(self) -> dict:
+        return {}
+
+
+class CallbackSink(Sink):
+    """Calls a function with every batch, for consumers that need no state of their own"""
+
+    def __init__(self, name: str, callback: Callable[[Batch], None], policy: str = "Block", queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.name = name
+        self.callback = callback
+        self.policy = policy
+        self.queue_size = queue_size
+
+    def consume(self, batch: Batch) -> None:
+        self.callback(batch)
+
+
+class DatabaseSink(Sink):
+    """
+    Database Sink class
+    -   collects the frames of the batches and inserts them in transactions of `batch_size` frames, or earlier when
+        the durability policy bounds the age of unwritten data (or after `max_age` seconds, if given)
+    -   the collected frames are only touched by the sink's thread
+    -   frames are only collected while `enabled`, the derived samples always
+    -   a failed insert is logged and counted in `frames_failed`/`samples_failed`, and the sink carries on with the
+        next batch, so one bad transaction does not stall acquisition
+    """
+
+    name = "database"
+
+    def __init__(
+        self,
+        logging_database: src.database_functionality.LoggingDatabase,
+        batch_size: int = 1000,
+        max_age: float = None,
+    ):
+        self.logging_database = logging_database
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.enabled = True
+
+        self.frames: list[src.protocols.template_protocol.TemplateFrame] = []
+        self.derived_samples: list[dict[str, tuple[numpy.ndarray, numpy.ndarray]]] = []
+        self.batch_started: float = None    # monotonic time of the oldest unwritten frame
+        self.frames_written = 0
+        self.frames_failed = 0
+        self.samples_failed = 0
+
+    def consume(self, batch: Batch) -> None:
+        if self.enabled and batch.frames:
+            if not self.frames:
+                self.batch_started = batch.started
+            self.frames.extend(batch.frames)
+
+        if batch.derived_samples:
+            self.derived_samples.append(batch.derived_samples)
+
+        if len(self.frames) >= self.batch_size:
+            self.write()
+
+    def poll(self) -> None:
+        if self.is_due():
+            self.write()
+        self.logging_database.checkpoint_if_due()
+
+    def is_due(self) -> bool:
+        if self.batch_started is None:
+            return False
+
+        if self.logging_database.durability["checkpoint"]:
+            max_age = self.logging_database.durability_interval
+        else:
+            max_age = self.max_age
+
+        return max_age is not None and time.monotonic() - self.batch_started >= max_age
+
+    def write(self) -> None:
+        frames, self.frames = self.frames, []
+        derived_samples, self.derived_samples = self.derived_samples, []
+        self.batch_started = None
+
+        if frames:
+            try:
+                self.logging_database.insert_frames(frames)
+                self.frames_written += len(frames)
+            except Exception as e:
+                self.frames_failed += len(frames)
+                logger.error(f"Failed to write {len(frames)} frames: {e}")
+
+        if derived_samples:
+            try:
+                self.logging_database.insert_signal_samples(derived_samples)
+            except Exception as e:
+                failed = sum(len(timestamps) for chunk in derived_samples for timestamps, _ in chunk.values())
+                self.samples_failed += failed
+                logger.error(f"Failed to write {failed} derived samples: {e}")
+
+    def get_metrics(self) -> dict:
+        return {
+            "frames_written": self.frames_written,
+            "frames_failed": self.frames_failed,
+            "samples_failed": self.samples_failed,
+        }
+
+    def close(self) -> None:
+        self.write()
+        self.logging_database.checkpoint_if_due()
+
+
+class RingBufferSink(Sink):
+    """
+    Ring Buffer Sink class
+    -   appends the columnar samples to one ring buffer per signal, created with `capacity(signal_name)` samples
+    -   a buffer filling up before covering `window_us` is doubled, up to `max_capacity`
+    -   `on_update(batch)` is called after every batch, e.g. to request a redraw
+    """
+
+    name = "ring buffers"
+
+    def __init__(
+        self,
+        ring_buffers: dict[str, src.ring_buffer.RingBuffer],
+        capacity: Callable[[str], int],
+        max_capacity: int,
+        window_us: int,
+        on_update: Callable[[Batch], None] = None,
+    ):
+        self.ring_buffers = ring_buffers
+        self.capacity = capacity
+        self.max_capacity = max_capacity
+        self.window_us = window_us
+        self.on_update = on_update
+
+    def consume(self, batch: Batch) -> None:
+        for signal_name, (timestamps, values) in batch.columnar.items():
+            if signal_name not in self.ring_buffers:
+                self.ring_buffers[signal_name] = src.ring_buffer.RingBuffer(self.capacity(signal_name))
+
+            ring_buffer = self.ring_buffers[signal_name]
+            ring_buffer.extend(timestamps, values)
+
+            # the signal arrives faster than expected, grow its buffer until it covers the time window
+            if (
+                len(ring_buffer) == ring_buffer.capacity
+                and ring_buffer.capacity < self.max_capacity
+                and ring_buffer.span() < self.window_us
+            ):
+                ring_buffer.resize(min(2 * ring_buffer.capacity, self.max_capacity))
+                logger.debug(f"Ring buffer for {signal_name} grown to {ring_buffer.capacity} samples")
+
+        if self.on_update:
+            self.on_update(batch)
+
+
+class StatisticsSink(Sink):
+    """Feeds the columnar samples to engines with an `update(columnar_chunk)` method (statistics, histograms)"""
+
+    name = "statistics"
+
+    def __init__(self, engines: list):
+        self.engines = engines
+
+    def consume(self, batch: Batch) -> None:
+        for engine in self.engines:
+            engine.update(batch.columnar)
+
+
+class UdpSink(Sink):
+    """
+    UDP Sink class
+    -   forwards the columnar samples as JSON datagrams `{"signal": name, "t": [µs...], "v": [values...]}`
+    -   long arrays are split over several datagrams; the oldest batches are dropped if the network falls behind
+    """
+
+    name = "network"
+    policy = "Drop oldest"
+    max_samples_per_datagram = 1000
+
+    def __init__(self, host: str, port: int, signal_names: list[str] = None):
+        self.address = (host, port)
+        self.signal_names = set(signal_names) if signal_names else None
+        self.socket: socket.socket = None   # opened with the first batch, so a restarted pipeline can reuse the sink
+
+    def consume(self, batch: Batch) -> None:
+        if self.socket is None:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        step = self.max_samples_per_datagram
+
+        for signal_name, (timestamps, values) in batch.columnar.items():
+            if self.signal_names is not None and signal_name not in self.signal_names:
+                continue
+
+            for start in range(0, len(timestamps), step):
+                datagram = {
+                    "signal": signal_name,
+                    "t": timestamps[start:start + step].tolist(),
+                    "v": values[start:start + step].tolist(),
+                }
+                self.socket.sendto(json.dumps(datagram).encode(), self.address)
+
+    def close(self) -> None:
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+
+class SinkRunner:
+    """Runs one sink on its own thread, behind its own bounded queue"""
+
+    def __init__(self, sink: Sink):
+        self.sink = sink
+        self.queue = BoundedQueue(sink.queue_size, sink.policy)
+        self.metrics = StageMetrics()
+        self.latency = 0.0  # s, from the oldest frame of the last batch until the sink finished it
+        self.thread = threading.Thread(target=self.run, name=f"sink-{sink.name}", daemon=True)
+
+    def run(self) -> None:
+        last_poll = time.monotonic()
+
+        while True:
+            try:
+                batch = self.queue.get(timeout=self.sink.poll_interval)
+            except queue.Empty:
+                if self.queue.closed:
+                    break
+            else:
+                started = time.perf_counter()
+                try:
+                    self.sink.consume(batch)
+                    self.metrics.count += 1
+                except Exception as e:
+                    self.metrics.errors += 1
+                    logger.error(f"Sink {self.sink.name} failed on a batch: {e}")
+                self.metrics.busy += time.perf_counter() - started
+                self.latency = time.monotonic() - batch.started
+
+            if time.monotonic() - last_poll >= self.sink.poll_interval:
+                last_poll = time.monotonic()
+                try:
+                    self.sink.poll()
+                except Exception as e:
+                    logger.error(f"Sink {self.sink.name} failed to poll: {e}")
+
+        try:
+            self.sink.close()
+        except Exception as e:
+            logger.error(f"Sink {self.sink.name} failed to close: {e}")
+
+    def get_metrics(self) -> dict:
+        return {
+            **self.metrics.to_dict(),
+            **self.sink.get_metrics(),
+            "latency_ms": 1000 * self.latency,
+            "queue": self.queue.get_metrics(),
+        }
+
+
+class Pipeline:
+    """
+    Pipeline class
+    -   `start()` opens the device and starts the threads, `stop()` stops reading, lets every queued batch reach
+        every sink, closes the sinks and the device; a stopped pipeline can be started again
+    -   `transforms` are called with every batch on the fan-out thread before the sinks see it, and may add
+        columns to `batch.columnar`
+    -   with `columnar=False` the batches only carry frames (`batch.samples` then counts frames), for pipelines
+        whose sinks do not use the columnar chunks, like headless logging
+    -   the acquisition thread hands a batch on once it is full; the hand-off timer thread hands on the partial
+        batch once it is `handoff_max_latency` old, so a read that blocks on a quiet bus does not hold it back
+    -   a batch is taken from the pending frames under `handoff_condition`, but queued outside of it (the queue
+        may block); its sequence number keeps the batches of both threads in order
+    """
+
+    def __init__(
+        self,
+        reader: ReaderStage,
+        parser: ParserStage,
+        decoder: DecoderStage,
+        sinks: list[Sink],
+        transforms: list[Callable[[Batch], None]] = None,
+        handoff_max_samples: int = HANDOFF_MAX_SAMPLES,
+        handoff_max_latency: float = HANDOFF_MAX_LATENCY,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        policy: str = "Block",
+        columnar: bool = True,
+    ):
+        self.reader = reader
+        self.parser = parser
+        self.decoder = decoder
+        self.sinks = sinks
+        self.transforms = transforms or []
+        self.handoff_max_samples = handoff_max_samples
+        self.handoff_max_latency = handoff_max_latency
+        self.queue_size = queue_size
+        self.policy = policy
+        self.columnar = columnar
+
+        self.fanout_metrics = StageMetrics()
+        self.last_batch_samples = 0
+        self.running = False
+        self.stop_event = threading.Event()
+        self.error: Exception = None    # set if acquisition stopped on its own
+
+        self.fanout_queue: BoundedQueue = None
+        self.runners: list[SinkRunner] = []
+        self.acquisition_thread: threading.Thread = None
+        self.handoff_thread: threading.Thread = None
+        self.fanout_thread: threading.Thread = None
+
+        # the batch being filled, shared by the acquisition and the hand-off timer threads
+        self.handoff_condition = threading.Condition()
+        self.pending_frames = []
+        self.pending_chunk: dict[str, tuple[list, list]] = {}
+        self.pending_samples = 0        # frames without decoded signals add a frame, but no samples
+        self.pending_started = 0.0     # monotonic time of the oldest pending frame
+
+        # batches are numbered when taken, and queued strictly in that order
+        self.queue_condition = threading.Condition()
+        self.taken_batches = 0
+        self.queued_batches = 0
+
+    def start(self) -> None:
+        self.stop_event.clear()
+        self.error = None
+        self.fanout_queue = BoundedQueue(self.queue_size, self.policy)
+        self.taken_batches = self.queued_batches = 0
+        self.runners = [SinkRunner(sink) for sink in self.sinks]
+
+        self.reader.open()
+
+        for runner in self.runners:
+            runner.thread.start()
+
+        self.fanout_thread = threading.Thread(target=self.fan_out, name="fan-out", daemon=True)
+        self.fanout_thread.start()
+        self.handoff_thread = threading.Thread(target=self.hand_off_on_time, name="hand-off timer", daemon=True)
+        self.handoff_thread.start()
+        self.acquisition_thread = threading.Thread(target=self.acquire, name="acquisition", daemon=True)
+        self.acquisition_thread.start()
+        self.running = True
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+
+        self.stop_event.set()
+        with self.handoff_condition:
+            self.handoff_condition.notify_all()
+        self.acquisition_thread.join(SHUTDOWN_TIMEOUT)
+
+        if self.acquisition_thread.is_alive():
+            # blocked in a read on a silent bus: closing the data reader makes the read fail and the thread exit
+            self.close_reader()
+            self.acquisition_thread.join(SHUTDOWN_TIMEOUT)
+
+        self.handoff_thread.join(SHUTDOWN_TIMEOUT)
+        if self.handoff_thread.is_alive():
+            logger.warning("Hand-off timer did not stop in time")
+
+        self.hand_off()
+
+        self.fanout_queue.close()
+        self.fanout_thread.join()
+
+        for runner in self.runners:
+            runner.queue.close()
+        for runner in self.runners:
+            runner.thread.join()
+
+        self.close_reader()
+        self.running = False
+
+    def close_reader(self) -> None:
+        try:
+            self.reader.close()
+        except Exception as e:
+            logger.error(f"Failed to close the data reader: {e}")
+
+    def is_alive(self) -> bool:
+        return self.acquisition_thread is not None and self.acquisition_thread.is_alive()
+
+    def acquire(self) -> None:
+        """Reader, parser and decoder, frame by frame; decoded frames are added to the pending batch"""
+        try:
+            while not self.stop_event.is_set():
+                raw_data = self.reader.read()
+                if not raw_data:
+                    continue
+
+                stage_started = time.perf_counter()
+                try:
+                    message = self.parser.parse(raw_data)
+                    self.parser.metrics.count += 1
+                except Exception as e:
+                    self.parser.metrics.errors += 1
+                    logger.debug(f"Error parsing frame: {e}")
+                    continue
+                finally:
+                    decode_started = time.perf_counter()
+                    self.parser.metrics.busy += decode_started - stage_started
+
+                try:
+                    frame = self.decoder.decode(raw_data, message)
+                    self.decoder.metrics.count += 1
+                except Exception as e:
+                    self.decoder.metrics.errors += 1
+                    logger.debug(f"Error interpreting frame: {e}")
+                    continue
+                finally:
+                    self.decoder.metrics.busy += time.perf_counter() - decode_started
+
+                with self.handoff_condition:
+                    self.add_frame(frame)
+                    taken = self.take_batch() if self.pending_samples >= self.handoff_max_samples else None
+
+                if taken is not None:
+                    self.queue_batch(*taken)
+
+        except Exception as e:
+            if not self.stop_event.is_set():
+                self.error = e
+                logger.error(f"Acquisition stopped: {e}")
+
+    def add_frame(self, frame: src.protocols.template_protocol.TemplateFrame) -> None:
+        """add a decoded frame to the pending batch (call with `self.handoff_condition` held)"""
+        if not self.pending_frames:
+            self.pending_started = time.monotonic()
+            self.handoff_condition.notify()     # start the hand-off timer
+
+        self.pending_frames.append(frame)
+        if not self.columnar:
+            self.pending_samples += 1
+            return
+
+        for signal_name, signal_value in frame.interpreted_data.items():
+            if signal_name not in self.pending_chunk:
+                self.pending_chunk[signal_name] = ([], [])
+            self.pending_chunk[signal_name][0].append(frame.timestamp)
+            self.pending_chunk[signal_name][1].append(signal_value)
+            self.pending_samples += 1
+
+    def hand_off_on_time(self) -> None:
+        """hand on the pending batch once its oldest frame is `handoff_max_latency` old, whether or not frames arrive"""
+        while True:
+            with self.handoff_condition:
+                # checked under the condition, stop() notifies it after setting the event
+                if self.stop_event.is_set():
+                    return
+
+                if not self.pending_frames:
+                    self.handoff_condition.wait()
+                    continue
+
+                remaining = self.pending_started + self.handoff_max_latency - time.monotonic()
+                if remaining > 0:
+                    self.handoff_condition.wait(remaining)
+                    continue
+
+                taken = self.take_batch()
+
+            self.queue_batch(*taken)
+
+    def hand_off(self) -> None:
+        """take the pending batch, if any, and queue it"""
+        with self.handoff_condition:
+            taken = self.take_batch()
+
+        if taken is not None:
+            self.queue_batch(*taken)
+
+    def take_batch(self) -> tuple[int, Batch] | None:
+        """
+        -   convert the pending samples into one columnar chunk of NumPy arrays per signal
+        -   return the batch with its sequence number, or `None` if no frame is pending
+        -   call with `self.handoff_condition` held
+        """
+        if not self.pending_frames:
+            return None
+
+        columnar = {
+            signal_name: (numpy.array(timestamps, dtype=numpy.int64), numpy.array(values, dtype=numpy.float64))
+            for signal_name, (timestamps, values) in self.pending_chunk.items()
+        }
+        batch = Batch(self.pending_started, self.pending_frames, columnar, self.pending_samples)
+        self.pending_frames, self.pending_chunk, self.pending_samples = [], {}, 0
+
+        sequence = self.taken_batches
+        self.taken_batches += 1
+        return sequence, batch
+
+    def queue_batch(self, sequence: int, batch: Batch) -> None:
+        """queue a taken batch once all batches taken before it are queued, without holding `handoff_condition`"""
+        with self.queue_condition:
+            self.queue_condition.wait_for(lambda: self.queued_batches == sequence)
+            try:
+                self.fanout_queue.put(batch)
+            finally:
+                self.queued_batches += 1
+                self.queue_condition.notify_all()
+
+    def fan_out(self) -> None:
+        while True:
+            try:
+                batch = self.fanout_queue.get(timeout=0.1)
+            except queue.Empty:
+                if self.fanout_queue.closed:
+                    break
+                continue
+
+            stage_started = time.perf_counter()
+            try:
+                for transform in self.transforms:
+                    transform(batch)
+                self.fanout_metrics.count += 1
+            except Exception as e:
+                self.fanout_metrics.errors += 1
+                logger.error(f"Transform failed on a batch: {e}")
+            self.fanout_metrics.busy += time.perf_counter() - stage_started
+            self.last_batch_samples = batch.samples
+
+            for runner in self.runners:
+                runner.queue.put(batch)
+
+    def get_metrics(self) -> dict:
+        """
+        return the counters of every stage, queue and sink:
+        `{"stages": {...}, "fanout_queue": {...}, "sinks": {name: {...}}, "batch_size": samples of the last batch}`
+        """
+        return {
+            "stages": {
+                "reader": self.reader.metrics.to_dict(),
+                "parser": self.parser.metrics.to_dict(),
+                "decoder": self.decoder.metrics.to_dict(),
+                "fan-out": self.fanout_metrics.to_dict(),
+            },
+            "fanout_queue": self.fanout_queue.get_metrics() if self.fanout_queue else None,
+            "sinks": {runner.sink.name: runner.get_metrics() for runner in self.runners},
+            "batch_size": self.last_batch_samples,
+        }
@@ -0,0 +1,5 @@
+"""
+Plotting helpers shared by the live and offline views
+"""
+
+from . import backends, decimation, history, scheduler
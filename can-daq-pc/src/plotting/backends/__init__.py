@@ -0,0 +1,18 @@
+"""
+List of supported plot backends.
+-   all backends inherit from the template_backend module
+-   each backend has an entry in the `backend_details` dictionary here
+"""
+
+from . import matplotlib_backend, template_backend, tk_canvas_backend
+
+backend_details = {
+    "Matplotlib": {
+        "module": matplotlib_backend,
+    },
+    "Tk Canvas (lightweight)": {
+        "module": tk_canvas_backend,
+    },
+}   # dictionary of supported plot backends
+
+DEFAULT_PLOT_BACKEND = "Matplotlib"  # full-featured, the lightweight renderer is opt-in
@@ -0,0 +1,258 @@
+"""
+Matplotlib Plot Backend
+-   renders through matplotlib and `FigureCanvasTkAgg`
+-   full-featured (axes, legends, grid), uses blitting so only the lines are redrawn per frame
+"""
+
+import matplotlib.figure
+import numpy
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as FigureCanvas
+
+import src.messages
+from src.plotting.backends import template_backend
+
+
+class PlotBackend(template_backend.PlotBackend):
+    fig: matplotlib.figure.Figure
+    canvas: FigureCanvas
+
+    def create_widget(self) -> None:
+        self.fig = matplotlib.figure.Figure(figsize=(5, 4), dpi=100)
+        self.plot = self.fig.add_subplot(111)
+        self.fig.subplots_adjust(right=0.65)  # Give more space for multiple y-axes
+
+        self.style_axis(self.plot)
+
+        # Blitting: the static figure is cached after every full draw, only the lines are redrawn per frame
+        self.background = None
+        self.canvas = FigureCanvas(self.fig, master=self.master)
+        self.canvas.mpl_connect("draw_event", self.on_canvas_draw)
+        self.canvas.mpl_connect("scroll_event", self.on_scroll)
+        self.canvas.mpl_connect("button_press_event", self.on_button_press)
+        self.canvas.mpl_connect("motion_notify_event", self.on_mouse_move)
+        self.canvas.mpl_connect("button_release_event", self.on_button_release)
+        self.drag_x = None
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+        self.lines = {}
+        self.autoscaled_axes = set()    # axes without a DBC range, scaled to the data on every frame
+        self.plot.grid(True)
+        self.plot.set_title("Signals")
+        self.plot.set_ylabel("Value")
+
+        self.axes = {}
+
+    def style_axis(self, axis):
+        """Apply the light/dark mode colours to an axis"""
+        if template_backend.is_dark_mode():
+            self.fig.patch.set_facecolor('#2e2e2e')
+            axis.set_facecolor('#2e2e2e')
+            axis.tick_params(colors='white', which='both')
+            axis.xaxis.label.set_color('white')
+            axis.yaxis.label.set_color('white')
+            axis.title.set_color('white')
+        else:
+            self.fig.patch.set_facecolor('white')
+            axis.set_facecolor('white')
+            axis.tick_params(colors='black', which='both')
+            axis.xaxis.label.set_color('black')
+            axis.yaxis.label.set_color('black')
+            axis.title.set_color('black')
+
+    def build_layout(self) -> None:
+        self.axes.clear()
+        self.fig.clear()
+        self.lines.clear()
+        self.autoscaled_axes.clear()
+        self.background = None
+
+        if self.layout == "Overlay" or not self.signals:
+            self.build_overlay_axes(self.signals)
+        else:
+            self.build_stacked_axes(template_backend.group_signals(self.signals, self.layout))
+
+        self.canvas.draw_idle()
+
+    def build_overlay_axes(self, selected_signals: list[src.messages.Signal]):
+        """One plot with a twin y-axis per signal, the spines are offset to the right"""
+        self.fig.subplots_adjust(right=0.65, hspace=0.2)  # Give more space for multiple y-axes
+
+        self.plot = self.fig.add_subplot(1, 1, 1)
+        self.plot.grid(True)
+        self.plot.set_title("Signals")
+        self.plot.set_xlabel("Time /s")
+        self.plot.axes.get_yaxis().set_visible(False)
+
+        # Apply dark mode settings again
+        self.style_axis(self.plot)
+
+        for signal in selected_signals:
+            if signal.name not in self.axes:
+                new_axis = self.plot.twinx()
+                new_axis.set_ylabel(
+                    f"{signal.name} ({signal.unit if signal and signal.unit else ''})"
+                )
+
+                # Set limits for y-axis from signal min and max
+                self.set_value_range(new_axis, [signal])
+
+                # Assign a unique color to the y-axis
+                color = self.colours[signal.name]
+                new_axis.spines["right"].set_color(color)
+                new_axis.tick_params(axis="y", colors=color)
+                new_axis.yaxis.label.set_color(color)
+                new_axis.spines["right"].set_position(
+                    ("outward", 60 * (len(self.axes)))
+                )
+                new_axis.get_xaxis().set_visible(False)
+
+                # Lines are animated, so they are left out of the cached background
+                (self.lines[signal.name],) = new_axis.plot(
+                    [], [], "-", label=signal.name, color=color, animated=True
+                )
+
+                self.axes[signal.name] = new_axis
+
+        if self.axes:
+            # Combine all legends
+            lines = []
+            labels = []
+            for ax in self.axes.values():
+                ax_lines, ax_labels = ax.get_legend_handles_labels()
+                lines.extend(ax_lines)
+                labels.extend(ax_labels)
+
+            self.plot.legend(lines, labels, bbox_to_anchor=(1.35, 1), loc="upper left")
+            self.plot.set_title("Signals")
+            self.plot.set_xlabel("Time /s")
+
+    def build_stacked_axes(self, groups: list[list[src.messages.Signal]]):
+        """
+        -   one subplot per group of signals, stacked vertically with a shared time axis
+        -   only the bottom subplot shows the time tick labels
+        """
+        self.fig.subplots_adjust(right=0.95, hspace=0.1)
+        stacked_axes = self.fig.subplots(len(groups), 1, sharex=True, squeeze=False)[:, 0]
+
+        for axis, group in zip(stacked_axes, groups):
+            self.style_axis(axis)
+            axis.grid(True)
+            self.set_value_range(axis, group)
+
+            if self.layout == "Stacked by unit":
+                axis.set_ylabel(group[0].unit or "(no unit)")
+            else:
+                axis.set_ylabel(f"{group[0].name} ({group[0].unit or ''})")
+
+            for signal in group:
+                (self.lines[signal.name],) = axis.plot(
+                    [], [], "-", label=signal.name, color=self.colours[signal.name], animated=True
+                )
+                self.axes[signal.name] = axis
+
+            if len(group) > 1:
+                axis.legend(loc="upper left", fontsize="small")
+            else:
+                axis.yaxis.label.set_color(self.colours[group[0].name])
+
+            axis.label_outer()
+
+        stacked_axes[0].set_title("Signals")
+        self.plot = stacked_axes[-1]
+        self.plot.set_xlabel("Time /s")
+
+    def set_value_range(self, axis, signals: list[src.messages.Signal]) -> None:
+        value_range = template_backend.value_range(signals)
+
+        if value_range is None:
+            self.autoscaled_axes.add(axis)
+        else:
+            axis.set_ylim(*value_range)
+
+    def autoscale_values(self) -> bool:
+        """scale the axes without a DBC range to their data, return True if any y-limits changed"""
+        changed = False
+
+        for axis in self.autoscaled_axes:
+            limits = axis.get_ylim()
+            axis.relim()
+            axis.autoscale_view(scalex=False)
+            changed |= axis.get_ylim() != limits
+
+        return changed
+
+    def get_plot_width(self) -> int:
+        return int(self.plot.bbox.width)
+
+    def on_canvas_draw(self, event):
+        """
+        -   called after every full draw: layout rebuilt, window resized, or x-window moved
+        -   cache the static background, then draw the animated lines on top of it
+        """
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_lines()
+
+    def draw_lines(self):
+        for line in self.lines.values():
+            line.axes.draw_artist(line)
+
+    def blit_lines(self):
+        """Restore the cached background and redraw only the line artists"""
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+
+        self.canvas.restore_region(self.background)
+        self.draw_lines()
+        self.canvas.blit(self.fig.bbox)
+
+    def get_time_limits(self) -> tuple[float, float]:
+        return tuple(self.plot.get_xlim())
+
+    def set_time_limits(self, left: float, right: float) -> bool:
+        if (left, right) == tuple(self.plot.get_xlim()):
+            return False
+
+        self.plot.set_xlim(left, right)
+        return True
+
+    def get_tick_step(self) -> float:
+        tick_values = self.plot.xaxis.get_major_locator().tick_values(0, self.time_window)
+        return tick_values[1] - tick_values[0] if len(tick_values) > 1 else self.time_window
+
+    def on_scroll(self, event):
+        """Mouse wheel zooms the time axis around the cursor"""
+        bbox = self.plot.bbox
+        self.zoom((event.x - bbox.x0) / bbox.width, zoom_in=event.button == "up")
+
+    def on_button_press(self, event):
+        if event.button == 1 and event.inaxes is not None:
+            self.drag_x = event.x
+
+    def on_mouse_move(self, event):
+        """Dragging with the left mouse button pans the time axis"""
+        if self.drag_x is None:
+            return
+
+        self.pan((event.x - self.drag_x) / self.plot.bbox.width)
+        self.drag_x = event.x
+
+    def on_button_release(self, event):
+        self.drag_x = None
+
+    def render(self, signal_data: dict[str, tuple[numpy.ndarray, numpy.ndarray]]) -> None:
+        x_window_moved = self.update_time_limits(signal_data)
+
+        # Decimate to a min/max pair per pixel column of the visible window
+        x_min, x_max = self.plot.get_xlim()
+
+        for signal_name, (timestamps, values) in signal_data.items():
+            if signal_name in self.lines and len(timestamps):
+                self.lines[signal_name].set_data(*self.decimate(timestamps, values, x_min, x_max))
+
+        # the y tick labels are part of the cached background, so rescaling needs a full draw
+        if self.autoscale_values() or x_window_moved:
+            self.canvas.draw_idle()     # background is re-cached in on_canvas_draw
+        else:
+            self.blit_lines()
@@ -0,0 +1,234 @@
+"""
+Template Plot Backend
+-   provide the PlotBackend class, to be inherited from
+-   a backend owns the plot widget and everything drawn on it; the monitoring screen only hands it the
+    selected signals and their data
+"""
+
+import math
+from typing import Callable
+
+import customtkinter
+import numpy
+
+import src.messages
+from src.plotting import decimation
+
+PLOT_COLOURS = [
+    "#1f77b4",
+    "#ff7f0e",
+    "#2ca02c",
+    "#d62728",
+    "#9467bd",
+    "#8c564b",
+    "#e377c2",
+    "#7f7f7f",
+    "#bcbd22",
+    "#17becf",
+]
+
+# "Overlay": one plot with a y-scale per signal, "Stacked": one subplot per signal (or per unit) sharing the time axis
+PLOT_LAYOUTS = ["Overlay", "Stacked", "Stacked by unit"]
+
+ZOOM_FACTOR = 1.25      # time span change per mouse wheel step
+MIN_VIEW_SPAN = 0.01    # s
+
+
+def is_dark_mode() -> bool:
+    return customtkinter.get_appearance_mode().lower().strip() == "dark"
+
+
+def group_signals(signals: list[src.messages.Signal], layout: str) -> list[list[src.messages.Signal]]:
+    """
+    split the selected signals into the groups that share one plot area, according to the layout
+    """
+
+    if layout == "Overlay":
+        return [signals] if signals else []
+
+    groups: dict[str, list[src.messages.Signal]] = {}
+    for signal in signals:
+        key = (signal.unit or "") if layout == "Stacked by unit" else signal.name
+        groups.setdefault(key, []).append(signal)
+
+    return list(groups.values())
+
+
+def value_range(signals: list[src.messages.Signal]) -> tuple[float, float] | None:
+    """
+    -   the combined DBC range of the signals, ignoring signals without a range
+    -   `None` if no signal has a usable range (e.g. reviewed signals with only NULL/NaN values), then the plot
+        is scaled to the data instead
+    """
+
+    lows = [signal.min for signal in signals if signal.min is not None and math.isfinite(signal.min)]
+    highs = [signal.max for signal in signals if signal.max is not None and math.isfinite(signal.max)]
+
+    if not lows or not highs or not max(highs) > min(lows):
+        return None
+
+    return min(lows), max(highs)
+
+
+class PlotBackend:
+    """
+    Template Plot Backend class
+    -   to be inherited from by other plot backends
+    -   all times handed to the backend are in seconds since the session epoch
+    -   by default the time axis follows the newest data; zooming (mouse wheel) or panning (drag) detaches it,
+        until `follow_live()` is called
+    """
+
+    master: customtkinter.CTkFrame
+    time_window: float
+    signals: list[src.messages.Signal]
+    colours: dict[str, str]
+    layout: str
+    following: bool
+    view_limits: tuple[float, float] | None
+    on_view_change: Callable[[], None] | None
+
+    def __init__(self, master: customtkinter.CTkFrame, time_window: float):
+        self.master = master
+        self.time_window = time_window
+        self.signals = []
+        self.colours = {}
+        self.layout = PLOT_LAYOUTS[0]
+        self.following = True
+        self.view_limits = None
+        self.on_view_change = None   # called after the user zoomed or panned
+
+        self.create_widget()
+
+    def create_widget(self) -> None:
+        """
+        -   create the plot widget inside `self.master`
+        -   pack it, so it fills the master frame
+        """
+        ...
+
+    def set_signals(self, signals: list[src.messages.Signal], layout: str) -> None:
+        """
+        -   store the selected signals and the layout, and assign a colour to every signal
+        -   rebuild the plot areas with `build_layout`
+        """
+
+        self.signals = signals
+        self.layout = layout
+        self.colours = {signal.name: PLOT_COLOURS[index % len(PLOT_COLOURS)] for index, signal in enumerate(signals)}
+        self.build_layout()
+
+    def build_layout(self) -> None:
+        """
+        -   create the plot areas, axes and one line per selected signal
+        -   static parts (axes, labels, grid) are expected to be cached until the layout, size or time window changes
+        """
+        ...
+
+    def get_plot_width(self) -> int:
+        """
+        return the width of the plot area in pixels, used for decimation
+        """
+        ...
+
+    def get_time_limits(self) -> tuple[float, float]:
+        """
+        return the currently displayed time range in seconds
+        """
+        ...
+
+    def set_time_limits(self, left: float, right: float) -> bool:
+        """
+        -   display the time range [left, right] in seconds
+        -   return True if it changed, so the static parts have to be redrawn
+        """
+        ...
+
+    def get_tick_step(self) -> float:
+        """
+        return the distance between the time ticks of a `time_window` wide range, in seconds
+        """
+        ...
+
+    def update_time_limits(self, signal_data: dict[str, tuple[numpy.ndarray, numpy.ndarray]]) -> bool:
+        """
+        -   while following, scroll the time axis in steps of one tick instead of every frame, so the cached
+            static parts (ticks, labels, grid) stay valid until the data crosses a tick boundary
+        -   otherwise show the range chosen by zooming and panning
+        -   return True if the limits changed
+        """
+
+        if not self.following:
+            return self.set_time_limits(*self.view_limits)
+
+        non_empty_data = [timestamps for timestamps, _ in signal_data.values() if len(timestamps)]
+
+        if not non_empty_data:
+            return False
+
+        min_timestamp = min(timestamps[0] for timestamps in non_empty_data)
+        max_timestamp = max(timestamps[-1] for timestamps in non_empty_data)
+
+        step = self.get_tick_step()
+        right = (math.floor(max_timestamp / step) + 1) * step
+        left = max(math.floor(min_timestamp / step) * step, right - self.time_window)
+
+        return self.set_time_limits(left, right)
+
+    def follow_live(self) -> None:
+        """Let the time axis follow the newest data again"""
+        self.following = True
+        self.view_limits = None
+        self.notify_view_change()
+
+    def zoom(self, fraction: float, zoom_in: bool) -> None:
+        """
+        zoom the time axis around the point at `fraction` (0 = left edge, 1 = right edge) of the plot width
+        """
+
+        left, right = self.view_limits or self.get_time_limits()
+        span = right - left
+        new_span = max(span / ZOOM_FACTOR if zoom_in else span * ZOOM_FACTOR, MIN_VIEW_SPAN)
+        centre = left + fraction * span
+
+        self.set_view(centre - fraction * new_span, centre + (1 - fraction) * new_span)
+
+    def pan(self, fraction: float) -> None:
+        """
+        move the time axis by `fraction` of the plot width, positive values move towards older data
+        """
+
+        left, right = self.view_limits or self.get_time_limits()
+        shift = fraction * (right - left)
+
+        self.set_view(left - shift, right - shift)
+
+    def set_view(self, left: float, right: float) -> None:
+        """Detach from the live data and show [left, right], never before the start of the session"""
+        if left < 0:
+            left, right = 0.0, right - left
+
+        self.following = False
+        self.view_limits = (left, right)
+        self.notify_view_change()
+
+    def notify_view_change(self) -> None:
+        if self.on_view_change is not None:
+            self.on_view_change()
+
+    def decimate(
+        self, timestamps: numpy.ndarray, values: numpy.ndarray, x_min: float, x_max: float
+    ) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        reduce a signal to a min/max pair per pixel column of the visible window
+        """
+
+        return decimation.min_max_decimate(timestamps, values, x_min, x_max, self.get_plot_width())
+
+    def render(self, signal_data: dict[str, tuple[numpy.ndarray, numpy.ndarray]]) -> None:
+        """
+        -   draw the given `(timestamps, values)` of every selected signal
+        -   move the time window so the newest sample is visible
+        -   redraw as little as possible: ideally only the lines
+        """
+        ...
@@ -0,0 +1,318 @@
+"""
+Tk Canvas Plot Backend
+-   lightweight renderer for high channel counts, draws polylines directly on a `tkinter.Canvas`
+-   no axes objects, text layout or figure rasterization per frame: a frame only moves the line coordinates
+-   static items (frames, grid, labels) are drawn once and only redrawn on layout changes, resizes and time
+    window steps
+"""
+
+import math
+import tkinter
+
+import numpy
+
+import src.messages
+from src.plotting.backends import template_backend
+
+# space around each plot area in pixels
+MARGIN_LEFT = 60
+MARGIN_RIGHT = 15
+MARGIN_TOP = 20
+MARGIN_BOTTOM = 30
+AREA_SPACING = 8
+
+TARGET_TIME_TICKS = 5
+
+
+def nice_step(span: float, target_ticks: int = TARGET_TIME_TICKS) -> float:
+    """
+    return a tick step of 1, 2 or 5 times a power of ten, giving roughly `target_ticks` ticks over `span`
+    """
+
+    if span <= 0:
+        return 1.0
+
+    raw_step = span / target_ticks
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+
+    for multiple in (1, 2, 5, 10):
+        if raw_step <= multiple * magnitude:
+            return multiple * magnitude
+
+    return 10 * magnitude
+
+
+class PlotArea:
+    """
+    One rectangle of the canvas, with the signals drawn in it
+    -   in the overlay layout every signal is scaled to its own min/max, so the area has no common y-scale
+    -   signals without a DBC range are scaled to the range of the data drawn so far, which only ever widens
+    """
+
+    def __init__(
+        self, signals: list[src.messages.Signal], label: str, overlay: bool, value_range: tuple[float, float] | None
+    ):
+        self.signals = signals
+        self.label = label
+        self.overlay = overlay
+        self.value_range = value_range
+        self.data_ranges: dict[str, tuple[float, float]] = {}
+        self.left = self.top = self.right = self.bottom = 0
+
+    def is_autoscaled(self, signal: src.messages.Signal) -> bool:
+        if self.overlay:
+            return template_backend.value_range([signal]) is None
+        return self.value_range is None
+
+    def observe(self, signal_name: str, values: numpy.ndarray) -> bool:
+        """widen the data range of the signal by the given values, return True if it changed"""
+        finite_values = values[numpy.isfinite(values)]
+
+        if not len(finite_values):
+            return False
+
+        low, high = float(finite_values.min()), float(finite_values.max())
+
+        if signal_name in self.data_ranges:
+            old_low, old_high = self.data_ranges[signal_name]
+            if old_low <= low and high <= old_high:
+                return False
+            low, high = min(low, old_low), max(high, old_high)
+
+        self.data_ranges[signal_name] = (low, high)
+        return True
+
+    def signal_range(self, signal: src.messages.Signal) -> tuple[float, float] | None:
+        """overlay: the DBC range of the signal, else the range of its data, `None` before any data"""
+        return template_backend.value_range([signal]) or self.data_ranges.get(signal.name)
+
+    def area_range(self) -> tuple[float, float] | None:
+        """stacked: the common DBC range of the signals, else the range of their data, `None` before any data"""
+        if self.value_range is not None:
+            return self.value_range
+
+        data_ranges = [self.data_ranges[signal.name] for signal in self.signals if signal.name in self.data_ranges]
+
+        if not data_ranges:
+            return None
+
+        return min(low for low, _ in data_ranges), max(high for _, high in data_ranges)
+
+    def y_range(self, signal: src.messages.Signal) -> tuple[float, float]:
+        low, high = (self.signal_range(signal) if self.overlay else self.area_range()) or (0.0, 1.0)
+
+        if high <= low:
+            high = low + 1
+        return low, high
+
+
+class PlotBackend(template_backend.PlotBackend):
+    canvas: tkinter.Canvas
+
+    def create_widget(self) -> None:
+        self.colour_scheme = self.get_colour_scheme()
+
+        self.canvas = tkinter.Canvas(
+            self.master,
+            background=self.colour_scheme["background"],
+            highlightthickness=0,
+        )
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas.bind("<Configure>", self.on_resize)
+        self.canvas.bind("<MouseWheel>", self.on_scroll)
+        self.canvas.bind("<Button-4>", self.on_scroll)  # mouse wheel on X11
+        self.canvas.bind("<Button-5>", self.on_scroll)
+        self.canvas.bind("<ButtonPress-1>", self.on_button_press)
+        self.canvas.bind("<B1-Motion>", self.on_mouse_move)
+        self.drag_x = None
+
+        self.areas: list[PlotArea] = []
+        self.line_items: dict[str, int] = {}
+        self.signal_areas: dict[str, tuple[PlotArea, src.messages.Signal]] = {}
+        self.x_limits = (0.0, self.time_window)
+        self.static_dirty = True
+
+    def get_colour_scheme(self) -> dict[str, str]:
+        if template_backend.is_dark_mode():
+            return {"background": "#2e2e2e", "foreground": "white", "grid": "#505050"}
+        return {"background": "white", "foreground": "black", "grid": "#dddddd"}
+
+    def on_resize(self, event):
+        self.static_dirty = True
+
+    def on_scroll(self, event):
+        """Mouse wheel zooms the time axis around the cursor"""
+        zoom_in = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.zoom((event.x - MARGIN_LEFT) / self.get_plot_width(), zoom_in)
+
+    def on_button_press(self, event):
+        self.drag_x = event.x
+
+    def on_mouse_move(self, event):
+        """Dragging with the left mouse button pans the time axis"""
+        if self.drag_x is None:
+            return
+
+        self.pan((event.x - self.drag_x) / self.get_plot_width())
+        self.drag_x = event.x
+
+    def build_layout(self) -> None:
+        self.canvas.delete("all")
+        self.line_items.clear()
+        self.signal_areas.clear()
+
+        if self.layout == "Overlay":
+            self.areas = [PlotArea(self.signals, "Signals", True, None)] if self.signals else []
+        else:
+            self.areas = []
+            for group in template_backend.group_signals(self.signals, self.layout):
+                if self.layout == "Stacked by unit":
+                    label = group[0].unit or "(no unit)"
+                else:
+                    label = f"{group[0].name} ({group[0].unit or ''})"
+
+                self.areas.append(PlotArea(group, label, False, template_backend.value_range(group)))
+
+        for area in self.areas:
+            for signal in area.signals:
+                self.line_items[signal.name] = self.canvas.create_line(
+                    0, 0, 0, 0, fill=self.colours[signal.name], width=1, tags="line", state="hidden"
+                )
+                self.signal_areas[signal.name] = (area, signal)
+
+        self.static_dirty = True
+
+    def get_plot_width(self) -> int:
+        return max(1, self.canvas.winfo_width() - MARGIN_LEFT - MARGIN_RIGHT)
+
+    def place_areas(self) -> None:
+        """Split the canvas height between the plot areas"""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+
+        if not self.areas:
+            return
+
+        area_height = (height - MARGIN_TOP - MARGIN_BOTTOM - AREA_SPACING * (len(self.areas) - 1)) / len(self.areas)
+
+        for index, area in enumerate(self.areas):
+            area.left = MARGIN_LEFT
+            area.right = width - MARGIN_RIGHT
+            area.top = MARGIN_TOP + index * (area_height + AREA_SPACING)
+            area.bottom = area.top + max(area_height, 1)
+
+    def draw_static(self) -> None:
+        """Redraw the frames, the time grid and all labels"""
+        self.canvas.delete("static")
+        self.place_areas()
+
+        foreground = self.colour_scheme["foreground"]
+        grid = self.colour_scheme["grid"]
+        x_min, x_max = self.x_limits
+        step = nice_step(x_max - x_min)
+        first_tick = math.ceil(x_min / step) * step
+        ticks = numpy.arange(first_tick, x_max + step / 2, step)
+
+        for index, area in enumerate(self.areas):
+            for tick in ticks:
+                x = self.to_pixel_x(area, tick)
+                self.canvas.create_line(x, area.top, x, area.bottom, fill=grid, tags="static")
+
+            self.canvas.create_rectangle(area.left, area.top, area.right, area.bottom, outline=foreground, tags="static")
+
+            if area.overlay:
+                # Overlay: every signal has its own scale, list them with their ranges instead of y-tick labels
+                for row, signal in enumerate(area.signals):
+                    signal_range = area.signal_range(signal)
+                    scale = f"{signal_range[0]:g} .. {signal_range[1]:g} " if signal_range else ""
+                    self.canvas.create_text(
+                        area.left + 5, area.top + 5 + 14 * row, anchor="nw", fill=self.colours[signal.name],
+                        text=f"{signal.name} [{scale}{signal.unit or ''}]", tags="static",
+                    )
+            else:
+                colour = self.colours[area.signals[0].name] if len(area.signals) == 1 else foreground
+                area_range = area.area_range()
+                if area_range is not None:
+                    self.canvas.create_text(area.left - 5, area.top, anchor="ne", text=f"{area_range[1]:g}",
+                                            fill=foreground, tags="static")
+                    self.canvas.create_text(area.left - 5, area.bottom, anchor="se", text=f"{area_range[0]:g}",
+                                            fill=foreground, tags="static")
+                self.canvas.create_text(area.left - 5, (area.top + area.bottom) / 2, anchor="e", text=area.label,
+                                        fill=colour, width=MARGIN_LEFT - 5, tags="static")
+
+                if len(area.signals) > 1:
+                    for row, signal in enumerate(area.signals):
+                        self.canvas.create_text(area.left + 5, area.top + 5 + 14 * row, anchor="nw",
+                                                fill=self.colours[signal.name], text=signal.name, tags="static")
+
+            # Time tick labels only on the bottom area, the time axis is shared
+            if index == len(self.areas) - 1:
+                for tick in ticks:
+                    self.canvas.create_text(self.to_pixel_x(area, tick), area.bottom + 3, anchor="n",
+                                            text=f"{tick:g}", fill=foreground, tags="static")
+                self.canvas.create_text(area.right, area.bottom + 16, anchor="ne", text="Time /s",
+                                        fill=foreground, tags="static")
+
+        self.canvas.tag_lower("static")
+        self.static_dirty = False
+
+    def to_pixel_x(self, area: PlotArea, timestamps):
+        x_min, x_max = self.x_limits
+        return area.left + (timestamps - x_min) * ((area.right - area.left) / (x_max - x_min))
+
+    def get_time_limits(self) -> tuple[float, float]:
+        return self.x_limits
+
+    def set_time_limits(self, left: float, right: float) -> bool:
+        if (left, right) == self.x_limits:
+            return False
+
+        self.x_limits = (left, right)
+        return True
+
+    def get_tick_step(self) -> float:
+        return nice_step(self.time_window)
+
+    def render(self, signal_data: dict[str, tuple[numpy.ndarray, numpy.ndarray]]) -> None:
+        if self.update_time_limits(signal_data):
+            self.static_dirty = True
+
+        x_min, x_max = self.x_limits
+        decimated_data = {}
+
+        for signal_name, (timestamps, values) in signal_data.items():
+            if signal_name not in self.line_items:
+                continue
+
+            timestamps, values = self.decimate(timestamps, values, x_min, x_max)
+            decimated_data[signal_name] = (timestamps, values)
+
+            # signals without a DBC range: a wider data range changes the y-scale and its labels
+            area, signal = self.signal_areas[signal_name]
+            if area.is_autoscaled(signal) and area.observe(signal_name, values):
+                self.static_dirty = True
+
+        if self.static_dirty:
+            self.draw_static()
+
+        for signal_name, (timestamps, values) in decimated_data.items():
+            line_item = self.line_items[signal_name]
+
+            if len(timestamps) < 2:
+                self.canvas.itemconfigure(line_item, state="hidden")
+                continue
+
+            area, signal = self.signal_areas[signal_name]
+            low, high = area.y_range(signal)
+
+            # Interleave the pixel coordinates as x0, y0, x1, y1, ... for a single coords call
+            coordinates = numpy.empty(2 * len(timestamps))
+            coordinates[0::2] = self.to_pixel_x(area, timestamps)
+            coordinates[1::2] = numpy.clip(
+                area.bottom - (values - low) * ((area.bottom - area.top) / (high - low)),
+                area.top,
+                area.bottom,
+            )
+
+            self.canvas.coords(line_item, *coordinates.tolist())
+            self.canvas.itemconfigure(line_item, state="normal")
@@ -0,0 +1,66 @@
+"""
+Decimation of signals for plotting
+-   reduce a signal to what can actually be displayed: a min/max pair per horizontal pixel column
+-   spikes survive, since the extreme values of every column are kept
+-   fully vectorized, the cost is linear in the number of visible points and independent of the pixel count
+"""
+
+import numpy
+
+POINTS_PER_COLUMN = 2
+
+
+def visible_range(timestamps: numpy.ndarray, x_min: float, x_max: float) -> slice:
+    """
+    -   return the slice of (sorted) timestamps that falls in [x_min, x_max]
+    -   one extra point is kept on each side, so lines continue to the edges of the plot
+    """
+
+    start = max(numpy.searchsorted(timestamps, x_min, side="left") - 1, 0)
+    stop = min(numpy.searchsorted(timestamps, x_max, side="right") + 1, len(timestamps))
+    return slice(start, stop)
+
+
+def min_max_decimate(
+    timestamps: numpy.ndarray,
+    values: numpy.ndarray,
+    x_min: float,
+    x_max: float,
+    columns: int,
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    -   keep only the points visible in [x_min, x_max]
+    -   if there are more than `POINTS_PER_COLUMN` points per pixel column, keep the minimum and the maximum of
+        each column, in their original time order
+    -   `timestamps` must be sorted
+    """
+
+    visible = visible_range(timestamps, x_min, x_max)
+    timestamps = timestamps[visible]
+    values = values[visible]
+
+    if columns <= 0 or x_max <= x_min or len(timestamps) <= POINTS_PER_COLUMN * columns:
+        return timestamps, values
+
+    # column of every point; the points are sorted, so every column is a contiguous run
+    column_index = ((timestamps - x_min) * (columns / (x_max - x_min))).astype(numpy.int64)
+    numpy.clip(column_index, -1, columns, out=column_index)
+    starts = numpy.flatnonzero(numpy.diff(column_index, prepend=column_index[0] - 1))
+    counts = numpy.diff(starts, append=len(values))
+
+    # position of the first minimum/maximum in every column
+    positions = numpy.arange(len(values))
+    sentinel = len(values)
+    column_min = numpy.repeat(numpy.minimum.reduceat(values, starts), counts)
+    column_max = numpy.repeat(numpy.maximum.reduceat(values, starts), counts)
+    min_index = numpy.minimum.reduceat(numpy.where(values == column_min, positions, sentinel), starts)
+    max_index = numpy.minimum.reduceat(numpy.where(values == column_max, positions, sentinel), starts)
+
+    # columns containing NaN have no match, fall back to their first point
+    min_index = numpy.where(min_index == sentinel, starts, min_index)
+    max_index = numpy.where(max_index == sentinel, starts, max_index)
+
+    # keep time order inside each column
+    selected = numpy.column_stack((numpy.minimum(min_index, max_index), numpy.maximum(min_index, max_index))).ravel()
+
+    return timestamps[selected], values[selected]
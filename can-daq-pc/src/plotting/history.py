@@ -0,0 +1,168 @@
+"""
+Level-of-detail history for plots
+-   serves signal data that is no longer (or never was) in memory, straight from the session database
+-   zoomed out, the per-bucket min/max rollups are read instead of the raw samples
+-   data is fetched in fixed tiles on a background thread and kept in a bounded LRU cache, so panning
+    reuses what was already read and memory stays bounded
+"""
+
+import collections
+import concurrent.futures
+import threading
+from logging import getLogger
+from pathlib import Path
+from typing import Callable
+
+import numpy
+
+import src.database_functionality
+from src.plotting import decimation
+
+logger = getLogger(__name__)
+
+TILE_BUCKETS = 1024         # buckets per tile for the rollup levels
+RAW_TILE_WIDTH = 1 << 24    # µs (~17 s), tile width for raw samples
+MAX_CACHED_SAMPLES = 4_000_000  # bound on the samples held by the cache (~64 MB)
+
+
+def choose_level(tick0: int, tick1: int, columns: int) -> int | None:
+    """
+    -   return the coarsest rollup level whose buckets are still narrower than one pixel column
+    -   return `None` if even the finest rollup is too coarse, then the raw samples are used
+    """
+
+    bucket_width = (tick1 - tick0) / max(columns, 1)
+    levels = [level for level in src.database_functionality.ROLLUP_LEVELS if (1 << level) <= bucket_width]
+    return max(levels) if levels else None
+
+
+def tile_width(level: int | None) -> int:
+    return RAW_TILE_WIDTH if level is None else TILE_BUCKETS << level
+
+
+class HistoryCache:
+    """
+    History Cache class
+    -   `get()` returns immediately with the cached part of a range and queues the missing tiles
+    -   tiles are read by a single worker thread with its own read-only `SessionReader`, `on_loaded` is called
+        (from the worker thread) after every tile
+    -   a tile read while the session was still being written is marked with the time it is complete until,
+        and is read again once more of it is needed
+    """
+
+    def __init__(self, db_path: Path, on_loaded: Callable[[], None] = None, max_samples: int = MAX_CACHED_SAMPLES):
+        self.db_path = Path(db_path)
+        self.on_loaded = on_loaded
+        self.max_samples = max_samples
+
+        self.tiles: collections.OrderedDict = collections.OrderedDict()    # key -> (ticks, values, complete_until)
+        self.cached_samples = 0
+        self.pending: set = set()
+        self.lock = threading.Lock()
+
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.reader: src.database_functionality.SessionReader = None   # created on the worker thread
+        self.closed = False
+
+    def close(self) -> None:
+        """Skip the queued tiles and close the reader on the worker thread, which owns its connection"""
+        self.closed = True
+        self.executor.submit(self.close_reader)
+        self.executor.shutdown(wait=False)
+
+    def close_reader(self) -> None:
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def clear(self) -> None:
+        with self.lock:
+            self.tiles.clear()
+            self.cached_samples = 0
+
+    def get(
+        self, name: str, tick0: int, tick1: int, columns: int, complete_until: int = None
+    ) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        -   return the cached `(ticks, values)` of one signal over [tick0, tick1], at a level of detail of about
+            one min/max pair per pixel column
+        -   `complete_until` is the newest tick that is certainly committed to the database (for live sessions),
+            tiles read before that point was reached are refreshed
+        -   missing or outdated tiles are fetched in the background
+        """
+
+        level = choose_level(tick0, tick1, columns)
+        width = tile_width(level)
+        stale_tolerance = max((tick1 - tick0) // max(columns, 1), 1)
+
+        parts = []
+
+        with self.lock:
+            for tile in range(tick0 // width, tick1 // width + 1):
+                key = (name, level, tile)
+                needed_until = (tile + 1) * width if complete_until is None else min((tile + 1) * width, complete_until)
+                cached = self.tiles.get(key)
+
+                if cached is not None:
+                    self.tiles.move_to_end(key)
+                    parts.append(cached)
+
+                if cached is None or needed_until - cached[2] > stale_tolerance:
+                    self.request(key, complete_until)
+
+        if not parts:
+            return numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=numpy.float64)
+
+        ticks = numpy.concatenate([part[0] for part in parts])
+        values = numpy.concatenate([part[1] for part in parts])
+        visible = decimation.visible_range(ticks, tick0, tick1)
+        return ticks[visible], values[visible]
+
+    def request(self, key: tuple, complete_until: int | None) -> None:
+        """Queue a tile for reading, unless it is already queued (call with `self.lock` held)"""
+        if key in self.pending:
+            return
+
+        self.pending.add(key)
+        self.executor.submit(self.load_tile, key, complete_until)
+
+    def load_tile(self, key: tuple, complete_until: int | None) -> None:
+        name, level, tile = key
+        width = tile_width(level)
+        tick0, tick1 = tile * width, (tile + 1) * width - 1
+
+        if self.closed:
+            return
+
+        try:
+            if self.reader is None:
+                self.reader = src.database_functionality.SessionReader(self.db_path)
+
+            if level is None:
+                ticks, values = self.reader.read_signal_ticks(name, tick0, tick1)
+            else:
+                ticks, values = self.reader.read_signal_buckets(name, level, tick0, tick1)
+        except Exception as e:
+            logger.error(f"Failed to load history of {name}: {e}")
+            with self.lock:
+                self.pending.discard(key)
+            return
+
+        tile_complete_until = tick1 + 1 if complete_until is None else min(tick1 + 1, complete_until)
+
+        with self.lock:
+            previous = self.tiles.pop(key, None)
+            if previous is not None:
+                self.cached_samples -= len(previous[0])
+
+            self.tiles[key] = (ticks, values, tile_complete_until)
+            self.cached_samples += len(ticks)
+            self.pending.discard(key)
+
+            # Evict the least recently used tiles, always keeping the newest one
+            while self.cached_samples > self.max_samples and len(self.tiles) > 1:
+                _, (evicted_ticks, _, _) = self.tiles.popitem(last=False)
+                self.cached_samples -= len(evicted_ticks)
+
+        if self.on_loaded is not None:
+            self.on_loaded()
@@ -0,0 +1,133 @@
+"""
+Adaptive refresh scheduler for live plots
+-   drives the redraws from the Tk event loop with `after()`
+-   measures the actual draw time and backs off when drawing takes more than a given share of the CPU
+-   skips frames when no new data arrived, and pauses while the window is minimized
+"""
+
+import collections
+import math
+import time
+from typing import Callable
+
+DRAW_TIME_SMOOTHING = 0.2   # weight of the newest draw time in the moving average
+FPS_WINDOW = 1.0            # s, achieved FPS is measured over this window
+PAUSED_POLL_INTERVAL = 500  # ms, how often a minimized window is checked
+
+
+class RefreshScheduler:
+    """
+    Refresh Scheduler class
+    -   calls `render()` at most every `min_interval` ms, and only if `get_data_version()` changed since the last frame
+    -   if the average draw time exceeds `max_cpu_share` of the interval, the interval is stretched (up to
+        `max_interval` ms); every whole `min_interval` that passed between two consecutive frames while new data
+        was waiting is counted as a dropped frame
+    -   exposes the achieved FPS, the dropped and skipped frame counts, and the draw time
+    """
+
+    def __init__(
+        self,
+        widget,
+        render: Callable[[], None],
+        get_data_version: Callable[[], int],
+        min_interval: int = 100,
+        max_cpu_share: float = 0.5,
+        max_interval: int = 2000,
+    ):
+        self.widget = widget
+        self.render = render
+        self.get_data_version = get_data_version
+        self.min_interval = min_interval
+        self.max_cpu_share = max_cpu_share
+        self.max_interval = max_interval
+
+        self.running = False
+        self.after_id = None
+        self.last_data_version = None
+        self.interval = min_interval
+        self.draw_time = 0.0
+        self.frame_times: collections.deque[float] = collections.deque()
+        self.last_frame_start: float = None     # start of the previous frame, if the tick before this one drew
+        self.dropped_frames = 0
+        self.skipped_frames = 0
+        self.paused = False
+
+    def start(self) -> None:
+        self.running = True
+        self.schedule(self.min_interval)
+
+    def stop(self) -> None:
+        self.running = False
+
+        if self.after_id:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def schedule(self, interval: int) -> None:
+        if self.running:
+            self.after_id = self.widget.after(int(interval), self.tick)
+
+    def is_minimized(self) -> bool:
+        try:
+            return self.widget.winfo_toplevel().state() == "iconic"
+        except Exception:
+            return False
+
+    def tick(self) -> None:
+        if self.is_minimized():
+            self.paused = True
+            self.last_frame_start = None
+            self.schedule(PAUSED_POLL_INTERVAL)
+            return
+
+        self.paused = False
+        data_version = self.get_data_version()
+
+        if data_version == self.last_data_version:
+            self.skipped_frames += 1
+            self.last_frame_start = None
+            self.schedule(self.interval)
+            return
+
+        self.last_data_version = data_version
+
+        start = time.perf_counter()
+
+        # frames drawn back to back: the whole intervals beyond the first are frames the fixed schedule would have drawn
+        if self.last_frame_start is not None:
+            self.dropped_frames += max(math.floor((start - self.last_frame_start) * 1000 / self.min_interval) - 1, 0)
+        self.last_frame_start = start
+
+        self.render()
+        end = time.perf_counter()
+
+        self.draw_time += DRAW_TIME_SMOOTHING * ((end - start) - self.draw_time)
+        self.frame_times.append(end)
+
+        while self.frame_times and end - self.frame_times[0] > FPS_WINDOW:
+            self.frame_times.popleft()
+
+        # keep the drawing below the CPU share: interval >= draw time / share
+        required_interval = self.draw_time * 1000 / self.max_cpu_share
+        self.interval = min(max(self.min_interval, required_interval), self.max_interval)
+
+        self.schedule(self.interval)
+
+    def get_metrics(self) -> dict:
+        """
+        -   return the achieved FPS, dropped/skipped frame counts, average draw time (ms) and current interval (ms)
+        -   the FPS counts the frames of the last `FPS_WINDOW` up to now, so it drops to 0 when nothing is drawn
+        -   can be called from any thread, the frame times are only read
+        """
+
+        now = time.perf_counter()
+        recent_frames = sum(1 for frame_time in list(self.frame_times) if now - frame_time <= FPS_WINDOW)
+
+        return {
+            "fps": recent_frames / FPS_WINDOW,
+            "dropped_frames": self.dropped_frames,
+            "skipped_frames": self.skipped_frames,
+            "draw_time_ms": self.draw_time * 1000,
+            "interval_ms": self.interval,
+            "paused": self.paused,
+        }
@@ -4,11 +4,16 @@ List of supported protocols and their details.
 -   each protocol has an entry in the `protocol_details` dictionary here
 """
 
-import customtkinter
+from typing import TYPE_CHECKING
+
 import serial.tools.list_ports
 
 from . import can_protocol, template_protocol
 
+# customtkinter only for the type hints, so the headless and export paths never load Tk
+if TYPE_CHECKING:
+    import customtkinter
+
 protocol_details = {
     "CAN": {
         "module": can_protocol,
@@ -24,7 +29,7 @@ def get_serial_ports() -> list[str]:
     ports = serial.tools.list_ports.comports()
     return [port.device for port in ports]
 
-def refresh_serial_ports(serial_port_option_menu: customtkinter.CTkOptionMenu):
+def refresh_serial_ports(serial_port_option_menu: "customtkinter.CTkOptionMenu"):
     """
     Helper function to refresh the list of available serial ports
     """
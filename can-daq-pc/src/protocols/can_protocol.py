@@ -53,6 +53,7 @@ class Protocol(template_protocol.TemplateProtocol):
                         name=message.name,
                         length=message.length,
                         signals=signals,
+                        cycle_time=message.cycle_time,
                     )
                 )
 
@@ -69,7 +69,7 @@ class TemplateFrame:
     raw_data: bytes = None
     interpreted_data: dict = {}
     database_id: int = None
-    timestamp: float = None
+    timestamp: int = None   # microseconds since the session epoch
     decoded_message: src.messages.UniversalMessage
 
     def __init__(self,
@@ -77,7 +77,7 @@ class TemplateFrame:
         length: int = None,
         raw_data: bytes = None,
         interpreted_data: dict = {},
-        timestamp: float = None,
+        timestamp: int = None,
         protocol: TemplateProtocol = None
     ):
         self.message_id = id
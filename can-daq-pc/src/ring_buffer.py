@@ -0,0 +1,133 @@
+"""
+Ring buffer for signal samples
+-   preallocated NumPy storage for timestamps (int64 microseconds) and values (float64)
+-   bulk append of whole arrays
+-   zero-copy contiguous view of the newest samples
+"""
+
+import threading
+
+import numpy
+
+
+class RingBuffer:
+    """
+    Ring Buffer class
+    -   fixed capacity, the oldest samples are overwritten once it is full
+    -   every sample is written twice (at `i` and `i + capacity`), so the newest N samples are always one
+        contiguous slice and can be returned as a view, without copying or reordering
+    -   one writer thread and any number of reader threads; a returned view stays valid until the writer
+        wraps around over it
+    """
+
+    capacity: int
+    timestamps: numpy.ndarray
+    values: numpy.ndarray
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+
+        self.capacity = capacity
+        self.timestamps = numpy.zeros(2 * capacity, dtype=numpy.int64)
+        self.values = numpy.zeros(2 * capacity, dtype=numpy.float64)
+        self.position = 0   # next slot to write, in [0, capacity)
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, timestamp: int, value: float) -> None:
+        """
+        append a single sample
+        """
+
+        with self.lock:
+            self.timestamps[self.position] = self.timestamps[self.position + self.capacity] = timestamp
+            self.values[self.position] = self.values[self.position + self.capacity] = value
+            self.position = (self.position + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, timestamps: numpy.ndarray, values: numpy.ndarray) -> None:
+        """
+        -   append arrays of samples in bulk
+        -   if more samples than the capacity are given, only the newest ones are kept
+        """
+
+        count = len(timestamps)
+
+        if count == 0:
+            return
+
+        if count > self.capacity:
+            timestamps = timestamps[-self.capacity:]
+            values = values[-self.capacity:]
+            count = self.capacity
+
+        with self.lock:
+            start = self.position
+            first = min(count, self.capacity - start)   # samples before the end of the buffer
+            rest = count - first                        # samples wrapping around to the start
+
+            for array, data in ((self.timestamps, timestamps), (self.values, values)):
+                array[start:start + first] = data[:first]
+                array[start + self.capacity:start + self.capacity + first] = data[:first]
+
+                if rest:
+                    array[:rest] = data[first:]
+                    array[self.capacity:self.capacity + rest] = data[first:]
+
+            self.position = (start + count) % self.capacity
+            self.size = min(self.size + count, self.capacity)
+
+    def latest(self, count: int = None) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        -   return views of the newest `count` samples (all samples by default), oldest first
+        -   the views share memory with the buffer, copy them if they must outlive the next appends
+        """
+
+        with self.lock:
+            count = self.size if count is None else min(count, self.size)
+            end = self.position + self.capacity
+
+        return self.timestamps[end - count:end], self.values[end - count:end]
+
+    def since(self, timestamp: int) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        return views of the samples at or after `timestamp`, oldest first
+        """
+
+        timestamps, values = self.latest()
+        start = numpy.searchsorted(timestamps, timestamp, side="left")
+        return timestamps[start:], values[start:]
+
+    def span(self) -> int:
+        """
+        return the time covered by the buffered samples, in the timestamp unit
+        """
+
+        timestamps, _ = self.latest()
+        return int(timestamps[-1] - timestamps[0]) if len(timestamps) > 1 else 0
+
+    def resize(self, capacity: int) -> None:
+        """
+        change the capacity, keeping the newest samples
+        """
+
+        timestamps, values = self.latest(capacity)
+        timestamps, values = timestamps.copy(), values.copy()
+
+        with self.lock:
+            self.capacity = capacity
+            self.timestamps = numpy.zeros(2 * capacity, dtype=numpy.int64)
+            self.values = numpy.zeros(2 * capacity, dtype=numpy.float64)
+            self.position = 0
+            self.size = 0
+
+        self.extend(timestamps, values)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.position = 0
+            self.size = 0
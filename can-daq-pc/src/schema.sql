@@ -1,6 +1,12 @@
+-- Timestamps are integer microseconds since the session epoch, stored in session_info
+CREATE TABLE IF NOT EXISTS session_info (
+    name TEXT PRIMARY KEY,
+    value
+);
+
 CREATE TABLE IF NOT EXISTS messages (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    timestamp REAL,
+    timestamp INTEGER,
     message_id INTEGER,
     length INTEGER,
     raw_data BLOB
@@ -8,15 +14,40 @@ CREATE TABLE IF NOT EXISTS messages (
 
 CREATE TABLE IF NOT EXISTS signals (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    timestamp REAL,
+    timestamp INTEGER,
     frame_id INTEGER,
     signal_name TEXT,
     value REAL,
     FOREIGN KEY(frame_id) REFERENCES messages(id)
 );
 
+-- Per-signal min/max summaries of fixed time buckets, at several bucket widths, for zoomed-out views
+-- bucket = timestamp >> level, so a bucket is 2^level microseconds wide
+CREATE TABLE IF NOT EXISTS signal_rollups (
+    signal_name TEXT,
+    level INTEGER,
+    bucket INTEGER,
+    min_value REAL,
+    max_value REAL,
+    sample_count INTEGER,
+    PRIMARY KEY (signal_name, level, bucket)
+) WITHOUT ROWID;
+
+-- Pre/post-trigger captures, the samples of the captured signals are one compressed NumPy (.npz) blob
+CREATE TABLE IF NOT EXISTS trigger_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp INTEGER,
+    trigger_name TEXT,
+    condition TEXT,
+    signal_name TEXT,
+    pre_trigger INTEGER,
+    post_trigger INTEGER,
+    samples BLOB
+);
+
 -- Add indexes for better insertion and query performance
 CREATE INDEX IF NOT EXISTS idx_messages_timestamp_msgid ON messages(timestamp, message_id);
 CREATE INDEX IF NOT EXISTS idx_signals_frameid_timestamp ON signals(frame_id, timestamp);
 CREATE INDEX IF NOT EXISTS idx_signals_signalname ON signals(signal_name);
+CREATE INDEX IF NOT EXISTS idx_signals_signalname_timestamp ON signals(signal_name, timestamp);
 
@@ -2,4 +2,4 @@
 All the views/screens of our application
 """
 
-from . import protocol_config_screen, monitoring_screen, session_management_screen, timing_config_screen
\ No newline at end of file
+from . import derived_signal_dialog, histogram_panel, protocol_config_screen, monitoring_screen, review_screen, session_management_screen, signal_selector, spectrum_panel, timing_config_screen, trigger_dialog, ui_dispatcher
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Derived Signal Dialog
+-   define a computed channel from an expression over existing signal names, e.g. `voltage * current`
+-   the definition is validated by the caller, errors are shown in the dialog until it is corrected or cancelled
+"""
+
+from typing import Callable
+
+import customtkinter
+
+import src.analysis
+
+EXPRESSION_HELP = (
+    "Operators: + - * / ** % and comparisons, combined with & |\n"
+    "Functions: " + ", ".join(src.analysis.derived_signals.FUNCTIONS) + "\n"
+    "Stateful: moving_average(x, samples), derivative(x)"
+)
+
+
+class DerivedSignalDialog:
+    """
+    Derived Signal Dialog class
+    -   `on_add(definition)` receives the entered fields as a dict and returns an error message, or `None` once
+        the derived signal has been added
+    """
+
+    def __init__(self, master: customtkinter.CTk, on_add: Callable[[dict], str | None]):
+        self.on_add = on_add
+
+        self.window = customtkinter.CTkToplevel(master)
+        self.window.title("Add Derived Signal")
+        self.window.geometry("480x420")
+        self.window.transient(master.winfo_toplevel())
+
+        self.create_ui_elements()
+
+    def create_ui_elements(self):
+        self.ctk_frame = customtkinter.CTkFrame(master=self.window)
+        self.ctk_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.ctk_frame.grid_columnconfigure(1, weight=1)
+
+        self.entries = {}
+        fields = [
+            ("name", "Name:", ""),
+            ("expression", "Expression:", ""),
+            ("unit", "Unit:", ""),
+            ("min", "Min:", "0"),
+            ("max", "Max:", "100"),
+        ]
+
+        for row, (key, label_text, default) in enumerate(fields):
+            label = customtkinter.CTkLabel(master=self.ctk_frame, text=label_text, anchor="w")
+            label.grid(row=row, column=0, padx=5, pady=5, sticky="w")
+
+            entry = customtkinter.CTkEntry(master=self.ctk_frame)
+            entry.insert(0, default)
+            entry.grid(row=row, column=1, padx=5, pady=5, sticky="ew")
+            self.entries[key] = entry
+
+        self.log_var = customtkinter.BooleanVar(value=False)
+        log_checkbox = customtkinter.CTkCheckBox(
+            master=self.ctk_frame,
+            text="Write to session",
+            variable=self.log_var,
+        )
+        log_checkbox.grid(row=len(fields), column=0, columnspan=2, padx=5, pady=5, sticky="w")
+
+        help_label = customtkinter.CTkLabel(
+            master=self.ctk_frame,
+            text=EXPRESSION_HELP,
+            justify="left",
+            anchor="w",
+            wraplength=440,
+            font=("Arial", 11),
+        )
+        help_label.grid(row=len(fields) + 1, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+
+        self.error_label = customtkinter.CTkLabel(
+            master=self.ctk_frame,
+            text="",
+            text_color="red",
+            justify="left",
+            anchor="w",
+            wraplength=440,
+        )
+        self.error_label.grid(row=len(fields) + 2, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+
+        button_frame = customtkinter.CTkFrame(master=self.ctk_frame, fg_color="transparent")
+        button_frame.grid(row=len(fields) + 3, column=0, columnspan=2, pady=10)
+
+        add_button = customtkinter.CTkButton(master=button_frame, text="Add", command=self.add)
+        add_button.pack(side="left", padx=5)
+
+        cancel_button = customtkinter.CTkButton(master=button_frame, text="Cancel", command=self.window.destroy)
+        cancel_button.pack(side="left", padx=5)
+
+    def add(self):
+        try:
+            definition = {
+                "name": self.entries["name"].get().strip(),
+                "expression": self.entries["expression"].get().strip(),
+                "unit": self.entries["unit"].get().strip(),
+                "min": float(self.entries["min"].get()),
+                "max": float(self.entries["max"].get()),
+                "log_to_session": self.log_var.get(),
+            }
+        except ValueError:
+            self.error_label.configure(text="Min and max must be numbers")
+            return
+
+        if not definition["name"].isidentifier():
+            self.error_label.configure(text="The name must be a valid identifier (letters, digits, underscores)")
+            return
+
+        error = self.on_add(definition)
+
+        if error:
+            self.error_label.configure(text=error)
+        else:
+            self.window.destroy()
@@ -0,0 +1,131 @@
+"""
+Histogram Panel
+-   live value distribution of the selected signals, one small plot per signal
+-   shown below the time plot of the monitoring screen, and only binned while it is shown
+"""
+
+import time
+from logging import getLogger
+
+import customtkinter
+import matplotlib.figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as FigureCanvas
+
+import src.analysis
+import src.messages
+from src.plotting.backends import template_backend
+
+logger = getLogger(__name__)
+
+MAX_HISTOGRAM_SIGNALS = 4
+HISTOGRAM_REDRAW_INTERVAL = 0.5     # s, the counts change with every batch, the figure is redrawn at most this often
+HISTOGRAM_RANGES = ["Window", "Session"]
+
+
+class HistogramPanel:
+    """
+    Histogram Panel class
+    -   the counts are kept by a `HistogramEngine`, fed by the data processing thread
+    -   the panel only reads the engine and redraws when its version changed
+    """
+
+    def __init__(self, master: customtkinter.CTkFrame, engine: src.analysis.histograms.HistogramEngine):
+        self.engine = engine
+        self.signals: list[src.messages.Signal] = []
+        self.steps = {}
+        self.drawn_version = None
+        self.last_draw = 0.0
+
+        self.create_ui_elements(master)
+
+    def create_ui_elements(self, master: customtkinter.CTkFrame):
+        self.ctk_frame = customtkinter.CTkFrame(master=master)
+
+        control_frame = customtkinter.CTkFrame(master=self.ctk_frame, fg_color="transparent")
+        control_frame.pack(fill="x", padx=5, pady=(5, 0))
+
+        range_label = customtkinter.CTkLabel(master=control_frame, text="Range:")
+        range_label.pack(side="left", padx=5)
+
+        self.range_menu = customtkinter.CTkOptionMenu(
+            master=control_frame,
+            values=HISTOGRAM_RANGES,
+            command=lambda _: self.invalidate(),
+            width=100,
+        )
+        self.range_menu.set(HISTOGRAM_RANGES[0])
+        self.range_menu.pack(side="left", padx=5)
+
+        reset_button = customtkinter.CTkButton(
+            master=control_frame,
+            text="Reset",
+            command=self.reset,
+            width=60,
+        )
+        reset_button.pack(side="left", padx=5)
+
+        self.info_label = customtkinter.CTkLabel(master=control_frame, text="", anchor="w")
+        self.info_label.pack(side="left", padx=5)
+
+        self.fig = matplotlib.figure.Figure(figsize=(5, 2.5), dpi=100)
+        self.dark = template_backend.is_dark_mode()
+        self.fig.patch.set_facecolor("#2e2e2e" if self.dark else "white")
+
+        self.canvas = FigureCanvas(self.fig, master=self.ctk_frame)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+        self.build_axes()
+
+    def set_signals(self, signals: list[src.messages.Signal]) -> None:
+        self.signals = signals[:MAX_HISTOGRAM_SIGNALS]
+        self.engine.set_signals(self.signals)
+        self.build_axes()
+
+    def reset(self) -> None:
+        self.engine.reset()
+        self.build_axes()
+
+    def invalidate(self) -> None:
+        self.drawn_version = None
+
+    def build_axes(self) -> None:
+        """One subplot per signal, each with a step patch whose data is replaced on redraw"""
+        self.fig.clear()
+        self.steps = {}
+        foreground = "white" if self.dark else "black"
+
+        for index, signal in enumerate(self.signals):
+            plot = self.fig.add_subplot(1, len(self.signals), index + 1)
+            plot.set_facecolor("#2e2e2e" if self.dark else "white")
+            plot.tick_params(colors=foreground, labelsize="small")
+            plot.set_title(f"{signal.name} ({signal.unit})" if signal.unit else signal.name, color=foreground, fontsize="small")
+
+            colour = template_backend.PLOT_COLOURS[index % len(template_backend.PLOT_COLOURS)]
+            self.steps[signal.name] = (plot, plot.stairs([0], [0, 1], fill=True, color=colour, alpha=0.7))
+
+        self.fig.subplots_adjust(left=0.08, right=0.98, bottom=0.15, top=0.85, wspace=0.3)
+        self.invalidate()
+        self.canvas.draw_idle()
+
+    def refresh(self) -> None:
+        """Redraw from the engine if the counts changed, at most every `HISTOGRAM_REDRAW_INTERVAL`"""
+        if self.engine.version == self.drawn_version or time.monotonic() - self.last_draw < HISTOGRAM_REDRAW_INTERVAL:
+            return
+
+        self.drawn_version = self.engine.version
+        self.last_draw = time.monotonic()
+        windowed = self.range_menu.get() == "Window"
+        outside = 0
+
+        for signal_name, (plot, step) in self.steps.items():
+            histogram = self.engine.get(signal_name, windowed=windowed)
+            if histogram is None:
+                continue
+
+            step.set_data(histogram.counts, histogram.edges)
+            plot.set_xlim(histogram.edges[0], histogram.edges[-1])
+            plot.set_ylim(0, max(int(histogram.counts.max()), 1) * 1.05)
+            outside += histogram.underflow + histogram.overflow
+
+        self.info_label.configure(text=f"Outside the bins: {outside}" if outside else "")
+        self.canvas.draw_idle()
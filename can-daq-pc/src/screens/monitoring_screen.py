@@ -1,40 +1,44 @@
-import copy
-
-import matplotlib
-
-matplotlib.use("TkAgg")
-
-import collections
-import queue
+import concurrent.futures
+import json
+import math
 import threading
 import time
 from logging import getLogger
+from pathlib import Path
+from tkinter import filedialog
 
 import customtkinter
-import matplotlib.animation
-import matplotlib.figure
 import numpy
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as FigureCanvas
 
+import src.analysis
 import src.database_functionality
 import src.devices
 import src.messages
+import src.pipeline
+import src.plotting
 import src.protocols
+import src.ring_buffer
+from src.screens.derived_signal_dialog import DerivedSignalDialog
+from src.screens.histogram_panel import HistogramPanel
+from src.screens.signal_selector import SignalSelector
+from src.screens.trigger_dialog import TriggerDialog
+from src.screens.spectrum_panel import SpectrumPanel
+from src.screens.ui_dispatcher import UiDispatcher
 
 logger = getLogger(__name__)
 
-PLOT_COLOURS = [
-    "#1f77b4",
-    "#ff7f0e",
-    "#2ca02c",
-    "#d62728",
-    "#9467bd",
-    "#8c564b",
-    "#e377c2",
-    "#7f7f7f",
-    "#bcbd22",
-    "#17becf",
-]
+# plot buffers are sized from the time window and the message cycle time (or this rate, if unknown)
+DEFAULT_PLOT_SAMPLE_RATE = 100  # Hz
+PLOT_BUFFER_HEADROOM = 1.5
+MAX_PLOT_BUFFER_CAPACITY = 2_000_000
+
+# statistics labels are widgets, so only the first selected signals get one
+MAX_STATISTICS_LABELS = 25
+
+# the bus table is a label, only the busiest message IDs are listed
+MAX_BUS_TABLE_ROWS = 40
+
+STATUS_POST_INTERVAL = 0.5  # s, how often the status labels and statistics are posted to the UI dispatcher
 
 
 class MonitoringScreen:
@@ -44,48 +48,109 @@ class MonitoringScreen:
                  device: src.devices.template_device.Device,
                  logging_database: src.database_functionality.LoggingDatabase,
                  timing_config: dict = None):
+        self.master = master
         self.ctk_frame = customtkinter.CTkFrame(master=master)
         self.protocol_frame = protocol_frame
         self.device = device
 
         self.monitoring = False
-        self.serial_thread = None
-        self.population_thread = None
-        self.start_time: float = None
-        self.data_queue = queue.Queue()
-        self.plot_data = {}
-        self.database_batch: list[src.protocols.template_protocol.TemplateFrame] = []
-        self.statistics_batch: list[src.protocols.template_protocol.TemplateFrame] = []
-        self.graph_data = {"timestamps": [], "values": []}
+        self.closed = False
+        self.session_epoch_us: int = None    # wall-clock time of timestamp 0, in UNIX microseconds
+        self.plot_data_version = 0  # bumped whenever the plot needs redrawing (new data, rebuilt axes)
+        self.plot_data: dict[str, src.ring_buffer.RingBuffer] = {}
         self.signal_stats = {}
-        self.signal_vars = {}
         self.logging_database = logging_database
+        self.snapshot_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.snapshot_future: concurrent.futures.Future = None
+        self.history = src.plotting.history.HistoryCache(self.logging_database.db_path, on_loaded=self.request_redraw)
 
         # Get timing values from configuration
-        self.plot_max_points = timing_config.get('plot_max_points', 1000)
+        self.plot_time_window = float(timing_config.get('plot_time_window', 10))
         self.plot_update_interval = timing_config.get('plot_update_interval', 100)
+        self.plot_max_cpu_share = timing_config.get('plot_max_cpu_share', 50) / 100
+        self.plot_backend_name = timing_config.get('plot_backend', 'Matplotlib')
         self.database_batch_size = timing_config.get('database_batch_size', 1000)
-        self.statistics_batch_size = timing_config.get('statistics_batch_size', 250)
+        self.statistics_window = float(timing_config.get('statistics_window', 10))
 
-        logger.info(f"plot_max_points: {self.plot_max_points}")
+        logger.info(f"plot_time_window: {self.plot_time_window}")
         logger.info(f"plot_update_interval: {self.plot_update_interval}")
+        logger.info(f"plot_max_cpu_share: {self.plot_max_cpu_share}")
+        logger.info(f"plot_backend: {self.plot_backend_name}")
         logger.info(f"database_batch_size: {self.database_batch_size}")
-        logger.info(f"statistics_batch_size: {self.statistics_batch_size}")
+        logger.info(f"statistics_window: {self.statistics_window}")
+        logger.info(f"durability_mode: {self.logging_database.durability_mode}")
+
+        self.statistics = src.analysis.statistics.StatisticsEngine(window=self.statistics_window)
+        self.histograms = src.analysis.histograms.HistogramEngine(window=self.statistics_window)
+
+        self.signal_cycle_times = {
+            signal.name: message.cycle_time
+            for message in self.protocol_frame.protocol.data_properties
+            for signal in message.signals
+        }
+
+        self.signals: dict[str, src.messages.Signal] = {
+            signal.name: signal
+            for message in self.protocol_frame.protocol.data_properties
+            for signal in message.signals
+        }
+
+        # Frame rates, cycle-time jitter and bus load, updated for every received frame
+        self.bus_monitor = src.analysis.bus_monitor.BusMonitor(
+            can_baud_rate=getattr(self.device.device_configuration, "can_baud_rate", None),
+            cycle_times={message.id: message.cycle_time for message in self.protocol_frame.protocol.data_properties},
+        )
+
+        # Derived signals are evaluated per batch on the fan-out thread, triggers after the plot buffers are updated
+        self.triggers = src.analysis.triggers.TriggerEngine()
+        self.derived_signals = src.analysis.derived_signals.DerivedSignalEngine(list(self.signal_cycle_times))
+
+        # Acquisition and decoding run in the pipeline, every consumer of the decoded data is one of its sinks
+        self.database_sink = src.pipeline.DatabaseSink(self.logging_database, batch_size=self.database_batch_size)
+        self.pipeline = src.pipeline.Pipeline(
+            reader=src.pipeline.ReaderStage(self.device),
+            parser=src.pipeline.ParserStage(
+                self.device,
+                observers=[lambda message: self.bus_monitor.update(message.id, message.length, message.timestamp)],
+            ),
+            decoder=src.pipeline.DecoderStage(self.protocol_frame),
+            transforms=[self.evaluate_derived_signals],
+            sinks=[
+                self.database_sink,
+                src.pipeline.StatisticsSink([self.statistics, self.histograms]),
+                src.pipeline.RingBufferSink(
+                    self.plot_data,
+                    capacity=self.plot_buffer_capacity,
+                    max_capacity=MAX_PLOT_BUFFER_CAPACITY,
+                    window_us=int(self.plot_time_window * 1_000_000),
+                    on_update=self.on_plot_data_update,
+                ),
+            ],
+        )
+
+        # Worker threads never touch widgets, they post their updates here
+        self.ui_dispatcher = UiDispatcher(self.ctk_frame)
 
         self.create_ui_elements()
-        self.create_signal_checkboxes()
+        self.ui_dispatcher.start()
 
         # Start update threads
-        self.animation = matplotlib.animation.FuncAnimation(
-            self.fig, self.animate_plot, interval=self.plot_update_interval, save_count=100
+        self.refresh_scheduler = src.plotting.scheduler.RefreshScheduler(
+            widget=self.ctk_frame,
+            render=self.animate_plot,
+            get_data_version=lambda: self.plot_data_version,
+            min_interval=self.plot_update_interval,
+            max_cpu_share=self.plot_max_cpu_share,
         )
+        self.refresh_scheduler.start()
 
-        self.graph_update_thread = threading.Thread(
-            target=self.process_data_queue, daemon=True
+        self.status_thread = threading.Thread(
+            target=self.post_status_periodically, daemon=True
         )
-        self.graph_update_thread.start()
+        self.status_thread.start()
 
         self.ctk_frame.pack(pady=20, padx=20, fill="both", expand=True)
+        self.master.protocol("WM_DELETE_WINDOW", self.close)
 
 
     def create_ui_elements(self):
@@ -128,6 +193,104 @@ class MonitoringScreen:
         )
         self.toggle_button.pack(side="left", padx=5)
 
+        self.snapshot_button = customtkinter.CTkButton(
+            master=self.control_frame,
+            text="Snapshot",
+            command=self.export_snapshot,
+        )
+        self.snapshot_button.pack(side="left", padx=5)
+
+        self.layout_menu = customtkinter.CTkOptionMenu(
+            master=self.control_frame,
+            values=src.plotting.backends.template_backend.PLOT_LAYOUTS,
+            command=self.update_axes,
+            width=140,
+        )
+        self.layout_menu.set(src.plotting.backends.template_backend.PLOT_LAYOUTS[0])
+        self.layout_menu.pack(side="left", padx=5)
+
+        self.live_button = customtkinter.CTkButton(
+            master=self.control_frame,
+            text="Live",
+            command=self.follow_live,
+            state="disabled",
+            width=60,
+        )
+        self.live_button.pack(side="left", padx=5)
+
+        self.spectrum_button = customtkinter.CTkButton(
+            master=self.control_frame,
+            text="Spectrum",
+            command=self.toggle_spectrum,
+            width=80,
+        )
+        self.spectrum_button.pack(side="left", padx=5)
+
+        self.histogram_button = customtkinter.CTkButton(
+            master=self.control_frame,
+            text="Histogram",
+            command=self.toggle_histogram,
+            width=80,
+        )
+        self.histogram_button.pack(side="left", padx=5)
+
+        self.bus_button = customtkinter.CTkButton(
+            master=self.control_frame,
+            text="Bus",
+            command=self.toggle_bus_panel,
+            width=60,
+        )
+        self.bus_button.pack(side="left", padx=5)
+
+        self.derived_button = customtkinter.CTkButton(
+            master=self.control_frame,
+            text="Derived...",
+            command=self.open_derived_signal_dialog,
+            width=80,
+        )
+        self.derived_button.pack(side="left", padx=5)
+
+        self.trigger_button = customtkinter.CTkButton(
+            master=self.control_frame,
+            text="Triggers...",
+            command=self.open_trigger_dialog,
+            width=80,
+        )
+        self.trigger_button.pack(side="left", padx=5)
+
+        self.logging_button = customtkinter.CTkButton(
+            master=self.control_frame,
+            text="Logging: On",
+            command=lambda: self.set_logging(not self.database_sink.enabled),
+            width=100,
+        )
+        self.logging_button.pack(side="left", padx=5)
+
+        self.durability_label = customtkinter.CTkLabel(
+            master=self.control_frame, text="Unsynced: 0.0 s", anchor="w"
+        )
+        self.durability_label.pack(side="left", padx=5)
+
+        self.handoff_label = customtkinter.CTkLabel(
+            master=self.control_frame, text="", anchor="w"
+        )
+        self.handoff_label.pack(side="left", padx=5)
+
+        self.render_label = customtkinter.CTkLabel(
+            master=self.control_frame, text="", anchor="w"
+        )
+        self.render_label.pack(side="left", padx=5)
+
+        self.bus_label = customtkinter.CTkLabel(
+            master=self.control_frame, text="", anchor="w"
+        )
+        self.bus_label.pack(side="left", padx=5)
+
+        self.trigger_label = customtkinter.CTkLabel(
+            master=self.control_frame, text="", anchor="w"
+        )
+        self.trigger_label.pack(side="left", padx=5)
+
         self.main_content = customtkinter.CTkFrame(master=self.ctk_frame)
         self.main_content.pack(fill="both", expand=True, padx=10, pady=5)
 
@@ -141,12 +304,13 @@ class MonitoringScreen:
         self.right_frame.pack(side="right", fill="y", padx=(5, 0), pady=5)
         self.right_frame.pack_propagate(False)
 
-        self.signals_frame = customtkinter.CTkScrollableFrame(
+        messages = self.protocol_frame.protocol.data_properties if self.protocol_frame.protocol else []
+        self.signal_selector = SignalSelector(
             master=self.right_frame,
-            label_text="Signal Selection",
-            width=180,
+            groups=[(message.name, message.id, message.signals) for message in messages],
+            on_change=self.update_axes,
         )
-        self.signals_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        self.signal_selector.ctk_frame.pack(fill="both", expand=True, padx=5, pady=5)
 
         # Add statistics frame
         self.stats_frame = customtkinter.CTkScrollableFrame(
@@ -156,114 +320,32 @@ class MonitoringScreen:
         )
         self.stats_frame.pack(fill="both", expand=True, padx=5, pady=5)
 
-        self.fig = matplotlib.figure.Figure(figsize=(5, 4), dpi=100)
-        self.plot = self.fig.add_subplot(111)
-        self.fig.subplots_adjust(right=0.65)  # Give more space for multiple y-axes
-
-        # Check if the app is in dark mode and set colors accordingly
-        if customtkinter.get_appearance_mode().lower().strip() == "dark":
-            self.fig.patch.set_facecolor('#2e2e2e')
-            self.plot.set_facecolor('#2e2e2e')
-            self.plot.tick_params(colors='white', which='both')
-            self.plot.xaxis.label.set_color('white')
-            self.plot.yaxis.label.set_color('white')
-            self.plot.title.set_color('white')
-        else:
-            self.fig.patch.set_facecolor('white')
-            self.plot.set_facecolor('white')
-            self.plot.tick_params(colors='black', which='both')
-            self.plot.xaxis.label.set_color('black')
-            self.plot.yaxis.label.set_color('black')
-            self.plot.title.set_color('black')
-
-        self.canvas = FigureCanvas(self.fig, master=self.graph_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
-
-        self.lines = {}
-        self.plot.grid(True)
-        self.plot.set_title("Signals")
-        self.plot.set_ylabel("Value")
-
-        self.axes = {}
-
-    def create_signal_checkboxes(self):
-        """Create checkboxes for all signals in protocol data"""
-        if self.protocol_frame.protocol:
-            self.select_all_button = customtkinter.CTkButton(
-                master=self.signals_frame,
-                text="Select All",
-                command=self.select_all_signals,
-                height=25,
-            )
-            self.select_all_button.pack(fill="x", padx=5, pady=2)
+        # The backend owns the plot widget, this screen only hands it the selected signals and their data
+        backend_module = src.plotting.backends.backend_details[self.plot_backend_name]["module"]
+        self.plot_backend = backend_module.PlotBackend(self.graph_frame, self.plot_time_window)
+        self.plot_backend.on_view_change = self.on_plot_view_change
+
+        # Hidden until the "Spectrum" button is pressed, and only computed while shown
+        self.spectrum_panel = SpectrumPanel(
+            self.left_frame,
+            sample_rates={
+                signal_name: 1000 / cycle_time if cycle_time else None
+                for signal_name, cycle_time in self.signal_cycle_times.items()
+            },
+        )
+        self.spectrum_visible = False
 
-            self.deselect_all_button = customtkinter.CTkButton(
-                master=self.signals_frame,
-                text="Deselect All",
-                command=self.deselect_all_signals,
-                height=25,
-            )
-            self.deselect_all_button.pack(fill="x", padx=5, pady=2)
-
-            separator = customtkinter.CTkFrame(master=self.signals_frame, height=1)
-            separator.pack(fill="x", padx=5, pady=5)
-
-            for message in self.protocol_frame.protocol.data_properties:
-                message_label = customtkinter.CTkLabel(
-                    master=self.signals_frame,
-                    text=f"Message: {message.name}",
-                    anchor="w",
-                    font=("Arial", 12, "bold"),
-                )
-                message_label.pack(anchor="w", padx=5, pady=(10, 2))
-
-                for signal in message.signals:
-                    var = customtkinter.BooleanVar(value=False)
-                    checkbox = customtkinter.CTkCheckBox(
-                        master=self.signals_frame,
-                        text=f"{signal.name} ({signal.unit})"
-                        if signal.unit
-                        else signal.name,
-                        variable=var,
-                        command=lambda s=signal.name: self.on_signal_toggle(s),
-                    )
-                    checkbox.pack(anchor="w", padx=20, pady=2)
-                    self.signal_vars[signal.name] = {
-                        "var": var,
-                        "checkbox": checkbox,
-                        "data": {"timestamps": [], "values": []},
-                        "stats": {
-                            "rms": 0.0,
-                            "mean": 0.0,
-                            "min": float("inf"),
-                            "max": float("-inf"),
-                            "p2p": 0.0,
-                            "labels": {},  # Will store the label widgets
-                        },
-                    }
-
-    def select_all_signals(self):
-        """Select all signals"""
-        for signal_data in self.signal_vars.values():
-            signal_data["var"].set(True)
-        self.update_axes()  # Update axes when checkboxes are toggled
-
-    def deselect_all_signals(self):
-        """Deselect all signals"""
-        for signal_data in self.signal_vars.values():
-            signal_data["var"].set(False)
-        self.update_axes()  # Update axes when checkboxes are toggled
-
-    def on_signal_toggle(self, signal_name):
-        """Handle signal checkbox toggle"""
-        if self.signal_vars[signal_name]["var"].get():
-            logger.debug(f"Signal enabled: {signal_name}")
-        else:
-            logger.debug(f"Signal disabled: {signal_name}")
-            self.signal_vars[signal_name]["data"]["timestamps"].clear()
-            self.signal_vars[signal_name]["data"]["values"].clear()
-        self.update_axes()  # Update axes when checkboxes are toggled
+        # Hidden until the "Histogram" button is pressed, and only binned while shown
+        self.histogram_panel = HistogramPanel(self.left_frame, self.histograms)
+        self.histogram_visible = False
+
+        # Hidden until the "Bus" button is pressed
+        self.bus_frame = customtkinter.CTkScrollableFrame(master=self.left_frame, label_text="Bus Monitor", height=200)
+        self.bus_table_label = customtkinter.CTkLabel(
+            master=self.bus_frame, text="", font=("Courier", 12), justify="left", anchor="w"
+        )
+        self.bus_table_label.pack(fill="x", padx=5, pady=5)
+        self.bus_visible = False
 
     def toggle_monitoring(self):
         if self.monitoring:
@@ -275,259 +357,438 @@ class MonitoringScreen:
         # Create statistics elements
         for widget in self.stats_frame.winfo_children():
             widget.destroy()
+        for signal_name in self.signal_stats:
+            self.ui_dispatcher.forget(("statistics", signal_name))
+        self.signal_stats = {}
 
-        for signal_name, signal_data in self.signal_vars.items():
-            if signal_data["var"].get():
-                signal_label = customtkinter.CTkLabel(
-                    master=self.stats_frame,
-                    text=f"\n{signal_name}:",
-                    font=("Arial", 12, "bold"),
-                )
-                signal_label.pack(anchor="w", padx=5)
-
-                stats_text = (
-                    f"RMS: {0:.2f}\n"
-                    f"Mean: {0:.2f}\n"
-                    f"Min: {0:.2f}\n"
-                    f"Max: {0:.2f}\n"
-                    f"Peak-to-peak: {0:.2f}"
-                )
-                stats_label = customtkinter.CTkLabel(
-                    master=self.stats_frame, text=stats_text, justify="left"
-                )
-                stats_label.pack(anchor="w", padx=20)
-
-                self.signal_stats[signal_name] = stats_label
-
-    def update_axes(self):
-        self.axes.clear()
-        self.fig.clear()
-        self.lines.clear()
-
-        self.plot = self.fig.add_subplot(1, 1, 1)
-        self.plot.grid(True)
-        self.plot.set_title("Signals")
-        self.plot.set_xlabel("Time /s")
-        self.plot.axes.get_yaxis().set_visible(False)
-        # self.plot.axes.get_xaxis().set_visible(False)
-
-        # Apply dark mode settings again
-        if customtkinter.get_appearance_mode().lower().strip() == "dark":
-            self.fig.patch.set_facecolor('#2e2e2e')
-            self.plot.set_facecolor('#2e2e2e')
-            self.plot.tick_params(colors='white', which='both')
-            self.plot.xaxis.label.set_color('white')
-            self.plot.yaxis.label.set_color('white')
-            self.plot.title.set_color('white')
-        else:
-            self.fig.patch.set_facecolor('white')
-            self.plot.set_facecolor('white')
-            self.plot.tick_params(colors='black', which='both')
-            self.plot.xaxis.label.set_color('black')
-            self.plot.yaxis.label.set_color('black')
-            self.plot.title.set_color('black')
-
-        color_index = 0  # Initialize color index
-
-        for message in self.protocol_frame.protocol.data_properties:
-            for signal in message.signals:
-                if self.signal_vars[signal.name]["var"].get():
-                    if signal.name not in self.axes:
-                        new_axis = self.plot.twinx()
-                        new_axis.set_ylabel(
-                            f"{signal.name} ({signal.unit if signal and signal.unit else ''})"
-                        )
-
-                        # Set limits for y-axis from signal min and max
-                        new_axis.set_ylim(signal.min, signal.max)
-
-                        # Assign a unique color to the y-axis
-                        color = PLOT_COLOURS[color_index % len(PLOT_COLOURS)]
-                        new_axis.spines["right"].set_color(color)
-                        new_axis.tick_params(axis="y", colors=color)
-                        new_axis.yaxis.label.set_color(color)
-                        new_axis.spines["right"].set_position(
-                            ("outward", 60 * (len(self.axes)))
-                        )
-                        new_axis.get_xaxis().set_visible(False)
-
-                        self.axes[signal.name] = new_axis
-
-                        color_index += 1  # Increment color index
-
-        if self.axes:
-            # Combine all legends
-            lines = []
-            labels = []
-            for ax in self.axes.values():
-                ax_lines, ax_labels = ax.get_legend_handles_labels()
-                lines.extend(ax_lines)
-                labels.extend(ax_labels)
-
-            self.plot.legend(lines, labels, bbox_to_anchor=(1.35, 1), loc="upper left")
-            self.plot.set_title("Signals")
-            self.plot.set_xlabel("Time /s")
+        selected_signals = self.signal_selector.get_selected_signals()
+
+        for signal in selected_signals[:MAX_STATISTICS_LABELS]:
+            signal_name = signal.name
+            signal_label = customtkinter.CTkLabel(
+                master=self.stats_frame,
+                text=f"\n{signal_name}:",
+                font=("Arial", 12, "bold"),
+            )
+            signal_label.pack(anchor="w", padx=5)
+
+            stats_label = customtkinter.CTkLabel(
+                master=self.stats_frame, text=self.format_statistics(None), justify="left"
+            )
+            stats_label.pack(anchor="w", padx=20)
+
+            self.signal_stats[signal_name] = stats_label
+
+        if len(selected_signals) > MAX_STATISTICS_LABELS:
+            more_label = customtkinter.CTkLabel(
+                master=self.stats_frame,
+                text=f"\n... and {len(selected_signals) - MAX_STATISTICS_LABELS} more signals",
+            )
+            more_label.pack(anchor="w", padx=5)
+
+    def update_axes(self, *args):
+        selected_signals = self.signal_selector.get_selected_signals()
+
+        self.plot_backend.set_signals(selected_signals, self.layout_menu.get())
+        self.spectrum_panel.set_signals(selected_signals)
+        if self.histogram_visible:
+            self.histogram_panel.set_signals(selected_signals)
 
         self.create_statistics_labels()
 
-        self.canvas.draw_idle()
+        self.plot_data_version += 1
 
-    def start_monitoring(self):
-        self.monitoring = True
+    def request_redraw(self):
+        self.plot_data_version += 1
 
-        self.population_thread = threading.Thread(
-            target=self.populate_data_buffers, daemon=True
-        )
-        self.population_thread.start()
+    def on_plot_view_change(self):
+        """Zooming or panning detaches the plot from the live data, the "Live" button re-attaches it"""
+        self.live_button.configure(state="disabled" if self.plot_backend.following else "normal")
+        self.request_redraw()
+
+    def follow_live(self):
+        self.plot_backend.follow_live()
+
+    def toggle_spectrum(self):
+        if self.spectrum_visible:
+            self.spectrum_panel.ctk_frame.pack_forget()
+        else:
+            self.spectrum_panel.ctk_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        self.spectrum_visible = not self.spectrum_visible
 
-        self.serial_thread = threading.Thread(
-            target=self.monitor_serial, daemon=True
+    def toggle_histogram(self):
+        if self.histogram_visible:
+            self.histogram_panel.ctk_frame.pack_forget()
+            self.histogram_panel.set_signals([])
+        else:
+            self.histogram_panel.set_signals(self.signal_selector.get_selected_signals())
+            self.histogram_panel.ctk_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        self.histogram_visible = not self.histogram_visible
+
+    def toggle_bus_panel(self):
+        if self.bus_visible:
+            self.bus_frame.pack_forget()
+        else:
+            self.bus_frame.pack(fill="both", expand=False, padx=5, pady=5)
+        self.bus_visible = not self.bus_visible
+
+    def open_derived_signal_dialog(self):
+        DerivedSignalDialog(self.ctk_frame, on_add=self.add_derived_signal)
+
+    def add_derived_signal(self, definition: dict) -> str | None:
+        """
+        -   compile and register a derived signal, and list it in the signal selector like any other signal
+        -   return an error message if the definition is invalid
+        """
+        try:
+            derived_signal = src.analysis.derived_signals.DerivedSignal(
+                name=definition["name"],
+                expression=definition["expression"],
+                unit=definition["unit"],
+                minimum=definition["min"],
+                maximum=definition["max"],
+                log_to_session=definition["log_to_session"],
+            )
+            self.derived_signals.add(derived_signal)
+        except src.analysis.derived_signals.DerivedSignalError as e:
+            return str(e)
+
+        # a derived signal updates as often as its fastest input
+        input_cycle_times = [self.signal_cycle_times.get(name) for name in derived_signal.inputs]
+        self.signal_cycle_times[derived_signal.name] = min(filter(None, input_cycle_times), default=None)
+
+        signal = src.messages.Signal(
+            name=derived_signal.name,
+            unit=derived_signal.unit,
+            min=derived_signal.min,
+            max=derived_signal.max,
         )
-        self.serial_thread.start()
+        self.signals[signal.name] = signal
+        self.signal_selector.add_signals("Derived", [signal])
 
-        self.status_label.configure(text="Status: Monitoring")
-        self.toggle_button.configure(text="Stop Monitoring")
+        if derived_signal.log_to_session:
+            definitions = [existing.to_dict() for existing in self.derived_signals.definitions.values()]
+            self.logging_database.set_session_info("derived_signals", json.dumps(definitions))
+
+        logger.info(f"Derived signal added: {derived_signal.name} = {derived_signal.expression}")
+        return None
+
+    def open_trigger_dialog(self):
+        TriggerDialog(self.ctk_frame, on_add=self.add_trigger)
+
+    def add_trigger(self, definition: dict) -> str | None:
+        """
+        -   register a trigger on a decoded or derived signal
+        -   the pre-trigger window is frozen from the ring buffers, so it cannot be longer than the plot time window
+        -   return an error message if the definition is invalid
+        """
+        signal = self.signals.get(definition["signal"])
 
+        if signal is None:
+            return f"Unknown signal: {definition['signal']}"
+
+        if definition["pre_trigger"] > self.plot_time_window:
+            return f"The pre-trigger window cannot exceed the plot time window ({self.plot_time_window:g} s)"
+
+        capture_signals = [selected.name for selected in self.signal_selector.get_selected_signals()] \
+            if definition["capture_selected"] else []
+
+        try:
+            trigger = src.analysis.triggers.Trigger(
+                name=definition["name"],
+                signal_name=signal.name,
+                condition=definition["condition"],
+                threshold=definition["threshold"],
+                minimum=signal.min,
+                maximum=signal.max,
+                pre_trigger=definition["pre_trigger"],
+                post_trigger=definition["post_trigger"],
+                action=definition["action"],
+                capture_signals=capture_signals,
+            )
+            self.triggers.add(trigger)
+        except ValueError as e:
+            return str(e)
 
-        if not self.start_time:
-            self.start_time = time.time()
+        logger.info(f"Trigger added: {trigger.name} ({trigger.condition} on {trigger.signal_name})")
+        return None
+
+    def set_logging(self, enabled: bool):
+        """Switch the logging of all frames, can be called from any thread"""
+        self.database_sink.enabled = enabled
+        self.ui_dispatcher.post("logging", self.logging_button, text=f"Logging: {'On' if enabled else 'Off'}")
+
+    def handle_triggers(self, columnar_chunk: dict[str, tuple[numpy.ndarray, numpy.ndarray]]):
+        """
+        -   evaluate the triggers on a chunk that is already in the ring buffers, and apply their actions
+        -   store the captures whose post-trigger window is complete
+        -   runs on the ring buffer sink thread, so the captures are stored in order, the sink queue bounds the
+            backlog and `Pipeline.stop()` flushes them
+        """
+        for trigger, tick in self.triggers.evaluate(columnar_chunk):
+            logger.info(f"Trigger {trigger.name} fired at {tick / 1e6:.3f} s")
+
+            if trigger.action == "Capture and start logging":
+                self.set_logging(True)
+            elif trigger.action == "Capture and stop logging":
+                self.set_logging(False)
+
+        for event in self.triggers.collect(self.plot_data):
+            try:
+                self.logging_database.insert_trigger_event(event)
+            except Exception as e:
+                logger.error(f"Failed to store trigger event {event['trigger']}: {e}")
+
+    def start_monitoring(self):
+        if self.session_epoch_us is None:
+            self.session_epoch_us = time.time_ns() // 1000
+            self.logging_database.set_session_epoch(self.session_epoch_us)
+
+        try:
+            self.pipeline.start()
+        except Exception as e:
+            logger.error(f"Failed to start monitoring: {e}")
+            self.status_label.configure(text=f"Status: Failed to start ({e})")
+            return
+
+        self.monitoring = True
+        self.status_label.configure(text="Status: Monitoring")
+        self.toggle_button.configure(text="Stop Monitoring")
 
     def stop_monitoring(self):
         self.monitoring = False
         self.status_label.configure(text="Status: Not Monitoring")
         self.toggle_button.configure(text="Start Monitoring")
-        self.serial_thread.join()
-        self.population_thread.join()
-        self.device.close_data_reader()
-        self.insert_batch_into_db()
-        self.data_queue.queue.clear()
+        self.pipeline.stop()
 
-    def monitor_serial(self):
-        self.device.initialize_data_reader()
+    def close(self):
+        """Stop acquisition, flush the sinks and release the worker threads before the window is destroyed"""
+        if self.monitoring:
+            self.monitoring = False
+            self.pipeline.stop()
 
-        while self.monitoring:
-            self.protocol_frame.raw_data = self.device.read_raw_data()
+        self.closed = True
+        self.history.close()
+        self.refresh_scheduler.stop()
+        self.ui_dispatcher.stop()
+        self.snapshot_executor.shutdown(wait=False)
+        self.master.destroy()
 
-            try:
-                self.protocol_frame.decoded_message = self.device.parse_raw_data(self.start_time)
-                self.protocol_frame.interpret_frame()
+    def export_snapshot(self):
+        """
+        -   export the committed data of the live session to CSV while monitoring continues
+        -   the export runs on a worker thread, reading a consistent WAL snapshot, so the writer is not stalled
+        """
+        minutes_dialog = customtkinter.CTkInputDialog(
+            text="Export the last N minutes (leave empty for the whole session):",
+            title="Snapshot",
+        )
+        minutes = minutes_dialog.get_input()
 
-            except Exception as e:
-                logger.error(f"Error interpreting frame: {e}")
+        if minutes is None:
+            return
+
+        try:
+            last_seconds = float(minutes) * 60 if minutes.strip() else None
+        except ValueError:
+            logger.warning(f"Invalid snapshot duration: {minutes}")
+            return
+
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")],
+            initialfile=f"{Path(self.logging_database.db_path).stem}_snapshot.csv",
+        )
+
+        if not output_path:
+            return
 
-            else:
-                for signal_name, signal_value in self.protocol_frame.interpreted_data.items():
-                    self.data_queue.put((signal_name, self.protocol_frame.timestamp, signal_value))
+        self.snapshot_future = self.snapshot_executor.submit(
+            self.logging_database.export_to_csv, Path(output_path), last_seconds
+        )
+        self.snapshot_button.configure(state="disabled", text="Exporting...")
+        self.ctk_frame.after(200, self.check_snapshot)
 
-                self.database_batch.append(copy.copy(self.protocol_frame))
-                self.statistics_batch.append(copy.copy(self.protocol_frame))
+    def check_snapshot(self):
+        """Poll the snapshot export from the Tk thread and restore the button once it finishes"""
+        if not self.snapshot_future.done():
+            self.ctk_frame.after(200, self.check_snapshot)
+            return
 
-    def populate_data_buffers(self):
-        while self.monitoring:
-            if len(self.database_batch) >= self.database_batch_size:
-                self.insert_batch_into_db()
+        self.snapshot_button.configure(state="normal", text="Snapshot")
 
-            if len(self.statistics_batch) >= self.statistics_batch_size:
-                threading.Thread(target=self.calculate_statistics, daemon=True).start()
+        try:
+            rows = self.snapshot_future.result()
+            logger.info(f"Snapshot exported ({rows} rows)")
+        except Exception as e:
+            logger.error(f"Failed to export snapshot: {e}")
 
-            time.sleep(0.1)
+    def evaluate_derived_signals(self, batch: src.pipeline.Batch):
+        """Pipeline transform: add the derived signals to the batch, and mark the logged ones for the database"""
+        derived_chunk = self.derived_signals.evaluate(batch.columnar)
+        if not derived_chunk:
+            return
 
-    def insert_batch_into_db(self):
-        threading.Thread(
-            target=self.logging_database.insert_frames,
-            args=(self.database_batch,),  # This is already correct, but shown for context
-            daemon=True,
-        ).start()
-        self.database_batch = []
+        batch.columnar.update(derived_chunk)
+        batch.derived_samples = {
+            signal_name: derived_samples
+            for signal_name, derived_samples in derived_chunk.items()
+            if self.derived_signals.definitions[signal_name].log_to_session
+        }
 
-    def animate_plot(self, i):
+    def on_plot_data_update(self, batch: src.pipeline.Batch):
+        """Called by the ring buffer sink after every batch"""
+        if self.triggers.triggers:
+            self.handle_triggers(batch.columnar)
+
+        self.plot_data_version += 1
+
+    def post_status(self):
+        """
+        -   post the refresh, pipeline and durability metrics and the statistics of the selected signals to the
+            UI dispatcher
+        -   runs on the status thread, every `STATUS_POST_INTERVAL`
+        """
+
+        metrics = self.refresh_scheduler.get_metrics()
+        self.ui_dispatcher.post(
+            "render",
+            self.render_label,
+            text=f"FPS: {metrics['fps']:.0f} | Draw: {metrics['draw_time_ms']:.0f} ms | Dropped: {metrics['dropped_frames']}",
+        )
+
+        if self.pipeline.fanout_queue is not None:
+            metrics = self.pipeline.get_metrics()
+            sinks = metrics["sinks"].values()
+            queue_depth = metrics["fanout_queue"]["depth"] + max((sink["queue"]["depth"] for sink in sinks), default=0)
+            latency_ms = max((sink["latency_ms"] for sink in sinks), default=0.0)
+            dropped = metrics["fanout_queue"]["dropped"] + sum(sink["queue"]["dropped"] for sink in sinks)
+            self.ui_dispatcher.post(
+                "handoff",
+                self.handoff_label,
+                text=f"Queue: {queue_depth} | Batch: {metrics['batch_size']} | Latency: {latency_ms:.0f} ms | Dropped: {dropped}",
+            )
+
+        if self.monitoring and self.pipeline.error is not None:
+            self.ui_dispatcher.post("status", self.status_label, text=f"Status: Acquisition stopped ({self.pipeline.error})")
+
+        # The data-loss window: committed-but-unsynced data plus the age of the batch not written yet
+        unsynced_window = self.logging_database.get_unsynced_window()
+
+        if unsynced_window is None:
+            durability_text = "Unsynced: unbounded (no fsync)"
+        else:
+            batch_started = self.database_sink.batch_started
+            batch_age = time.monotonic() - batch_started if batch_started is not None else 0.0
+            durability_text = f"Unsynced: {unsynced_window + batch_age:.1f} s"
+
+        if self.database_sink.frames_failed:
+            durability_text += f" | Write failed: {self.database_sink.frames_failed} frames"
+
+        self.ui_dispatcher.post("durability", self.durability_label, text=durability_text)
+
+        bus = self.bus_monitor.snapshot()
+        utilization = f"{bus['utilization']:.1f} %" if bus["utilization"] is not None else "unknown"
+        self.ui_dispatcher.post("bus", self.bus_label, text=f"Bus: {bus['frame_rate']:.0f} frames/s | Load: {utilization}")
+
+        if self.bus_visible:
+            self.ui_dispatcher.post(
+                "bus_table", self.bus_table_label, text=src.analysis.bus_monitor.format_table(bus, MAX_BUS_TABLE_ROWS)
+            )
+
+        if self.triggers.triggers:
+            events = sum(trigger.event_count for trigger in self.triggers.triggers)
+            self.ui_dispatcher.post(
+                "triggers",
+                self.trigger_label,
+                text=f"Triggers: {len(self.triggers.triggers)} | Events: {events} | Pending: {len(self.triggers.pending)}",
+            )
+
+        for signal_name, stats_label in list(self.signal_stats.items()):
+            statistics = self.statistics.get(signal_name)
+            if statistics is not None:
+                self.ui_dispatcher.post(("statistics", signal_name), stats_label, text=self.format_statistics(statistics))
+
+    def animate_plot(self):
         """
         Animation function to update the plot with new data
         """
         try:
-            # Create thread-safe copies of plot data
-            plot_data_copy = {}
-            for signal_name, signal_data in self.plot_data.items():
-                plot_data_copy[signal_name] = {
-                    "timestamps": list(signal_data["timestamps"]),
-                    "values": list(signal_data["values"])
-                }
-
-            for signal_name, signal_data in plot_data_copy.items():
-                if signal_name in self.axes:
-                    color = self.axes[signal_name].spines["right"].get_edgecolor()
-                    if signal_name not in self.lines:
-                        (self.lines[signal_name],) = self.axes[signal_name].plot(
-                            [], [], "-", label=signal_name, color=color
-                        )
-                    
-                    if signal_data["timestamps"]:
-                        self.lines[signal_name].set_data(
-                            [x - self.start_time for x in signal_data["timestamps"]],
-                            signal_data["values"]
-                        )
-
-            # Adjust x-axis limits using the copied data
-            if plot_data_copy:
-                all_timestamps = []
-                for data in plot_data_copy.values():
-                    if data["timestamps"]:
-                        all_timestamps.extend(data["timestamps"])
-                
-                if all_timestamps:
-                    min_timestamp = min(all_timestamps)
-                    max_timestamp = max(all_timestamps)
-                    self.plot.set_xlim(
-                        max(min_timestamp, max_timestamp - self.plot_max_points) - self.start_time,
-                        max_timestamp - self.start_time,
-                    )
-
-            self.canvas.draw_idle()
+            # Zero-copy views of the ring buffers, timestamps in microseconds since the session epoch
+            signal_data = {}
+            for signal_name, ring_buffer in list(self.plot_data.items()):
+                signal_data[signal_name] = ring_buffer.latest()
+
+            if not self.plot_backend.following:
+                self.add_history(signal_data)
+
+            self.plot_backend.render({
+                signal_name: (timestamps * 1e-6, values)
+                for signal_name, (timestamps, values) in signal_data.items()
+            })
+
+            if self.spectrum_visible:
+                self.spectrum_panel.refresh(self.plot_data)
+
+            if self.histogram_visible:
+                self.histogram_panel.refresh()
         except Exception as e:
             logger.error(f"Error in animate_plot: {e}")
 
-    def calculate_statistics(self):
-        signal_data_map = {signal.name: [] for message in self.protocol_frame.protocol.data_properties for signal in message.signals}
-
-        for frame in self.statistics_batch:
-            for signal_name, signal_value in frame.interpreted_data.items():
-                if signal_name in signal_data_map:
-                    signal_data_map[signal_name].append(signal_value)
-
-        for signal_name, values in signal_data_map.items():
-            if values and self.signal_vars[signal_name]["var"].get():  # Check if signal is selected
-                values = numpy.array(values)
-                mean = numpy.mean(values)
-                rms = numpy.sqrt(numpy.mean(values**2))
-                min_val = numpy.min(values)
-                max_val = numpy.max(values)
-                ptp = numpy.ptp(values)
-
-                stats_text = (
-                    f"RMS: {rms:.2f}\n"
-                    f"Mean: {mean:.2f}\n"
-                    f"Min: {min_val:.2f}\n"
-                    f"Max: {max_val:.2f}\n"
-                    f"Peak-to-peak: {ptp:.2f}"
-                )
-                self.signal_stats[signal_name].configure(text=stats_text)
-
-        self.statistics_batch = []
-
-    def process_data_queue(self):
-        while True:
+    def add_history(self, signal_data: dict[str, tuple[numpy.ndarray, numpy.ndarray]]):
+        """
+        -   extend the ring buffer data of the selected signals with older data from the session database, for
+            the part of the zoomed/panned view that lies before the ring buffer
+        -   the history arrives asynchronously, the plot is redrawn when it does
+        """
+        left, right = self.plot_backend.view_limits
+        tick0, tick1 = int(left * 1e6), int(right * 1e6)
+        columns = self.plot_backend.get_plot_width()
+
+        for signal in self.plot_backend.signals:
+            live_ticks, live_values = signal_data.get(
+                signal.name, (numpy.empty(0, dtype=numpy.int64), numpy.empty(0, dtype=numpy.float64))
+            )
+            live_start = int(live_ticks[0]) if len(live_ticks) else tick1 + 1
+
+            if tick0 >= live_start:
+                continue
+
+            # data older than the ring buffer has been written to the database already (or is about to be)
+            history_ticks, history_values = self.history.get(
+                signal.name, tick0, min(tick1, live_start), columns, complete_until=live_start
+            )
+            older = history_ticks < live_start
+
+            signal_data[signal.name] = (
+                numpy.concatenate((history_ticks[older], live_ticks)),
+                numpy.concatenate((history_values[older], live_values)),
+            )
+
+    def format_statistics(self, statistics: dict[str, dict[str, float]] | None) -> str:
+        """Statistics of one signal as label text: the sliding window | the whole session"""
+        if statistics is None:
+            statistics = {"window": {}, "session": {}}
+
+        window, session = statistics["window"], statistics["session"]
+        lines = [f"Last {self.statistics_window:g} s | Session"]
+
+        for key, name in (("rms", "RMS"), ("mean", "Mean"), ("min", "Min"), ("max", "Max"), ("ptp", "Peak-to-peak")):
+            lines.append(f"{name}: {window.get(key, 0):.2f} | {session.get(key, 0):.2f}")
+
+        return "\n".join(lines)
+
+    def plot_buffer_capacity(self, signal_name: str) -> int:
+        """Number of samples needed to cover the plot time window, from the DBC cycle time of the signal's message"""
+        cycle_time = self.signal_cycle_times.get(signal_name)
+        sample_rate = 1000 / cycle_time if cycle_time else DEFAULT_PLOT_SAMPLE_RATE
+        capacity = math.ceil(self.plot_time_window * sample_rate * PLOT_BUFFER_HEADROOM)
+        return max(16, min(capacity, MAX_PLOT_BUFFER_CAPACITY))
+
+    def post_status_periodically(self):
+        while not self.closed:
+            time.sleep(STATUS_POST_INTERVAL)
             try:
-                signal_name, timestamp, value = self.data_queue.get(timeout=0.1)
-                if signal_name not in self.plot_data:
-                    self.plot_data[signal_name] = {
-                        "timestamps": collections.deque(maxlen=self.plot_max_points),
-                        "values": collections.deque(maxlen=self.plot_max_points),
-                    }
-
-                self.plot_data[signal_name]["timestamps"].append(timestamp)
-                self.plot_data[signal_name]["values"].append(value)
-
-            except queue.Empty:
-                pass
+                self.post_status()
             except Exception as e:
-                logger.error(f"Error processing data queue: {e}")
\ No newline at end of file
+                logger.error(f"Error posting status: {e}")
@@ -11,8 +11,10 @@ from tkinter import filedialog
 
 import customtkinter
 
+import src.database_functionality
 import src.devices
 import src.messages
+import src.plotting
 import src.protocols
 
 logger = getLogger(__name__)
@@ -254,10 +256,14 @@ class ProtocolConfigScreen:
 
         if not hasattr(self, 'timing_config'):
             self.timing_config = {
-                'plot_max_points': 1000,
+                'plot_time_window': 10,
                 'plot_update_interval': 100,
+                'plot_max_cpu_share': 50,
+                'plot_backend': src.plotting.backends.DEFAULT_PLOT_BACKEND,
                 'database_batch_size': 1000,
-                'statistics_batch_size': 250
+                'statistics_window': 10,
+                'durability_mode': src.database_functionality.DEFAULT_DURABILITY_MODE,
+                'durability_interval': src.database_functionality.DEFAULT_DURABILITY_INTERVAL,
             }
 
         self.protocol_frame_instance: src.protocols.template_protocol.TemplateFrame = self.protocol_module.Frame()
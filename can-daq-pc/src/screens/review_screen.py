@@ -0,0 +1,234 @@
+"""
+Session Review Screen
+-   open a finished session read-only and plot any of its signals over the whole recording
+-   zoom (mouse wheel) and pan (drag) through the session, "Full Range" shows everything again
+-   only the visible range is loaded: per-bucket min/max rollups when zoomed out, raw samples when zoomed in
+-   the session is only read; sessions recorded without rollups are decimated on the fly, and get rollups only
+    if the user agrees
+"""
+
+import threading
+from datetime import datetime
+from logging import getLogger
+from pathlib import Path
+from tkinter import messagebox
+
+import customtkinter
+
+import src.database_functionality
+import src.messages
+import src.plotting
+from src.screens.signal_selector import SignalSelector
+
+logger = getLogger(__name__)
+
+REVIEW_UPDATE_INTERVAL = 50     # ms, the plot only redraws when the view or the loaded data changed
+
+
+class ReviewScreen:
+    def __init__(
+        self,
+        master: customtkinter.CTk,
+        db_path: Path,
+        plot_backend: str = src.plotting.backends.DEFAULT_PLOT_BACKEND,
+    ):
+        self.db_path = Path(db_path)
+        self.plot_backend_name = plot_backend
+
+        self.reader: src.database_functionality.SessionReader = None
+        self.history: src.plotting.history.HistoryCache = None
+        self.refresh_scheduler: src.plotting.scheduler.RefreshScheduler = None
+        self.signals: dict[str, src.messages.Signal] = {}
+        self.origin_ticks = 0   # first timestamp of the session, shown as time 0
+        self.duration = 0.0     # s
+        self.data_version = 0
+
+        self.window = customtkinter.CTkToplevel(master)
+        self.window.title(f"Review: {self.db_path.stem}")
+        self.window.geometry("1000x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.create_ui_elements()
+        self.prepare_session()
+
+    def create_ui_elements(self):
+        self.control_frame = customtkinter.CTkFrame(master=self.window)
+        self.control_frame.pack(fill="x", padx=10, pady=5)
+
+        self.layout_menu = customtkinter.CTkOptionMenu(
+            master=self.control_frame,
+            values=src.plotting.backends.template_backend.PLOT_LAYOUTS,
+            command=self.update_axes,
+            width=140,
+        )
+        self.layout_menu.set(src.plotting.backends.template_backend.PLOT_LAYOUTS[0])
+        self.layout_menu.pack(side="left", padx=5)
+
+        self.full_range_button = customtkinter.CTkButton(
+            master=self.control_frame,
+            text="Full Range",
+            command=self.show_full_range,
+            width=100,
+        )
+        self.full_range_button.pack(side="left", padx=5)
+
+        # Only shown for sessions recorded without rollups
+        self.summarize_button = customtkinter.CTkButton(
+            master=self.control_frame,
+            text="Summarize...",
+            command=self.summarize_session,
+            width=100,
+        )
+
+        self.status_label = customtkinter.CTkLabel(
+            master=self.control_frame, text="Opening session...", anchor="w"
+        )
+        self.status_label.pack(side="left", padx=5)
+
+        self.main_content = customtkinter.CTkFrame(master=self.window)
+        self.main_content.pack(fill="both", expand=True, padx=10, pady=5)
+
+        self.graph_frame = customtkinter.CTkFrame(master=self.main_content)
+        self.graph_frame.pack(side="left", fill="both", expand=True, padx=(0, 5), pady=5)
+
+        self.right_frame = customtkinter.CTkFrame(master=self.main_content, width=220)
+        self.right_frame.pack(side="right", fill="y", padx=(5, 0), pady=5)
+        self.right_frame.pack_propagate(False)
+
+        backend_module = src.plotting.backends.backend_details[self.plot_backend_name]["module"]
+        self.plot_backend = backend_module.PlotBackend(self.graph_frame, 1.0)
+        self.plot_backend.on_view_change = self.request_redraw
+
+    def prepare_session(self):
+        """
+        -   read the time range, the signal ranges and whether the session has rollups on a worker thread, these
+            scan the whole session if it has no rollups
+        -   the session is opened read-only, it is never migrated or converted
+        """
+
+        def read_summary():
+            try:
+                with src.database_functionality.SessionReader(self.db_path) as reader:
+                    summary = (reader.get_time_range(), reader.get_signal_ranges(), reader.has_rollups())
+            except Exception as e:
+                logger.error(f"Failed to open session {self.db_path}: {e}")
+                self.window.after(0, lambda: self.status_label.configure(text=f"Failed to open session: {e}"))
+                return
+
+            self.window.after(0, lambda: self.open_session(*summary))
+
+        threading.Thread(target=read_summary, daemon=True).start()
+
+    def open_session(self, time_range: tuple[int, int] | None, signal_ranges: dict[str, tuple[float, float]], has_rollups: bool):
+        if time_range is None:
+            self.status_label.configure(text="Session is empty")
+            return
+
+        self.reader = src.database_functionality.SessionReader(self.db_path)
+        self.origin_ticks, last_ticks = time_range
+        self.duration = max((last_ticks - self.origin_ticks) / 1e6, src.plotting.backends.template_backend.MIN_VIEW_SPAN)
+
+        for name, (minimum, maximum) in signal_ranges.items():
+            self.signals[name] = src.messages.Signal(name=name, unit="", min=minimum, max=maximum)
+
+        self.signal_selector = SignalSelector(
+            master=self.right_frame,
+            groups=[("Signals", None, list(self.signals.values()))],
+            on_change=self.update_axes,
+        )
+        self.signal_selector.ctk_frame.pack(fill="both", expand=True)
+
+        started = datetime.fromtimestamp(self.reader.to_seconds(self.origin_ticks))
+        self.session_text = f"Recorded {started:%Y-%m-%d %H:%M:%S}, {self.duration:.1f} s"
+        self.status_label.configure(text=self.session_text)
+
+        if not has_rollups:
+            # zoomed-out views are decimated from the raw samples until the session is summarized
+            self.summarize_button.pack(side="left", padx=5, before=self.status_label)
+
+        self.history = src.plotting.history.HistoryCache(self.db_path, on_loaded=self.request_redraw)
+        self.refresh_scheduler = src.plotting.scheduler.RefreshScheduler(
+            widget=self.window,
+            render=self.render,
+            get_data_version=lambda: self.data_version,
+            min_interval=REVIEW_UPDATE_INTERVAL,
+        )
+        self.refresh_scheduler.start()
+
+        self.show_full_range()
+
+    def summarize_session(self):
+        """
+        -   after the user agreed, compute the rollups of a session recorded without them, in the background
+        -   only a summary table is added to the session file, the recorded signals are never modified
+        """
+        agreed = messagebox.askyesno(
+            "Summarize session",
+            "Add min/max summaries to this session file for faster zoomed-out browsing?\n\n"
+            "The recorded data is not modified. This can take a while for long sessions.",
+            parent=self.window,
+        )
+
+        if not agreed:
+            return
+
+        self.summarize_button.configure(state="disabled", text="Summarizing...")
+
+        def build():
+            try:
+                src.database_functionality.build_rollups(self.db_path)
+            except Exception as e:
+                logger.error(f"Failed to build rollups for {self.db_path}: {e}")
+                self.window.after(0, lambda: self.summarize_button.configure(state="normal", text="Summarize..."))
+                return
+
+            self.window.after(0, self.summarize_button.pack_forget)
+
+        threading.Thread(target=build, daemon=True).start()
+
+    def update_axes(self, *args):
+        if not hasattr(self, "signal_selector"):
+            return  # layout changed before the session was opened
+        self.plot_backend.set_signals(self.signal_selector.get_selected_signals(), self.layout_menu.get())
+        self.request_redraw()
+
+    def show_full_range(self):
+        self.plot_backend.set_view(0.0, self.duration)
+
+    def request_redraw(self):
+        self.data_version += 1
+
+    def render(self):
+        """
+        draw the selected signals over the visible range, from whatever the history cache holds so far
+        """
+        if self.history is None or self.plot_backend.view_limits is None:
+            return
+
+        try:
+            left, right = self.plot_backend.view_limits
+            tick0 = self.origin_ticks + int(left * 1e6)
+            tick1 = self.origin_ticks + int(right * 1e6)
+            columns = self.plot_backend.get_plot_width()
+
+            signal_data = {}
+            for signal in self.plot_backend.signals:
+                ticks, values = self.history.get(signal.name, tick0, tick1, columns)
+                signal_data[signal.name] = ((ticks - self.origin_ticks) * 1e-6, values)
+
+            self.plot_backend.render(signal_data)
+
+            level = src.plotting.history.choose_level(tick0, tick1, columns)
+            detail = "raw samples" if level is None else f"{(1 << level) / 1e6:g} s min/max buckets"
+            self.status_label.configure(text=f"{self.session_text} | showing {right - left:.1f} s, {detail}")
+        except Exception as e:
+            logger.error(f"Error in review render: {e}")
+
+    def close(self):
+        if self.refresh_scheduler is not None:
+            self.refresh_scheduler.stop()
+        if self.history is not None:
+            self.history.close()
+        if self.reader is not None:
+            self.reader.close()
+        self.window.destroy()
@@ -2,9 +2,12 @@
 Session Management Screen
 -   create new logging sessions
 -   search and export existing sessions
+-   open existing sessions for review
+-   batch export many sessions in parallel
 """
 
 import logging
+import threading
 from datetime import datetime
 from pathlib import Path
 from tkinter import filedialog
@@ -12,12 +15,12 @@ from tkinter import filedialog
 import customtkinter
 from tkcalendar import DateEntry
 
-from src.database_functionality import LoggingDatabase
+from src.database_functionality import SCHEMA_PATH, export_session_worker, export_sessions, format_export_summary
+from src.screens.review_screen import ReviewScreen
+from src.screens.ui_dispatcher import UiDispatcher
 
 logger = logging.getLogger(__name__)
 
-SCHEMA_PATH = Path("src/schema.sql")
-
 class SessionManagementScreen:
     def __init__(self, master: customtkinter.CTk, data_folder_path: Path, schema_path: Path = SCHEMA_PATH):
         self.data_folder_path = data_folder_path
@@ -26,6 +29,8 @@ class SessionManagementScreen:
         self.filtered_sessions = []  # Store filtered session list
         
         self.master = master
+        self.ui_dispatcher = UiDispatcher(master)
+        self.ui_dispatcher.start()
         self.ctk_frame = customtkinter.CTkFrame(master=master)
         self.ctk_frame.pack(pady=20, padx=20, fill="both", expand=True)
         
@@ -181,6 +186,7 @@ class SessionManagementScreen:
         # Track currently selected session and label
         self.selected_session = None
         self.selected_label = None
+        self.selected_sessions = {}     # session name -> label, for Ctrl+click multi-selection
         
         # Buttons
         button_frame = customtkinter.CTkFrame(self.load_session_frame)
@@ -193,6 +199,20 @@ class SessionManagementScreen:
         )
         export_btn.pack(side="left", padx=5)
         
+        review_btn = customtkinter.CTkButton(
+            button_frame,
+            text="Review Selected",
+            command=self.review_session
+        )
+        review_btn.pack(side="left", padx=5)
+        
+        select_all_btn = customtkinter.CTkButton(
+            button_frame,
+            text="Select All",
+            command=self.select_all_sessions
+        )
+        select_all_btn.pack(side="left", padx=5)
+        
         back_btn = customtkinter.CTkButton(
             button_frame,
             text="Back",
@@ -200,6 +220,14 @@ class SessionManagementScreen:
         )
         back_btn.pack(side="left", padx=5)
         
+        # Batch export progress
+        self.export_progress_label = customtkinter.CTkLabel(
+            self.load_session_frame,
+            text="Ctrl+click to select several sessions for a batch export",
+            wraplength=500
+        )
+        self.export_progress_label.pack(fill="x", padx=10, pady=(0, 10))
+        
         # Populate session list
         self.refresh_session_list()
         
@@ -208,13 +236,36 @@ class SessionManagementScreen:
 
     def handle_session_click(self, label, session_name):
         # Unhighlight previous selection
-        if self.selected_label:
-            self.selected_label.configure(fg_color="transparent")
+        for selected_label in self.selected_sessions.values():
+            selected_label.configure(fg_color="transparent")
         
         # Highlight new selection
         label.configure(fg_color="#1f538d")  # Dark blue color
         self.selected_label = label
         self.selected_session = session_name
+        self.selected_sessions = {session_name: label}
+
+    def handle_session_ctrl_click(self, label, session_name):
+        """Add or remove a session from the multi-selection"""
+        if session_name in self.selected_sessions:
+            label.configure(fg_color="transparent")
+            del self.selected_sessions[session_name]
+        else:
+            label.configure(fg_color="#1f538d")  # Dark blue color
+            self.selected_sessions[session_name] = label
+
+        self.selected_session = next(iter(self.selected_sessions), None)
+        self.selected_label = self.selected_sessions.get(self.selected_session)
+
+    def select_all_sessions(self):
+        """Select every session currently listed"""
+        for label in self.session_frame.winfo_children():
+            session_name = label.cget("text")
+            label.configure(fg_color="#1f538d")  # Dark blue color
+            self.selected_sessions[session_name] = label
+
+        self.selected_session = next(iter(self.selected_sessions), None)
+        self.selected_label = self.selected_sessions.get(self.selected_session)
 
     def update_filename_preview(self, event=None):
         name = self.session_name.get()
@@ -230,6 +281,7 @@ class SessionManagementScreen:
         if name:
             timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
             self.session_filename = self.data_folder_path / f"{name}_{timestamp}.db"
+            self.ui_dispatcher.stop()
             self.master.destroy()
 
     def refresh_session_list(self):
@@ -240,6 +292,7 @@ class SessionManagementScreen:
         
         self.selected_session = None
         self.selected_label = None
+        self.selected_sessions = {}
         
         self.filtered_sessions = sorted(
             [f for f in self.data_folder_path.glob("*.db")],
@@ -258,6 +311,7 @@ class SessionManagementScreen:
             )
             label.pack(fill="x", pady=2)
             label.bind("<Button-1>", lambda e, l=label, n=db_file.name: self.handle_session_click(l, n))
+            label.bind("<Control-Button-1>", lambda e, l=label, n=db_file.name: self.handle_session_ctrl_click(l, n))
 
     def filter_sessions(self, event=None):
         """Filter sessions based on name search and date"""
@@ -270,6 +324,7 @@ class SessionManagementScreen:
         
         self.selected_session = None
         self.selected_label = None
+        self.selected_sessions = {}
         self.filtered_sessions = []
         
         for db_file in self.data_folder_path.glob("*.db"):
@@ -293,12 +348,17 @@ class SessionManagementScreen:
             )
             label.pack(fill="x", pady=2)
             label.bind("<Button-1>", lambda e, l=label, n=db_file.name: self.handle_session_click(l, n))
+            label.bind("<Control-Button-1>", lambda e, l=label, n=db_file.name: self.handle_session_ctrl_click(l, n))
 
     def export_session(self):
         try:
             if not self.selected_session:
                 logger.warning("No session selected for export")
                 return
+
+            if len(self.selected_sessions) > 1:
+                self.export_sessions_batch()
+                return
                 
             db_path = self.data_folder_path / self.selected_session
             
@@ -309,9 +369,55 @@ class SessionManagementScreen:
             )
             
             if output_path:
-                db = LoggingDatabase(db_path=db_path, schema_path=self.schema_path)
-                db.export_to_csv(Path(output_path))
+                export_session_worker(db_path, Path(output_path))
                 logger.info(f"Successfully exported {db_path.name} to {output_path}")
         
         except Exception as e:
-            logger.error(f"Failed to export session: {e}")
\ No newline at end of file
+            logger.error(f"Failed to export session: {e}")
+
+    def review_session(self):
+        """Open the selected session in a review window, the session stays read-only"""
+        if not self.selected_session:
+            logger.warning("No session selected for review")
+            return
+
+        try:
+            ReviewScreen(self.master, self.data_folder_path / self.selected_session)
+        except Exception as e:
+            logger.error(f"Failed to open session for review: {e}")
+
+    def export_sessions_batch(self):
+        """
+        -   export all selected sessions into a chosen folder, in parallel across the CPU cores
+        -   the process pool is driven from a background thread, progress is posted to the UI dispatcher
+        """
+        output_folder = filedialog.askdirectory(title="Choose a folder for the exported sessions")
+
+        if not output_folder:
+            return
+
+        db_paths = [self.data_folder_path / session_name for session_name in self.selected_sessions]
+        self.export_progress_label.configure(text=f"Exporting {len(db_paths)} sessions...")
+
+        def post_progress(text: str):
+            self.ui_dispatcher.post("export_progress", self.export_progress_label, text=text)
+
+        def report_progress(completed: int, total: int, result: dict):
+            status = "failed" if "error" in result else "done"
+            post_progress(f"[{completed}/{total}] {result['session']}: {status}")
+
+        def run_export():
+            try:
+                summary = export_sessions(
+                    db_paths,
+                    Path(output_folder),
+                    progress_callback=report_progress,
+                )
+                summary_text = format_export_summary(summary)
+                logger.info(summary_text)
+                post_progress(summary_text)
+            except Exception as e:
+                logger.error(f"Failed to export sessions: {e}")
+                post_progress(f"Batch export failed: {e}")
+
+        threading.Thread(target=run_export, daemon=True).start()
@@ -0,0 +1,283 @@
+"""
+Signal Selector
+-   searchable list of all signals, grouped by message, for choosing what is plotted
+-   virtualized: only the rows in view are drawn, as plain canvas items, so a DBC with thousands of signals
+    opens instantly and scrolls smoothly
+-   incremental search by name, message, ID or unit, with bulk selection of the matching signals
+"""
+
+import tkinter
+from typing import Callable
+
+import customtkinter
+
+import src.messages
+
+ROW_HEIGHT = 22         # px
+SCROLL_ROWS = 3         # rows per mouse wheel step
+SEARCH_DELAY = 150      # ms, the filter is applied once typing pauses
+SEARCH_FIELDS = ["Any", "Name", "Message", "ID", "Unit"]
+
+
+class SignalSelector:
+    """
+    Signal Selector class
+    -   `groups` is a list of `(group name, group ID or None, signals)`, e.g. one group per message
+    -   `on_change()` is called once per user action (a click or a bulk selection), never per signal
+    -   pack or grid `ctk_frame` to place the selector
+    """
+
+    def __init__(
+        self,
+        master: customtkinter.CTkFrame,
+        groups: list[tuple[str, int | None, list[src.messages.Signal]]],
+        on_change: Callable[[], None],
+        title: str = "Signal Selection",
+    ):
+        self.on_change = on_change
+        self.selected: set[str] = set()
+        self.offset = 0     # scroll position in px
+        self.filter_after_id = None
+
+        # Every signal with its lowercase search keys, in DBC order
+        self.entries = []
+        for group_name, group_id, signals in groups:
+            self.entries.extend(self.create_entries(group_name, group_id, signals))
+        self.rows = []  # filtered rows: ("group", name) or ("signal", signal)
+
+        self.create_ui_elements(master, title)
+        self.apply_filter()
+
+    def create_ui_elements(self, master: customtkinter.CTkFrame, title: str):
+        self.ctk_frame = customtkinter.CTkFrame(master=master)
+
+        title_label = customtkinter.CTkLabel(
+            master=self.ctk_frame,
+            text=title,
+            font=("Arial", 12, "bold"),
+        )
+        title_label.pack(fill="x", padx=5, pady=(5, 2))
+
+        self.search_entry = customtkinter.CTkEntry(
+            master=self.ctk_frame,
+            placeholder_text="Search signals...",
+        )
+        self.search_entry.pack(fill="x", padx=5, pady=2)
+        self.search_entry.bind("<KeyRelease>", self.schedule_filter)
+
+        self.field_menu = customtkinter.CTkOptionMenu(
+            master=self.ctk_frame,
+            values=SEARCH_FIELDS,
+            command=lambda _: self.apply_filter(),
+            height=25,
+        )
+        self.field_menu.set(SEARCH_FIELDS[0])
+        self.field_menu.pack(fill="x", padx=5, pady=2)
+
+        button_frame = customtkinter.CTkFrame(master=self.ctk_frame, fg_color="transparent")
+        button_frame.pack(fill="x", padx=5, pady=2)
+
+        select_button = customtkinter.CTkButton(
+            master=button_frame,
+            text="Select Shown",
+            command=self.select_shown,
+            height=25,
+            width=80,
+        )
+        select_button.pack(side="left", fill="x", expand=True, padx=(0, 2))
+
+        deselect_button = customtkinter.CTkButton(
+            master=button_frame,
+            text="Deselect All",
+            command=self.deselect_all,
+            height=25,
+            width=80,
+        )
+        deselect_button.pack(side="left", fill="x", expand=True, padx=(2, 0))
+
+        self.count_label = customtkinter.CTkLabel(master=self.ctk_frame, text="", anchor="w")
+        self.count_label.pack(fill="x", padx=5)
+
+        list_frame = customtkinter.CTkFrame(master=self.ctk_frame, fg_color="transparent")
+        list_frame.pack(fill="both", expand=True, padx=5, pady=(2, 5))
+
+        self.scrollbar = customtkinter.CTkScrollbar(master=list_frame, command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.colour_scheme = self.get_colour_scheme()
+        self.canvas = tkinter.Canvas(
+            list_frame,
+            background=self.colour_scheme["background"],
+            highlightthickness=0,
+            width=150,
+        )
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<MouseWheel>", self.on_scroll)
+        self.canvas.bind("<Button-4>", self.on_scroll)  # mouse wheel on X11
+        self.canvas.bind("<Button-5>", self.on_scroll)
+
+    def get_colour_scheme(self) -> dict[str, str]:
+        if customtkinter.get_appearance_mode().lower().strip() == "dark":
+            return {"background": "#2b2b2b", "foreground": "#dce4ee", "muted": "#9a9a9a", "accent": "#1f6aa5"}
+        return {"background": "#dbdbdb", "foreground": "#1a1a1a", "muted": "#5a5a5a", "accent": "#3b8ed0"}
+
+    def create_entries(self, group_name: str, group_id: int | None, signals: list[src.messages.Signal]) -> list[dict]:
+        id_keys = f"0x{group_id:x} {group_id}" if group_id is not None else ""
+        return [
+            {
+                "signal": signal,
+                "group": group_name,
+                "keys": {
+                    "Name": signal.name.lower(),
+                    "Message": group_name.lower(),
+                    "ID": id_keys,
+                    "Unit": (signal.unit or "").lower(),
+                },
+            }
+            for signal in signals
+        ]
+
+    def add_signals(self, group_name: str, signals: list[src.messages.Signal], group_id: int | None = None):
+        """Append signals to a group, e.g. signals defined while monitoring, the group is created if it is new"""
+        new_entries = self.create_entries(group_name, group_id, signals)
+        last_index = max((index for index, entry in enumerate(self.entries) if entry["group"] == group_name), default=None)
+
+        if last_index is None:
+            self.entries.extend(new_entries)
+        else:
+            self.entries[last_index + 1:last_index + 1] = new_entries
+
+        self.apply_filter()
+
+    def get_selected_signals(self) -> list[src.messages.Signal]:
+        """return the selected signals in DBC order"""
+        return [entry["signal"] for entry in self.entries if entry["signal"].name in self.selected]
+
+    def schedule_filter(self, event=None):
+        if self.filter_after_id is not None:
+            self.ctk_frame.after_cancel(self.filter_after_id)
+        self.filter_after_id = self.ctk_frame.after(SEARCH_DELAY, self.apply_filter)
+
+    def apply_filter(self):
+        """
+        -   keep the signals matching every word of the search text, in the chosen field (or any field)
+        -   a group header is shown if at least one of its signals matches
+        """
+        self.filter_after_id = None
+        terms = self.search_entry.get().lower().split()
+        field = self.field_menu.get()
+
+        self.rows = []
+        current_group = None
+
+        for entry in self.entries:
+            keys = entry["keys"]
+            text = " ".join(keys.values()) if field == "Any" else keys[field]
+
+            if not all(term in text for term in terms):
+                continue
+
+            if entry["group"] != current_group:
+                current_group = entry["group"]
+                self.rows.append(("group", current_group))
+
+            self.rows.append(("signal", entry["signal"]))
+
+        self.shown_count = sum(1 for kind, _ in self.rows if kind == "signal")
+        self.offset = 0
+        self.redraw()
+
+    def shown_signal_names(self) -> list[str]:
+        return [item.name for kind, item in self.rows if kind == "signal"]
+
+    def select_shown(self):
+        self.selected.update(self.shown_signal_names())
+        self.redraw()
+        self.on_change()
+
+    def deselect_all(self):
+        self.selected.clear()
+        self.redraw()
+        self.on_change()
+
+    def on_click(self, event):
+        """A signal row toggles that signal, a group header toggles all shown signals of the group"""
+        index = int((event.y + self.offset) // ROW_HEIGHT)
+
+        if not 0 <= index < len(self.rows):
+            return
+
+        kind, item = self.rows[index]
+
+        if kind == "signal":
+            self.selected.symmetric_difference_update({item.name})
+        else:
+            group_names = []
+            for row_kind, row_item in self.rows[index + 1:]:
+                if row_kind == "group":
+                    break
+                group_names.append(row_item.name)
+
+            if all(name in self.selected for name in group_names):
+                self.selected.difference_update(group_names)
+            else:
+                self.selected.update(group_names)
+
+        self.redraw()
+        self.on_change()
+
+    def on_scroll(self, event):
+        direction = -1 if event.num == 4 or getattr(event, "delta", 0) > 0 else 1
+        self.scroll_to(self.offset + direction * SCROLL_ROWS * ROW_HEIGHT)
+
+    def yview(self, *args):
+        """Scrollbar protocol: ("moveto", fraction) or ("scroll", count, "units" | "pages")"""
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * len(self.rows) * ROW_HEIGHT)
+        elif args[0] == "scroll":
+            step = self.canvas.winfo_height() if args[2] == "pages" else ROW_HEIGHT
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def scroll_to(self, offset: float):
+        max_offset = max(len(self.rows) * ROW_HEIGHT - self.canvas.winfo_height(), 0)
+        self.offset = min(max(offset, 0), max_offset)
+        self.redraw()
+
+    def redraw(self):
+        """Draw only the rows in view, and update the scrollbar and the counter"""
+        self.canvas.delete("row")
+
+        height = max(self.canvas.winfo_height(), 1)
+        total_height = max(len(self.rows) * ROW_HEIGHT, 1)
+        first = int(self.offset // ROW_HEIGHT)
+        last = min(first + height // ROW_HEIGHT + 2, len(self.rows))
+
+        foreground = self.colour_scheme["foreground"]
+
+        for index in range(first, last):
+            kind, item = self.rows[index]
+            top = index * ROW_HEIGHT - self.offset
+            centre = top + ROW_HEIGHT / 2
+
+            if kind == "group":
+                self.canvas.create_text(4, centre, anchor="w", text=item, fill=self.colour_scheme["muted"],
+                                        font=("Arial", 11, "bold"), tags="row")
+                continue
+
+            selected = item.name in self.selected
+            self.canvas.create_rectangle(
+                14, centre - 6, 26, centre + 6,
+                outline=foreground, fill=self.colour_scheme["accent"] if selected else "", tags="row",
+            )
+            self.canvas.create_text(
+                32, centre, anchor="w", fill=foreground, font=("Arial", 11), tags="row",
+                text=f"{item.name} ({item.unit})" if item.unit else item.name,
+            )
+
+        self.scrollbar.set(self.offset / total_height, min((self.offset + height) / total_height, 1.0))
+
+        self.count_label.configure(
+            text=f"{len(self.selected)} selected, {self.shown_count} of {len(self.entries)} shown"
+        )
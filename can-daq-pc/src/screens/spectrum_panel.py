@@ -0,0 +1,149 @@
+"""
+Spectrum Panel
+-   live power spectral density (Welch) of the selected signals, computed from the in-memory ring buffers
+-   shown below the time plot of the monitoring screen, and only computed while it is shown
+"""
+
+from logging import getLogger
+
+import customtkinter
+import matplotlib.figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as FigureCanvas
+
+import src.analysis
+import src.messages
+import src.ring_buffer
+from src.plotting.backends import template_backend
+
+logger = getLogger(__name__)
+
+MAX_SPECTRUM_SIGNALS = 8
+SEGMENT_LENGTHS = ["256", "512", "1024", "2048", "4096"]
+
+
+class SpectrumPanel:
+    """
+    Spectrum Panel class
+    -   one `WelchSpectrum` per signal, fed with the samples that arrived since the previous refresh
+    -   the sample rate comes from the DBC cycle time of the signal's message, or is estimated from the timestamps
+    -   the figure is redrawn only when a new segment has been transformed
+    """
+
+    def __init__(self, master: customtkinter.CTkFrame, sample_rates: dict[str, float | None]):
+        self.sample_rates = sample_rates
+        self.signals: list[src.messages.Signal] = []
+        self.estimators: dict[str, src.analysis.spectrum.WelchSpectrum] = {}
+        self.lines = {}
+
+        self.create_ui_elements(master)
+
+    def create_ui_elements(self, master: customtkinter.CTkFrame):
+        self.ctk_frame = customtkinter.CTkFrame(master=master)
+
+        control_frame = customtkinter.CTkFrame(master=self.ctk_frame, fg_color="transparent")
+        control_frame.pack(fill="x", padx=5, pady=(5, 0))
+
+        segment_label = customtkinter.CTkLabel(master=control_frame, text="FFT segment:")
+        segment_label.pack(side="left", padx=5)
+
+        self.segment_menu = customtkinter.CTkOptionMenu(
+            master=control_frame,
+            values=SEGMENT_LENGTHS,
+            command=lambda _: self.reset(),
+            width=90,
+        )
+        self.segment_menu.set(str(src.analysis.spectrum.DEFAULT_SEGMENT_LENGTH))
+        self.segment_menu.pack(side="left", padx=5)
+
+        self.info_label = customtkinter.CTkLabel(master=control_frame, text="", anchor="w")
+        self.info_label.pack(side="left", padx=5)
+
+        self.fig = matplotlib.figure.Figure(figsize=(5, 2.5), dpi=100)
+        self.plot = self.fig.add_subplot(111)
+        self.fig.subplots_adjust(left=0.1, right=0.95, bottom=0.2)
+
+        dark = template_backend.is_dark_mode()
+        foreground = "white" if dark else "black"
+        self.fig.patch.set_facecolor("#2e2e2e" if dark else "white")
+        self.plot.set_facecolor("#2e2e2e" if dark else "white")
+        self.plot.tick_params(colors=foreground, which="both")
+        self.plot.xaxis.label.set_color(foreground)
+        self.plot.yaxis.label.set_color(foreground)
+
+        self.canvas = FigureCanvas(self.fig, master=self.ctk_frame)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+        self.build_axes()
+
+    def set_signals(self, signals: list[src.messages.Signal]) -> None:
+        self.signals = signals[:MAX_SPECTRUM_SIGNALS]
+        self.estimators = {name: estimator for name, estimator in self.estimators.items()
+                           if name in {signal.name for signal in self.signals}}
+        self.build_axes()
+
+    def reset(self) -> None:
+        """Drop all estimators, e.g. after the segment length changed"""
+        self.estimators.clear()
+        self.build_axes()
+
+    def build_axes(self) -> None:
+        self.plot.clear()
+        self.plot.set_yscale("log")
+        self.plot.set_xlabel("Frequency /Hz")
+        self.plot.set_ylabel("PSD /unit²/Hz")
+        self.plot.grid(True, which="both", alpha=0.3)
+        self.lines = {}
+
+        for index, signal in enumerate(self.signals):
+            colour = template_backend.PLOT_COLOURS[index % len(template_backend.PLOT_COLOURS)]
+            (self.lines[signal.name],) = self.plot.plot([], [], "-", color=colour, label=signal.name, linewidth=1)
+
+        if self.signals:
+            self.plot.legend(loc="upper right", fontsize="small")
+
+        self.canvas.draw_idle()
+
+    def refresh(self, plot_data: dict[str, src.ring_buffer.RingBuffer]) -> None:
+        """
+        -   feed the estimators with the newest samples of the ring buffers
+        -   redraw if any estimator completed a segment
+        """
+        new_segments = 0
+        segment_length = int(self.segment_menu.get())
+
+        for signal in self.signals:
+            ring_buffer = plot_data.get(signal.name)
+            if ring_buffer is None:
+                continue
+
+            ticks, values = ring_buffer.latest()
+
+            if signal.name not in self.estimators:
+                sample_rate = self.sample_rates.get(signal.name) or src.analysis.spectrum.estimate_sample_rate(ticks)
+                if sample_rate is None:
+                    continue
+                self.estimators[signal.name] = src.analysis.spectrum.WelchSpectrum(sample_rate, segment_length)
+
+            new_segments += self.estimators[signal.name].update(ticks, values)
+
+        if new_segments:
+            self.draw()
+
+    def draw(self) -> None:
+        resolutions = []
+
+        for signal_name, line in self.lines.items():
+            estimator = self.estimators.get(signal_name)
+            result = estimator.get() if estimator else None
+
+            if result is not None:
+                frequencies, psd = result
+                line.set_data(frequencies[1:], psd[1:])    # skip DC, it was removed by the detrending
+                resolutions.append(frequencies[1])
+
+        self.plot.relim()
+        self.plot.autoscale_view()
+        self.canvas.draw_idle()
+
+        if resolutions:
+            self.info_label.configure(text=f"Resolution: {min(resolutions):.3g} Hz")
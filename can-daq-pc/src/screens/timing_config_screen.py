@@ -1,5 +1,8 @@
 import customtkinter
 
+from src.database_functionality import DEFAULT_DURABILITY_INTERVAL, DEFAULT_DURABILITY_MODE, DURABILITY_MODES
+from src.plotting.backends import DEFAULT_PLOT_BACKEND, backend_details
+
 class TimingConfigScreen:
     width = 500  # Increased width to accommodate wrapped text
     height = 650  # Increased height to accommodate wrapped text
@@ -20,52 +23,60 @@ class TimingConfigScreen:
         
         # Default values as dict
         self.config_values = {
-            'plot_max_points': 1000,
+            'plot_time_window': 10,
             'plot_update_interval': 100,
+            'plot_max_cpu_share': 50,
+            'plot_backend': DEFAULT_PLOT_BACKEND,
             'database_batch_size': 1000,
-            'statistics_batch_size': 250
+            'statistics_window': 10,
+            'durability_mode': DEFAULT_DURABILITY_MODE,
+            'durability_interval': DEFAULT_DURABILITY_INTERVAL,
         }
         
     def create_ui_elements(self):
-        # Calculate wraplength (window width minus padding)
-        wrap_length = self.width - 40
+        # Calculate wraplength (window width minus padding and scrollbar)
+        wrap_length = self.width - 70
+
+        # Scrollable container, so all options stay reachable on small screens
+        self.content = customtkinter.CTkScrollableFrame(master=self.window)
+        self.content.pack(fill="both", expand=True)
 
-        # Plot points
-        plot_points_label = customtkinter.CTkLabel(
-            master=self.window,
-            text="Maximum Plot Points:",
+        # Plot time window
+        plot_window_label = customtkinter.CTkLabel(
+            master=self.content,
+            text="Plot Time Window (s):",
             anchor="w"
         )
-        plot_points_label.pack(padx=20, pady=(20, 5), anchor="w")
+        plot_window_label.pack(padx=20, pady=(20, 5), anchor="w")
         
-        plot_points_explanation = customtkinter.CTkLabel(
-            master=self.window,
-            text="Controls how many data points are shown in the plot at once. Configure this based on your sampling frequency.",
+        plot_window_explanation = customtkinter.CTkLabel(
+            master=self.content,
+            text="How many seconds of data are shown in the plot. Every signal covers the same span, memory is allocated per signal from its cycle time or observed rate.",
             anchor="w",
             text_color="gray",
             font=("", 12),
             wraplength=wrap_length,
             justify="left"  # Add left justification
         )
-        plot_points_explanation.pack(padx=20, pady=(0, 5), anchor="w")
+        plot_window_explanation.pack(padx=20, pady=(0, 5), anchor="w")
         
-        self.plot_points_entry = customtkinter.CTkEntry(
-            master=self.window,
-            placeholder_text="1000"
+        self.plot_window_entry = customtkinter.CTkEntry(
+            master=self.content,
+            placeholder_text="10"
         )
-        self.plot_points_entry.pack(padx=20, pady=(0, 20), fill="x")
+        self.plot_window_entry.pack(padx=20, pady=(0, 20), fill="x")
         
         # Update interval
         update_interval_label = customtkinter.CTkLabel(
-            master=self.window,
+            master=self.content,
             text="Plot Update Interval (ms):",
             anchor="w"
         )
         update_interval_label.pack(padx=20, pady=(20, 5), anchor="w")
         
         update_interval_explanation = customtkinter.CTkLabel(
-            master=self.window,
-            text="How frequently the plot refreshes on your screen. Lower values give smoother updates but use more CPU. Configure this based on your system performance.",
+            master=self.content,
+            text="Shortest time between plot refreshes. Lower values give smoother updates but use more CPU. Configure this based on your system performance.",
             anchor="w",
             text_color="gray",
             font=("", 12),
@@ -75,21 +86,72 @@ class TimingConfigScreen:
         update_interval_explanation.pack(padx=20, pady=(0, 5), anchor="w")
         
         self.update_interval_entry = customtkinter.CTkEntry(
-            master=self.window,
+            master=self.content,
             placeholder_text="100"
         )
         self.update_interval_entry.pack(padx=20, pady=(0, 20), fill="x")
         
+        # Plot CPU share
+        cpu_share_label = customtkinter.CTkLabel(
+            master=self.content,
+            text="Maximum Plot CPU Share (%):",
+            anchor="w"
+        )
+        cpu_share_label.pack(padx=20, pady=(20, 5), anchor="w")
+        
+        cpu_share_explanation = customtkinter.CTkLabel(
+            master=self.content,
+            text="The plot refresh slows down automatically when drawing takes more than this share of the time. Frames are skipped when no new data arrived, and drawing pauses while the window is minimized.",
+            anchor="w",
+            text_color="gray",
+            font=("", 12),
+            wraplength=wrap_length,
+            justify="left"  # Add left justification
+        )
+        cpu_share_explanation.pack(padx=20, pady=(0, 5), anchor="w")
+        
+        self.cpu_share_entry = customtkinter.CTkEntry(
+            master=self.content,
+            placeholder_text="50"
+        )
+        self.cpu_share_entry.pack(padx=20, pady=(0, 20), fill="x")
+        
+        # Plot renderer
+        plot_backend_label = customtkinter.CTkLabel(
+            master=self.content,
+            text="Plot Renderer:",
+            anchor="w"
+        )
+        plot_backend_label.pack(padx=20, pady=(20, 5), anchor="w")
+        
+        plot_backend_explanation = customtkinter.CTkLabel(
+            master=self.content,
+            text="\"Matplotlib\" draws full axes, legends and grids. \"Tk Canvas (lightweight)\" draws plain polylines with a minimal frame and keeps the refresh rate up with many signals selected.",
+            anchor="w",
+            text_color="gray",
+            font=("", 12),
+            wraplength=wrap_length,
+            justify="left"  # Add left justification
+        )
+        plot_backend_explanation.pack(padx=20, pady=(0, 5), anchor="w")
+        
+        self.plot_backend_menu = customtkinter.CTkOptionMenu(
+            master=self.content,
+            values=list(backend_details.keys())
+        )
+        self.plot_backend_menu.set(DEFAULT_PLOT_BACKEND)
+        self.plot_backend_menu.pack(padx=20, pady=(0, 20), fill="x")
+        
         # Database batch
         db_batch_label = customtkinter.CTkLabel(
-            master=self.window,
+            master=self.content,
             text="Database Batch Size:",
             anchor="w"
         )
         db_batch_label.pack(padx=20, pady=(20, 5), anchor="w")
         
         db_batch_explanation = customtkinter.CTkLabel(
-            master=self.window,
+            master=self.content,
             text="Number of messages to collect before writing to database. Smaller values mean more frequent writes to the database, but may be fatal for performance. Configure this based on your sampling frequency.",
             anchor="w",
             text_color="gray",
@@ -100,39 +162,71 @@ class TimingConfigScreen:
         db_batch_explanation.pack(padx=20, pady=(0, 5), anchor="w")
         
         self.db_batch_entry = customtkinter.CTkEntry(
-            master=self.window,
+            master=self.content,
             placeholder_text="1000"
         )
         self.db_batch_entry.pack(padx=20, pady=(0, 20), fill="x")
         
-        # Statistics batch
-        stats_batch_label = customtkinter.CTkLabel(
-            master=self.window,
-            text="Statistics Batch Size:",
+        # Statistics window
+        stats_window_label = customtkinter.CTkLabel(
+            master=self.content,
+            text="Statistics Window (s):",
+            anchor="w"
+        )
+        stats_window_label.pack(padx=20, pady=(20, 5), anchor="w")
+        
+        stats_window_explanation = customtkinter.CTkLabel(
+            master=self.content,
+            text="Statistics are shown over the last N seconds and over the whole session. Both are updated incrementally as data arrives, for every signal.",
+            anchor="w",
+            text_color="gray",
+            font=("", 12),
+            wraplength=wrap_length,
+            justify="left"  # Add left justification
+        )
+        stats_window_explanation.pack(padx=20, pady=(0, 5), anchor="w")
+        
+        self.stats_window_entry = customtkinter.CTkEntry(
+            master=self.content,
+            placeholder_text="10"
+        )
+        self.stats_window_entry.pack(padx=20, pady=(0, 20), fill="x")
+        
+        # Durability
+        durability_label = customtkinter.CTkLabel(
+            master=self.content,
+            text="Durability:",
             anchor="w"
         )
-        stats_batch_label.pack(padx=20, pady=(20, 5), anchor="w")
+        durability_label.pack(padx=20, pady=(20, 5), anchor="w")
         
-        stats_batch_explanation = customtkinter.CTkLabel(
-            master=self.window,
-            text="Number of messages to process at once for statistics. Affects calculation frequency and CPU usage. Configure this based on your signal frequency.",
+        durability_explanation = customtkinter.CTkLabel(
+            master=self.content,
+            text="How often logged data is forced to disk. \"Max throughput\" never waits for the disk, so a power cut may lose or corrupt recent data. \"Fsync every N ms\" bounds the loss to about N ms plus one batch. \"Fsync every batch\" is the safest and the slowest.",
             anchor="w",
             text_color="gray",
             font=("", 12),
             wraplength=wrap_length,
             justify="left"  # Add left justification
         )
-        stats_batch_explanation.pack(padx=20, pady=(0, 5), anchor="w")
+        durability_explanation.pack(padx=20, pady=(0, 5), anchor="w")
+        
+        self.durability_menu = customtkinter.CTkOptionMenu(
+            master=self.content,
+            values=list(DURABILITY_MODES.keys())
+        )
+        self.durability_menu.set(DEFAULT_DURABILITY_MODE)
+        self.durability_menu.pack(padx=20, pady=(0, 5), fill="x")
         
-        self.stats_batch_entry = customtkinter.CTkEntry(
-            master=self.window,
-            placeholder_text="250"
+        self.durability_interval_entry = customtkinter.CTkEntry(
+            master=self.content,
+            placeholder_text=f"Fsync interval (ms), default {DEFAULT_DURABILITY_INTERVAL}"
         )
-        self.stats_batch_entry.pack(padx=20, pady=(0, 20), fill="x")
+        self.durability_interval_entry.pack(padx=20, pady=(0, 20), fill="x")
         
         # Save button
         save_button = customtkinter.CTkButton(
-            master=self.window,
+            master=self.content,
             text="Save",
             command=self.save_values
         )
@@ -141,15 +235,19 @@ class TimingConfigScreen:
     def save_values(self):
         try:
             self.config_values = {
-                'plot_max_points': int(self.plot_points_entry.get() or 1000),
+                'plot_time_window': float(self.plot_window_entry.get() or 10),
                 'plot_update_interval': int(self.update_interval_entry.get() or 100),
+                'plot_max_cpu_share': min(max(float(self.cpu_share_entry.get() or 50), 1), 100),
+                'plot_backend': self.plot_backend_menu.get(),
                 'database_batch_size': int(self.db_batch_entry.get() or 1000),
-                'statistics_batch_size': int(self.stats_batch_entry.get() or 250)
+                'statistics_window': float(self.stats_window_entry.get() or 10),
+                'durability_mode': self.durability_menu.get(),
+                'durability_interval': int(self.durability_interval_entry.get() or DEFAULT_DURABILITY_INTERVAL),
             }
             self.window.destroy()
         except ValueError:
             error_label = customtkinter.CTkLabel(
-                master=self.window,
+                master=self.content,
                 text="Please enter valid numbers",
                 text_color="red"
             )
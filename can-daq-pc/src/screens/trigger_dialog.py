@@ -0,0 +1,147 @@
+"""
+Trigger Dialog
+-   define a trigger on a signal: condition, pre/post-trigger window and what happens when it fires
+-   the definition is validated by the caller, errors are shown in the dialog until it is corrected or cancelled
+"""
+
+from typing import Callable
+
+import customtkinter
+
+import src.analysis
+
+conditions = list(src.analysis.triggers.condition_details)
+
+
+class TriggerDialog:
+    """
+    Trigger Dialog class
+    -   `on_add(definition)` receives the entered fields as a dict and returns an error message, or `None` once
+        the trigger has been added
+    """
+
+    def __init__(self, master: customtkinter.CTk, on_add: Callable[[dict], str | None]):
+        self.on_add = on_add
+
+        self.window = customtkinter.CTkToplevel(master)
+        self.window.title("Add Trigger")
+        self.window.geometry("420x460")
+        self.window.transient(master.winfo_toplevel())
+
+        self.create_ui_elements()
+
+    def create_ui_elements(self):
+        self.ctk_frame = customtkinter.CTkFrame(master=self.window)
+        self.ctk_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.ctk_frame.grid_columnconfigure(1, weight=1)
+
+        self.entries = {}
+
+        for row, (key, label_text, default) in enumerate([("name", "Name:", ""), ("signal", "Signal:", "")]):
+            label = customtkinter.CTkLabel(master=self.ctk_frame, text=label_text, anchor="w")
+            label.grid(row=row, column=0, padx=5, pady=5, sticky="w")
+
+            entry = customtkinter.CTkEntry(master=self.ctk_frame)
+            entry.insert(0, default)
+            entry.grid(row=row, column=1, padx=5, pady=5, sticky="ew")
+            self.entries[key] = entry
+
+        condition_label = customtkinter.CTkLabel(master=self.ctk_frame, text="Condition:", anchor="w")
+        condition_label.grid(row=2, column=0, padx=5, pady=5, sticky="w")
+
+        self.condition_menu = customtkinter.CTkOptionMenu(
+            master=self.ctk_frame,
+            values=conditions,
+            command=self.update_threshold_label,
+        )
+        self.condition_menu.set(conditions[0])
+        self.condition_menu.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
+
+        self.threshold_label = customtkinter.CTkLabel(master=self.ctk_frame, text="", anchor="w")
+        self.threshold_label.grid(row=3, column=0, padx=5, pady=5, sticky="w")
+
+        self.entries["threshold"] = customtkinter.CTkEntry(master=self.ctk_frame)
+        self.entries["threshold"].insert(0, "0")
+        self.entries["threshold"].grid(row=3, column=1, padx=5, pady=5, sticky="ew")
+
+        for row, (key, label_text, default) in enumerate(
+            [("pre_trigger", "Pre-trigger (s):", "1"), ("post_trigger", "Post-trigger (s):", "1")], start=4
+        ):
+            label = customtkinter.CTkLabel(master=self.ctk_frame, text=label_text, anchor="w")
+            label.grid(row=row, column=0, padx=5, pady=5, sticky="w")
+
+            entry = customtkinter.CTkEntry(master=self.ctk_frame)
+            entry.insert(0, default)
+            entry.grid(row=row, column=1, padx=5, pady=5, sticky="ew")
+            self.entries[key] = entry
+
+        action_label = customtkinter.CTkLabel(master=self.ctk_frame, text="Action:", anchor="w")
+        action_label.grid(row=6, column=0, padx=5, pady=5, sticky="w")
+
+        self.action_menu = customtkinter.CTkOptionMenu(
+            master=self.ctk_frame,
+            values=src.analysis.triggers.TRIGGER_ACTIONS,
+        )
+        self.action_menu.set(src.analysis.triggers.TRIGGER_ACTIONS[0])
+        self.action_menu.grid(row=6, column=1, padx=5, pady=5, sticky="ew")
+
+        self.capture_selected_var = customtkinter.BooleanVar(value=True)
+        capture_checkbox = customtkinter.CTkCheckBox(
+            master=self.ctk_frame,
+            text="Also capture the selected signals",
+            variable=self.capture_selected_var,
+        )
+        capture_checkbox.grid(row=7, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+
+        self.error_label = customtkinter.CTkLabel(
+            master=self.ctk_frame,
+            text="",
+            text_color="red",
+            justify="left",
+            anchor="w",
+            wraplength=380,
+        )
+        self.error_label.grid(row=8, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+
+        button_frame = customtkinter.CTkFrame(master=self.ctk_frame, fg_color="transparent")
+        button_frame.grid(row=9, column=0, columnspan=2, pady=10)
+
+        add_button = customtkinter.CTkButton(master=button_frame, text="Add", command=self.add)
+        add_button.pack(side="left", padx=5)
+
+        cancel_button = customtkinter.CTkButton(master=button_frame, text="Cancel", command=self.window.destroy)
+        cancel_button.pack(side="left", padx=5)
+
+        self.update_threshold_label(conditions[0])
+
+    def update_threshold_label(self, condition: str):
+        threshold_name = src.analysis.triggers.condition_details[condition]["threshold"]
+        self.threshold_label.configure(text=f"{threshold_name}:" if threshold_name else "Threshold (unused):")
+        self.entries["threshold"].configure(state="normal" if threshold_name else "disabled")
+
+    def add(self):
+        try:
+            definition = {
+                "name": self.entries["name"].get().strip(),
+                "signal": self.entries["signal"].get().strip(),
+                "condition": self.condition_menu.get(),
+                "threshold": float(self.entries["threshold"].get() or 0),
+                "pre_trigger": float(self.entries["pre_trigger"].get()),
+                "post_trigger": float(self.entries["post_trigger"].get()),
+                "action": self.action_menu.get(),
+                "capture_selected": self.capture_selected_var.get(),
+            }
+        except ValueError:
+            self.error_label.configure(text="Threshold and windows must be numbers")
+            return
+
+        if not definition["name"]:
+            self.error_label.configure(text="The trigger needs a name")
+            return
+
+        error = self.on_add(definition)
+
+        if error:
+            self.error_label.configure(text=error)
+        else:
+            self.window.destroy()
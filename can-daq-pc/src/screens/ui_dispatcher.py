@@ -0,0 +1,82 @@
+"""
+UI Dispatcher
+-   the one channel through which worker threads update widgets
+-   workers post the newest options for a widget from any thread, the Tk thread applies them
+-   updates are coalesced: only the latest post per key is applied, at most once per pump interval, and
+    only if it differs from what the widget already shows
+"""
+
+import threading
+from logging import getLogger
+from typing import Hashable
+
+import customtkinter
+
+logger = getLogger(__name__)
+
+UI_UPDATE_INTERVAL = 100    # ms, pump rate of the dispatcher
+
+
+class UiDispatcher:
+    """
+    UI Dispatcher class
+    -   `post()` is thread safe and never touches Tk
+    -   `pump()` runs on the Tk thread, driven by `after()`, and is the only place posted updates are applied
+    """
+
+    def __init__(self, widget: customtkinter.CTkBaseClass, interval: int = UI_UPDATE_INTERVAL):
+        self.widget = widget
+        self.interval = interval
+
+        self.pending: dict[Hashable, tuple[customtkinter.CTkBaseClass, dict]] = {}
+        self.applied: dict[Hashable, dict] = {}
+        self.lock = threading.Lock()
+        self.after_id = None
+
+    def start(self) -> None:
+        self.after_id = self.widget.after(self.interval, self.pump)
+
+    def stop(self) -> None:
+        if self.after_id:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def post(self, key: Hashable, widget: customtkinter.CTkBaseClass, **options) -> None:
+        """
+        -   request `widget.configure(**options)`, replacing any update for `key` that is still pending
+        -   can be called from any thread
+        """
+
+        with self.lock:
+            self.pending[key] = (widget, options)
+
+    def forget(self, key: Hashable) -> None:
+        """Drop the pending and applied state of a key, e.g. after its widget was destroyed"""
+        with self.lock:
+            self.pending.pop(key, None)
+            self.applied.pop(key, None)
+
+    def pump(self) -> None:
+        """Apply the newest pending update of every key, skipping those that would not change anything"""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+
+        for key, (widget, options) in pending.items():
+            if self.applied.get(key) == options:
+                continue
+
+            try:
+                exists = widget.winfo_exists()
+            except Exception:
+                exists = False
+
+            if not exists:
+                continue    # the widget was destroyed after the update was posted
+
+            try:
+                widget.configure(**options)
+                self.applied[key] = options
+            except Exception as e:
+                logger.error(f"Failed to apply UI update {key}: {e}")
+
+        self.after_id = self.widget.after(self.interval, self.pump)